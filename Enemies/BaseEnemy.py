@@ -3,11 +3,15 @@ from Scripts.player import Player
 from util.Audio import *
 from stateManager.stateManager import StateMachine, PatrolState, ChaseState, AttackState, MemoryPatrolState , FleeState, DamageState, DeathState
 from Enemies.ability import Ability
-from Scripts.CollisionHandler import CollisionHandler
 from Scripts.health import Health
 import random
+from util.logger import get_logger
+
+log = get_logger(__name__)
 
 class Enemy(Player):
+    in_crowd = False  # True for CrowdEnemy, whose updates and drawing are batched by EnemyCrowd
+
     def __init__(self, game, pos, size, moveDistance=100, inputHandler=None):
         super().__init__(game, pos, size, inputHandler)
         self.last_known_player_pos = None  # Initialize as None, will store (x, y) tuple
@@ -16,36 +20,36 @@ class Enemy(Player):
         self.ground_level = 600
 
         self.animations = {
-            "idle": game.assetManager.get_asset('skeleton_idle'),
-            "run": game.assetManager.get_asset('skeleton_walk'),
-            "death": game.assetManager.get_asset('skeleton_death'),
-            "attack": game.assetManager.get_asset('skeleton_attack'),
-            "shield": game.assetManager.get_asset('skeleton_shield'),
-            "hit": game.assetManager.get_asset('skeleton_hit')
+            "idle": 'skeleton_idle',
+            "run": 'skeleton_walk',
+            "death": 'skeleton_death',
+            "attack": 'skeleton_attack',
+            "shield": 'skeleton_shield',
+            "hit": 'skeleton_hit'
         }
         self.enemy_rect = pygame.Rect(self.pos[0], self.pos[1], self.size[0], self.size[1])
         self.rect = self.enemy_rect
+        self.exact_x = float(self.enemy_rect.x)  # The rect only holds whole pixels; steps smaller than one still add up here
         self.frameIndex = 0
         self.currentAnimation = "idle"
         self.animationSpeed = 0.1
-        self.lastUpdate = pygame.time.get_ticks()
-        self.image = pygame.transform.scale(self.animations[self.currentAnimation][self.frameIndex], self.size)
+        self.lastUpdate = self.game.game_clock.ticks
+        self.set_frame_image()
 
-        self.audio_player = AudioPlayer()
-        self.audio_player.setup_sounds()
+        self.audio_player = AudioPlayer.shared().handle()
 
         self.move_distance = moveDistance
         self.start_pos = pos[0]
         self.end_pos = self.start_pos + moveDistance
         self.speed = 100
         self.state_cooldown = 2000
-        self.last_state_change = pygame.time.get_ticks()
+        self.last_state_change = self.game.game_clock.ticks
         self.attack_range = 100
         self.chase_range = 200
         self.post_attack_cooldown = 2000
         self.last_attack_time = 0
 
-        self.last_flip_time = pygame.time.get_ticks()
+        self.last_flip_time = self.game.game_clock.ticks
         self.flip_cooldown = 500  # 500 milliseconds between flips
         self.name = "skeleton"
 
@@ -73,20 +77,18 @@ class Enemy(Player):
         self.attacked = False
         self.dead = False
 
-        self.mask = pygame.mask.from_surface(self.image)
         self.enemy_health = Health(self.game, 50, 20, 400, 20, max_health=self.health_max(), fg_color=(192,192,192), bg_color=(255, 0, 0))
     
     def update(self, deltaTime, player, all_enemies):
         self.enemy_rect.y = self.pos[1]
         self.adjustedspeed = self.speed * deltaTime
-        current_time = pygame.time.get_ticks()
+        current_time = self.game.game_clock.ticks
 
         self.check_isolation(all_enemies)
         self.update_emotions(player)  # Update emotions based on player interactions and game state
         self.state_machine.update()
         self.evaluate_combat_state(current_time, player)
         self.animationUpdate()
-        CollisionHandler.resolve_collisions(self, all_enemies, allowed_overlap=305)
 
     def health_max(self):
         match self.name:
@@ -102,16 +104,19 @@ class Enemy(Player):
                 self.max_health = 45
         return self.max_health
    
-    def update_mask(self):
-        self.mask = pygame.mask.from_surface(self.image)
-    
     def check_isolation(self, all_enemies, isolation_distance=200):
-        nearby_enemies = sum(1 for enemy in all_enemies if enemy != self and 
-                             self.distance_to(enemy) < isolation_distance)
-        self.isolated = nearby_enemies == 0
+        # The game's proximity service checks every enemy in one pass per frame
+        isolated = self.game.proximity.is_isolated(self, isolation_distance)
+        if isolated is None:
+            isolated = sum(1 for enemy in all_enemies if enemy != self and 
+                           self.distance_to(enemy) < isolation_distance) == 0
+        self.isolated = isolated
     
     def distance_to(self, other):
-        return ((self.pos[0] - other.pos[0]) ** 2 + (self.pos[1] - other.pos[1]) ** 2) ** 0.5
+        distance = self.game.proximity.distance(self, other)
+        if distance is None:
+            distance = ((self.pos[0] - other.pos[0]) ** 2 + (self.pos[1] - other.pos[1]) ** 2) ** 0.5
+        return distance
 
     def update_emotions(self, player):
         if self.isolated:
@@ -156,7 +161,7 @@ class Enemy(Player):
 
 
     def patrol(self):
-        current_time = pygame.time.get_ticks()
+        current_time = self.game.game_clock.ticks
         if self.enemy_rect.x >= self.end_pos or self.enemy_rect.x <= self.start_pos:
             if current_time - self.last_flip_time > self.flip_cooldown:
                 self.flip = not self.flip
@@ -165,7 +170,7 @@ class Enemy(Player):
         self.audioHandling()
 
     def chase(self, player):
-        current_time = pygame.time.get_ticks()
+        current_time = self.game.game_clock.ticks
         self.last_known_player_pos = None  # Reset before updating new chase data
         self.last_known_player_pos = player.pos  # Update last known player position during chase
         self.handle_flip(current_time, player)
@@ -173,7 +178,7 @@ class Enemy(Player):
         self.audioHandling()
     
     def attack(self, player):
-        current_time = pygame.time.get_ticks()
+        current_time = self.game.game_clock.ticks
         if current_time - self.last_flip_time > self.flip_cooldown:
             self.handle_flip(current_time, player)
     
@@ -187,14 +192,28 @@ class Enemy(Player):
                 self.flip = False
             else:
                 self.flip = True
-            print(f"Flipped from {previous_flip} to {self.flip} at time {current_time}")
+            log.debug("Flipped from %s to %s at time %s", previous_flip, self.flip, current_time)
             self.last_flip_time = current_time
    
     def movement (self):
         if self.flip:
-            self.enemy_rect.x -= self.adjustedspeed
+            self.move_x(-self.adjustedspeed)
         else:
-            self.enemy_rect.x += self.adjustedspeed
+            self.move_x(self.adjustedspeed)
+
+    def track_rect_x(self):
+        # Knockback and collision resolution move the rect directly; follow it when they do
+        if round(self.exact_x) != self.enemy_rect.x:
+            self.exact_x = float(self.enemy_rect.x)
+        return self.exact_x
+
+    def move_x(self, distance):
+        """
+        Moves the enemy horizontally by a distance that may be a fraction of a pixel. The exact position
+        is kept as a float and the rect follows it, so the speed is the same at any tick rate.
+        """
+        self.exact_x = self.track_rect_x() + distance
+        self.enemy_rect.x = round(self.exact_x)
     
     def attack_counter(self):
         self.attack_count += 1
@@ -210,20 +229,20 @@ class Enemy(Player):
         else:
             player_position = self.last_known_player_pos
 
-        print("Debug: player_position used for comparison:", player_position)  
+        log.debug("player_position used for comparison: %s", player_position)
 
         if player_position[0] < self.enemy_rect.x:
             self.flip = False
-            self.enemy_rect.x += self.adjustedspeed
+            self.move_x(self.adjustedspeed)
         else:
             self.flip = True
-            self.enemy_rect.x -= self.adjustedspeed
+            self.move_x(-self.adjustedspeed)
         
         self.adjustedspeed *= 1.5
         self.animationUpdate()
 
     def animationUpdate(self):
-        now = pygame.time.get_ticks()
+        now = self.game.game_clock.ticks
         moving = self.state_machine.current_state in [self.state_machine.states['patrol'], self.state_machine.states['chase']]
         if self.state_machine.current_state == self.state_machine.states['death']:
             self.currentAnimation = "death"
@@ -239,12 +258,9 @@ class Enemy(Player):
             self.frameIndex = 0
         if self.animating and now - self.lastUpdate > int(1000 * self.animationSpeed):
             self.lastUpdate = now
-            self.frameIndex = (self.frameIndex + 1) % len(self.animations[self.currentAnimation])
-            self.image = pygame.transform.scale(self.animations[self.currentAnimation][self.frameIndex], self.size)
-            self.image_left = pygame.transform.flip(self.image, True, False)
+            self.frameIndex = (self.frameIndex + 1) % self.animation_length()
 
-        self.image = pygame.transform.scale(self.animations[self.currentAnimation][self.frameIndex], self.size)
-        self.image_left = pygame.transform.flip(self.image, True, False)
+        self.set_frame_image()
         self.continue_animation()
     
     def continue_animation(self):
@@ -268,26 +284,29 @@ class Enemy(Player):
                 if self.audio_player.get_channel(2):
                     self.audio_player.enqueue_sound(self.audio_player.wormWalk)
 
+    def position(self):
+        return (self.track_rect_x(), self.enemy_rect.y)
+
     def render(self):
         current_anim = self.image_left if self.flip else self.image
         if current_anim.get_locked():
             current_anim.unlock()
-        self.game.screen.blit(current_anim, (self.enemy_rect.x, self.enemy_rect.y))
+        sprite_pos = self.game.camera.to_screen(self.render_position())
+        self.game.screen.blit(current_anim, sprite_pos)
 
 
-        self.enemy_mask = pygame.mask.from_surface(current_anim)
-        outline = self.enemy_mask.outline()
+        self.update_mask()
+        self.enemy_mask = self.mask
 
-        adjusted_outline = [(x + self.enemy_rect.x, y + self.enemy_rect.y) for x, y in outline]
-        
         border_color = (0, 0, 255)  # Neutral
         if self.fear > 0:
             border_color = (192,192,192)  # Fear
         elif self.anger > 0:
             border_color = (139, 0, 0)  # Anger
 
-        for point in adjusted_outline:
-            pygame.draw.circle(self.game.screen, border_color, point, 1)
+        outline = self.game.assetManager.get_frame_outline(*self.frame_key, self.size, self.flip, border_color)
+        pad = self.game.assetManager.OUTLINE_PADDING
+        self.game.mark_dirty(self.game.screen.blit(outline, (sprite_pos[0] - pad, sprite_pos[1] - pad)))
  
 
     
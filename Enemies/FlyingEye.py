@@ -3,6 +3,9 @@ import random
 from Enemies.BaseEnemy import Enemy
 from util.Audio import *
 from stateManager.stateManager import *
+from util.logger import get_logger
+
+log = get_logger(__name__)
 
 class FlyingEye(Enemy):
     def __init__(self, game, pos, size):
@@ -28,26 +31,26 @@ class FlyingEye(Enemy):
         self.attack_range = 150
 
         self.animations = {
-            "idle": game.assetManager.get_asset('eye_idle'),
-            "run": game.assetManager.get_asset('eye_walk'),
-            "death": game.assetManager.get_asset('eye_death'),
-            "attack": game.assetManager.get_asset('eye_attack'),
-            "attack2": game.assetManager.get_asset('eye_attack2'),
-            "attack3": game.assetManager.get_asset('eye_attack3'),
+            "idle": 'eye_idle',
+            "run": 'eye_walk',
+            "death": 'eye_death',
+            "attack": 'eye_attack',
+            "attack2": 'eye_attack2',
+            "attack3": 'eye_attack3',
         }
 
-        self.audio_player = AudioPlayer()
-        self.audio_player.setup_sounds()
+        self.audio_player = AudioPlayer.shared().handle()
 
         self.speed = 70
         self.move_distance = 80
         self.enemy_rect = pygame.Rect(self.pos[0], self.pos[1], self.size[0], self.size[1])
+        self.rect = self.enemy_rect
         self.frameIndex = 0
         self.currentAnimation = "idle"
         self.animationSpeed = 0.1
-        self.lastUpdate = pygame.time.get_ticks()
+        self.lastUpdate = self.game.game_clock.ticks
         self.attack_cooldown = 2000
-        self.last_attack_time = pygame.time.get_ticks()
+        self.last_attack_time = self.game.game_clock.ticks
         self.name = "flyingeye"
         self.update_image()
 
@@ -69,7 +72,7 @@ class FlyingEye(Enemy):
         
         This function checks if the current time minus the last attack time is greater than the attack cooldown and if the absolute difference between the enemy's x position and the player's x position is less than or equal to the attack range. If both conditions are met, it sets the last attack time to the current time, selects a random attack from a dictionary of attacks, sets the current animation to the chosen attack, and enqueues the chosen attack sound in the audio player if the second channel is available. If the conditions are not met, it sets the is_attacking attribute to False. It then resets the frame index and updates the image.
         """
-        current_time = pygame.time.get_ticks()
+        current_time = self.game.game_clock.ticks
         distance_to_player = abs(self.enemy_rect.x - self.game.player.pos[0])
         if current_time - self.last_attack_time > self.attack_cooldown and distance_to_player <= self.attack_range:
             self.last_attack_time = current_time
@@ -93,7 +96,7 @@ class FlyingEye(Enemy):
         Updates the image of the object based on the current animation and frame index.
 
         This function checks if the frame index is within the range of the current animation.
-        If it is, it scales and sets the image of the object to the corresponding frame.
+        If it is, it sets the image of the object to the corresponding pre-scaled frame.
         It also prints the current animation and frame index.
 
         Parameters:
@@ -102,25 +105,26 @@ class FlyingEye(Enemy):
         Returns:
             None
         """
-        if self.frameIndex < len(self.animations[self.currentAnimation]):
-            self.image = pygame.transform.scale(self.animations[self.currentAnimation][self.frameIndex], self.size)
-            print(f"Current Animation: {self.currentAnimation}, Frame Index: {self.frameIndex}")
+        if self.frameIndex < self.animation_length():
+            self.set_frame_image()
+            log.debug("Current Animation: %s, Frame Index: %s", self.currentAnimation, self.frameIndex)
         else:
-            print(f"Error: Frame index out of range for animation {self.currentAnimation}")
+            log.error("Frame index out of range for animation %s", self.currentAnimation)
 
-    def update(self, deltaTime, player):
+    def update(self, deltaTime, player, all_enemies):
         """
         Updates the FlyingEye enemy's position, state, and animation based on the given time delta and player position.
 
         Args:
             deltaTime (float): The time difference between the current and previous frames in seconds.
             player (Player): The player object that the enemy is interacting with.
+            all_enemies (List[Enemy]): Every enemy in the game, used for isolation checks.
 
         Returns:
             None
         """
-        super().update(deltaTime, player)
-        current_time = pygame.time.get_ticks()
+        super().update(deltaTime, player, all_enemies)
+        current_time = self.game.game_clock.ticks
 
         # Check if the enemy should attack
         distance_to_player = abs(self.enemy_rect.x - player.pos[0])
@@ -142,7 +146,7 @@ class FlyingEye(Enemy):
         self.state_machine.update()
 
         if current_time - self.lastUpdate > 1000 * self.animationSpeed:
-            self.frameIndex = (self.frameIndex + 1) % len(self.animations[self.currentAnimation])
+            self.frameIndex = (self.frameIndex + 1) % self.animation_length()
             self.lastUpdate = current_time
             self.update_image()
         
@@ -3,6 +3,9 @@ import random
 from Enemies.BaseEnemy import Enemy
 from util.Audio import *
 from stateManager.stateManager import SpecialGoblinAttackState
+from util.logger import get_logger
+
+log = get_logger(__name__)
 
 class Goblin(Enemy):
     def __init__(self, game, pos, size):
@@ -35,12 +38,12 @@ class Goblin(Enemy):
         super().__init__(game, pos, size)
 
         self.animations = {
-            "idle": game.assetManager.get_asset('goblin_idle'),
-            "run": game.assetManager.get_asset('goblin_walk'),
-            "death": game.assetManager.get_asset('goblin_death'),
-            "attack": game.assetManager.get_asset('goblin_attack'),
-            "attack2": game.assetManager.get_asset('goblin_attack2'),
-            "hit": game.assetManager.get_asset('goblin_hit'),
+            "idle": 'goblin_idle',
+            "run": 'goblin_walk',
+            "death": 'goblin_death',
+            "attack": 'goblin_attack',
+            "attack2": 'goblin_attack2',
+            "hit": 'goblin_hit',
         }
 
         self.speed = 150
@@ -50,9 +53,9 @@ class Goblin(Enemy):
         self.frameIndex = 0
         self.currentAnimation = "idle"
         self.animationSpeed = 0.1
-        self.lastUpdate = pygame.time.get_ticks()
+        self.lastUpdate = self.game.game_clock.ticks
         self.attack_cooldown = 2000
-        self.last_attack_time = pygame.time.get_ticks()
+        self.last_attack_time = self.game.game_clock.ticks
         self.name = "goblin"
         # self.update_image()
 
@@ -75,7 +78,7 @@ class Goblin(Enemy):
         Returns:
             None
         """
-        current_time = pygame.time.get_ticks()
+        current_time = self.game.game_clock.ticks
         if current_time - self.last_attack_time > self.attack_cooldown:
             self.last_attack_time = current_time
             attacks = {
@@ -96,7 +99,7 @@ class Goblin(Enemy):
         """
         Updates the image of the object based on the current animation and frame index.
 
-        This function checks if the frame index is within the range of the current animation. If it is, it scales and sets the image of the object to the corresponding frame. It also prints the current animation and frame index.
+        This function checks if the frame index is within the range of the current animation. If it is, it sets the image of the object to the corresponding pre-scaled frame. It also prints the current animation and frame index.
 
         Parameters:
             self (object): The current instance of the class.
@@ -104,11 +107,11 @@ class Goblin(Enemy):
         Returns:
             None
         """
-        if self.frameIndex < len(self.animations[self.currentAnimation]):
-            self.image = pygame.transform.scale(self.animations[self.currentAnimation][self.frameIndex], self.size)
-            print(f"Current Animation: {self.currentAnimation}, Frame Index: {self.frameIndex}")
+        if self.frameIndex < self.animation_length():
+            self.set_frame_image()
+            log.debug("Current Animation: %s, Frame Index: %s", self.currentAnimation, self.frameIndex)
         else:
-            print(f"Error: Frame index out of range for animation {self.currentAnimation}")
+            log.error("Frame index out of range for animation %s", self.currentAnimation)
 
     def update(self, deltaTime, player,all_enemies):
         """
@@ -124,8 +127,8 @@ class Goblin(Enemy):
         This function updates the object's animation and image based on the time elapsed. It first calls the update method of the parent class to update the object's position and state. Then, it checks if enough time has passed since the last update. If enough time has passed, it increments the frame index modulo the length of the current animation, updates the last update time, and calls the update_image method to update the object's image.
         """
         super().update(deltaTime, player,all_enemies)
-        current_time = pygame.time.get_ticks()
+        current_time = self.game.game_clock.ticks
         if current_time - self.lastUpdate > 1000 * self.animationSpeed:
-            self.frameIndex = (self.frameIndex + 1) % len(self.animations[self.currentAnimation])
+            self.frameIndex = (self.frameIndex + 1) % self.animation_length()
             self.lastUpdate = current_time
             self.update_image()
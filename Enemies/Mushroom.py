@@ -21,24 +21,25 @@ class Mushroom(Enemy):
         super().__init__(game, pos, size)
 
         self.animations = {
-            "idle": game.assetManager.get_asset('mushroom_idle'),
-            "run": game.assetManager.get_asset('mushroom_walk'),
-            "death": game.assetManager.get_asset('mushroom_death'),
-            "attack": game.assetManager.get_asset('mushroom_attack'),
-            "attack2": game.assetManager.get_asset('mushroom_attack2'),
-            "attack3": game.assetManager.get_asset('mushroom_attack3'),
-            "hit": game.assetManager.get_asset('mushroom_hit')
+            "idle": 'mushroom_idle',
+            "run": 'mushroom_walk',
+            "death": 'mushroom_death',
+            "attack": 'mushroom_attack',
+            "attack2": 'mushroom_attack2',
+            "attack3": 'mushroom_attack3',
+            "hit": 'mushroom_hit'
         }
 
         self.speed = 70
         self.move_distance = 80
         self.enemy_rect = pygame.Rect(self.pos[0], self.pos[1], self.size[0], self.size[1])
+        self.rect = self.enemy_rect
         self.frameIndex = 0
         self.currentAnimation = "idle"
         self.animationSpeed = 0.1
-        self.lastUpdate = pygame.time.get_ticks()
+        self.lastUpdate = self.game.game_clock.ticks
         self.attack_cooldown = 2000
-        self.last_attack_time = pygame.time.get_ticks()
+        self.last_attack_time = self.game.game_clock.ticks
         self.name = "mushroom"
         self.update_image()
 
@@ -60,7 +61,7 @@ class Mushroom(Enemy):
         Returns:
             None
         """
-        current_time = pygame.time.get_ticks()
+        current_time = self.game.game_clock.ticks
         if current_time - self.last_attack_time > self.attack_cooldown:
             self.last_attack_time = current_time
             attacks = {
@@ -78,16 +79,16 @@ class Mushroom(Enemy):
             self.update_image()
 
     def update_image(self):
-        if self.frameIndex < len(self.animations[self.currentAnimation]):
-            self.image = pygame.transform.scale(self.animations[self.currentAnimation][self.frameIndex], self.size)
+        if self.frameIndex < self.animation_length():
+            self.set_frame_image()
         #     print(f"Current Animation: {self.currentAnimation}, Frame Index: {self.frameIndex}")
         # else:
         #     print(f"Error: Frame index out of range for animation {self.currentAnimation}")
 
     def update(self, deltaTime, player, all_enemies):
         super().update(deltaTime, player, all_enemies)
-        current_time = pygame.time.get_ticks()
+        current_time = self.game.game_clock.ticks
         if current_time - self.lastUpdate > 1000 * self.animationSpeed:
-            self.frameIndex = (self.frameIndex + 1) % len(self.animations[self.currentAnimation])
+            self.frameIndex = (self.frameIndex + 1) % self.animation_length()
             self.lastUpdate = current_time
             self.update_image()
@@ -1,4 +1,7 @@
 import pygame
+from util.logger import get_logger
+
+log = get_logger(__name__)
 
 class Ability:
     def __init__(self, game, name, description, effect, size, pos):
@@ -11,16 +14,16 @@ class Ability:
         self.abilityRect = pygame.Rect(self.pos[0], self.pos[1], self.size[0], self.size[1])
         self.animation_speed = 0.1
         self.animations =  {
-            "M_shoot": self.game.assetManager.get_asset('M_Projectile'),
-            "FE_shoot": self.game.assetManager.get_asset('FE_Projectile'),
-            "Bomb": self.game.assetManager.get_asset('Bomb'),
-            "Sword": self.game.assetManager.get_asset('Sword'),
-            "Fireball": self.game.assetManager.get_asset('Fireball'),
+            "M_shoot": 'M_Projectile',
+            "FE_shoot": 'FE_Projectile',
+            "Bomb": 'Bomb',
+            "Sword": 'Sword',
+            "Fireball": 'Fireball',
         }
         self.frame_index = 0
         self.current_animation = 'M_shoot'
-        self.last_update = pygame.time.get_ticks()
-        self.image = pygame.transform.scale(self.animations[self.current_animation][self.frame_index], self.size)
+        self.last_update = self.game.game_clock.ticks
+        self.image = self.game.assetManager.get_scaled_frame(self.animations[self.current_animation], self.frame_index, self.size)
 
         # Counting attacks
         self.attack_counter = 0
@@ -29,11 +32,12 @@ class Ability:
         self.animation_update()
 
     def animation_update(self):
-        now = pygame.time.get_ticks()
+        now = self.game.game_clock.ticks
         if now - self.last_update > int(1000 * self.animation_speed):
             self.last_update = now
-            self.frame_index = (self.frame_index + 1) % len(self.animations[self.current_animation])
-            self.image = pygame.transform.scale(self.animations[self.current_animation][self.frame_index], self.size)
+            sheet = self.animations[self.current_animation]
+            self.frame_index = (self.frame_index + 1) % self.game.assetManager.frame_count(sheet)
+            self.image = self.game.assetManager.get_scaled_frame(sheet, self.frame_index, self.size)
 
     def trigger_ability(self):
         self.attack_counter += 1
@@ -44,7 +48,7 @@ class Ability:
     def activate_ability(self):
         # Set the current animation to the ability's effect
         self.current_animation = self.effect
-        print(f"{self.name} ability activated!")
+        log.debug("%s ability activated!", self.name)
 
 # This Ability class now includes an attack counter that increments with each attack. 
 # The ability is triggered on the 3rd attack, which can be used to activate a specific animation or effect.
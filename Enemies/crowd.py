@@ -0,0 +1,496 @@
+import numpy as np
+import pygame
+from Enemies.BaseEnemy import Enemy
+from stateManager.stateManager import StateMachine
+from Scripts.CollisionHandler import CollisionHandler
+from util.Audio import AudioPlayer
+from util.logger import get_logger
+
+log = get_logger(__name__)
+
+# State and animation ids stored in the crowd's arrays
+STATE_IDS = {'patrol': 0, 'chase': 1, 'attack': 2, 'memory_patrol': 3, 'flee': 4, 'hit': 5, 'death': 6}
+NO_STATE = -1
+ANIMATIONS = ('idle', 'run', 'death', 'attack', 'shield', 'hit')
+ANIMATION_IDS = {name: i for i, name in enumerate(ANIMATIONS)}
+
+# Every per-enemy value the crowd stores: name -> (dtype, extra dimensions)
+FIELDS = {
+    'pos': (np.float64, (2,)),
+    'previous_pos': (np.float64, (2,)),
+    'size': (np.float64, (2,)),
+    'velocity_y': (np.float64, ()),
+    'grounded': (np.bool_, ()),
+    'ground_level': (np.float64, ()),
+    'fear': (np.float64, ()),
+    'anger': (np.float64, ()),
+    'flip': (np.bool_, ()),
+    'state': (np.int8, ()),
+    'dead': (np.bool_, ()),
+    'witnessed': (np.bool_, ()),
+    'remembers_player': (np.bool_, ()),
+    'speed': (np.float64, ()),
+    'start_pos': (np.float64, ()),
+    'end_pos': (np.float64, ()),
+    'last_flip_time': (np.int64, ()),
+    'last_state_change': (np.int64, ()),
+    'state_cooldown': (np.int64, ()),
+    'memory_start_time': (np.int64, ()),
+    'animation': (np.int8, ()),
+    'frame': (np.int32, ()),
+    'last_frame_time': (np.int64, ()),
+    'animating': (np.bool_, ()),
+    'shown_animation': (np.int8, ()),
+    'shown_frame': (np.int32, ()),
+    'shown_flip': (np.bool_, ()),
+}
+
+
+class EnemyCrowd:
+    ISOLATION_DISTANCE = 200
+    MEMORY_PATROL_TIME = 5000  # Matches MemoryPatrolState.patrol_time
+    FLIP_COOLDOWN = 500
+    ANIMATION_INTERVAL = 100  # Milliseconds per animation frame (animationSpeed 0.1)
+
+    def __init__(self, game, capacity=256):
+        """
+        Initializes a structure-of-arrays store for skeleton crowds.
+
+        Kinematics, emotions, state ids and animation counters of every CrowdEnemy live in NumPy arrays,
+        so movement, patrol bounds, emotions and animation timing are updated for the whole crowd in a
+        few array operations per tick. CrowdEnemy objects are thin views onto one row each, and only
+        rare work (attacks, state transitions, frame image swaps) still runs per enemy in Python.
+
+        Args:
+            game (Game): The game the crowd belongs to.
+            capacity (int, optional): The number of rows allocated up front. Grows as needed. Defaults to 256.
+
+        Returns:
+            None
+        """
+        self.game = game
+        self.members = []
+        self.count = 0
+        self.capacity = capacity
+        for name, (dtype, shape) in FIELDS.items():
+            setattr(self, name, np.zeros((capacity,) + shape, dtype=dtype))
+        self.audio_player = AudioPlayer.shared().handle()
+        self.frame_counts = None
+        self.trimmed = {}  # surface -> (its visible part, offset), see trim
+
+    def add(self, member):
+        """
+        Gives a new member a row and returns its index.
+        """
+        if self.count == self.capacity:
+            self.grow(self.capacity * 2)
+        index = self.count
+        for name in FIELDS:
+            getattr(self, name)[index] = 0
+        self.state[index] = NO_STATE
+        self.shown_animation[index] = -1
+        self.members.append(member)
+        self.count += 1
+        return index
+
+    def grow(self, capacity):
+        for name in FIELDS:
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def release(self, index):
+        """
+        Removes a member by moving the last row into its slot. The removed member keeps a private
+        one-row copy of its values, so late reads of a dead enemy still work.
+        """
+        member = self.members[index]
+        detached = EnemyCrowd(self.game, capacity=1)
+        for name in FIELDS:
+            getattr(detached, name)[0] = getattr(self, name)[index]
+        detached.members.append(member)
+        detached.count = 1
+        member.crowd, member.index = detached, 0
+
+        last = self.count - 1
+        if index != last:
+            for name in FIELDS:
+                array = getattr(self, name)
+                array[index] = array[last]
+            moved = self.members[last]
+            moved.index = index
+            self.members[index] = moved
+        self.members.pop()
+        self.count -= 1
+
+    def clear(self):
+        """
+        Removes every member, for example before a saved game replaces the enemies.
+        """
+        for index in range(self.count - 1, -1, -1):
+            self.release(index)
+
+    def store_previous_positions(self):
+        n = self.count
+        self.previous_pos[:n] = self.pos[:n]
+
+    def update(self, deltaTime, player):
+        """
+        Runs one tick of Enemy.update for every member, batched. Expects game.proximity to have been
+        rebuilt with this crowd for the frame.
+
+        Args:
+            deltaTime (float): The tick length in seconds.
+            player (Player): The player the crowd reacts to.
+
+        Returns:
+            None
+        """
+        self.release_dead()
+        n = self.count
+        if n == 0:
+            return
+        now = self.game.game_clock.ticks
+        if self.frame_counts is None:
+            sheets = self.members[0].animations
+            self.frame_counts = np.array([self.game.assetManager.frame_count(sheets[name]) for name in ANIMATIONS])
+
+        # Emotions
+        fear = self.fear[:n]
+        # The proximity service puts crowd members first, in row order
+        fear += self.game.proximity.isolated(self.ISOLATION_DISTANCE)[:n]
+        fear += self.witnessed[:n] * 2
+        self.witnessed[:n] = False
+        np.clip(fear, 0, 100, out=fear)
+        np.clip(self.anger[:n], 0, 100, out=self.anger[:n])
+
+        # States that only move run here for everyone at once
+        self.move(now, deltaTime, player)
+        self.sync_rects()
+
+        state = self.state[:n]
+        # Enemy.flee runs animationUpdate as it moves, before the combat evaluation below can re-enter the state
+        self.advance_frames(now, state == STATE_IDS['flee'])
+        members = self.members
+        for i in np.flatnonzero(state == STATE_IDS['attack']).tolist():
+            members[i].state_machine.update()
+        # Memory patrols give up after MEMORY_PATROL_TIME and go back to patrolling
+        expired = (state == STATE_IDS['memory_patrol']) & self.remembers_player[:n] & \
+            (now - self.memory_start_time[:n] > self.MEMORY_PATROL_TIME)
+        for i in np.flatnonzero(expired).tolist():
+            self.remembers_player[i] = False
+            members[i].state_machine.change_state('patrol')
+
+        # Only enemies whose state cooldown has passed evaluate the combat situation
+        due = now - self.last_state_change[:n] > self.state_cooldown[:n]
+        for i in np.flatnonzero(due).tolist():
+            members[i].evaluate_combat_state(now, player)
+
+        self.update_animations(now)
+
+    def move(self, now, deltaTime, player):
+        n = self.count
+        x = self.pos[:n, 0]
+        flip = self.flip[:n]
+        state = self.state[:n]
+        step = self.speed[:n] * deltaTime
+        player_x = player.pos[0]
+        flip_ready = now - self.last_flip_time[:n] > self.FLIP_COOLDOWN
+
+        patrol = state == STATE_IDS['patrol']
+        chase = state == STATE_IDS['chase']
+        memory = (state == STATE_IDS['memory_patrol']) & self.remembers_player[:n]
+        flee = state == STATE_IDS['flee']
+
+        # Decisions compare whole-pixel positions, like Enemy does with its rect
+        # Memory patrol heads for the remembered player position and patrols once it gets close
+        memory_right = memory & (np.rint(x) < player_x)
+        memory_left = memory & (np.rint(x) > player_x)
+        x[memory_right] += step[memory_right]
+        x[memory_left] -= step[memory_left]
+        flip[memory_right] = False
+        flip[memory_left] = True
+        patrolling = patrol | (memory & (np.abs(np.rint(x) - player_x) < 10))
+
+        # Patrol turns around at the ends of its route, chase turns towards the player
+        rect_x = np.rint(x)
+        at_bounds = (rect_x >= self.end_pos[:n]) | (rect_x <= self.start_pos[:n])
+        turn = patrolling & at_bounds & flip_ready
+        flip[turn] = ~flip[turn]
+        face = chase & flip_ready
+        flip[face] = ~(player_x > rect_x[face])
+        self.last_flip_time[:n][turn | face] = now
+        self.remembers_player[:n] |= chase
+
+        walking = patrolling | chase
+        x[walking] += np.where(flip[walking], -step[walking], step[walking])
+
+        # Flee runs away from the remembered player position, or left if there is none
+        rect_x = np.rint(x)
+        target = np.where(self.remembers_player[:n], player_x, rect_x)
+        flee_right = flee & (target < rect_x)
+        flee_left = flee & ~(target < rect_x)
+        x[flee_right] += step[flee_right]
+        x[flee_left] -= step[flee_left]
+        flip[flee_right] = False
+        flip[flee_left] = True
+
+        if walking.any() and self.audio_player.get_channel(2):
+            self.audio_player.enqueue_sound(self.audio_player.skeletonWalk)
+
+    def sync_rects(self):
+        """
+        Copies the array positions into every member's rect, which collisions and attacks read.
+        """
+        positions = np.rint(self.pos[:self.count]).astype(np.int64).tolist()
+        for member, position in zip(self.members, positions):
+            member.enemy_rect.topleft = position
+
+    def update_animations(self, now):
+        n = self.count
+        state = self.state[:n]
+        animation = self.animation[:n]
+        frame = self.frame[:n]
+
+        run = ((state == STATE_IDS['patrol']) | (state == STATE_IDS['chase'])) & (animation != ANIMATION_IDS['run'])
+        attack = (state == STATE_IDS['attack']) & (animation != ANIMATION_IDS['attack'])
+        death = state == STATE_IDS['death']
+        animation[run] = ANIMATION_IDS['run']
+        animation[attack] = ANIMATION_IDS['attack']
+        animation[death] = ANIMATION_IDS['death']
+        animation[state == STATE_IDS['hit']] = ANIMATION_IDS['hit']
+        frame[run | attack | death] = 0
+
+        self.advance_frames(now)
+        self.animating[:n] = True
+
+        # Only members showing a new frame or facing the other way look up their images and masks
+        flip = self.flip[:n]
+        changed = (animation != self.shown_animation[:n]) | (frame != self.shown_frame[:n]) | (flip != self.shown_flip[:n])
+        self.shown_animation[:n] = animation
+        self.shown_frame[:n] = frame
+        self.shown_flip[:n] = flip
+        members = self.members
+        for i in np.flatnonzero(changed).tolist():
+            members[i].set_frame_image()
+
+    def advance_frames(self, now, members=None):
+        """
+        Moves the animating members (or those selected by the members mask) whose frame time has passed on a frame.
+        """
+        n = self.count
+        due = self.animating[:n] & (now - self.last_frame_time[:n] > self.ANIMATION_INTERVAL)
+        if members is not None:
+            due &= members
+        animation = self.animation[:n]
+        frame = self.frame[:n]
+        self.last_frame_time[:n][due] = now
+        frame[due] = (frame[due] + 1) % self.frame_counts[animation[due]]
+
+    def release_dead(self):
+        # DeathState marks an enemy dead as it removes it from game.enemies
+        for i in np.flatnonzero(self.dead[:self.count])[::-1].tolist():
+            self.release(i)
+
+    def resolve_player_collisions(self, player, allowed_overlap):
+        """
+        Pushes the player and crowd members apart. Crowd members don't push each other, since a dense
+        crowd would otherwise cost a mask test for nearly every pair.
+        """
+        n = self.count
+        if n == 0:
+            return
+        rect = player.rect
+        x = np.rint(self.pos[:n, 0])
+        y = np.rint(self.pos[:n, 1])
+        width, height = self.size[:n].T
+        touching = (x < rect.right) & (x + width > rect.left) & (y < rect.bottom) & (y + height > rect.top)
+        overlap = np.where(rect.centerx < x + width // 2, rect.right - x, x + width - rect.left)
+        members = self.members
+        for i in np.flatnonzero(touching & (overlap > allowed_overlap)).tolist():
+            member = members[i]
+            if CollisionHandler.check_collision(player, member):
+                CollisionHandler.adjust_position(player, member, allowed_overlap)
+
+    def render(self):
+        """
+        Draws every member on screen and its outline with one batched blit call. Members outside
+        the camera's view are skipped before any per-member work.
+        """
+        n = self.count
+        if n == 0:
+            return
+        alpha = self.game.render_alpha
+        previous = self.previous_pos[:n]
+        view = self.game.camera.rect
+        positions = np.rint(previous + (self.pos[:n] - previous) * alpha) - view.topleft
+        margin = self.game.camera.CULL_MARGIN
+        size = self.size[:n]
+        visible = np.flatnonzero((positions[:, 0] + size[:, 0] > -margin) & (positions[:, 0] < view.width + margin) &
+                                 (positions[:, 1] + size[:, 1] > -margin) & (positions[:, 1] < view.height + margin))
+        if len(visible) == 0:
+            return
+        positions = positions[visible].astype(np.int64).tolist()
+        fear = (self.fear[visible] > 0).tolist()
+        anger = (self.anger[visible] > 0).tolist()
+        flips = self.flip[visible].tolist()
+        members = [self.members[i] for i in visible.tolist()]
+        get_frame_outline = self.game.assetManager.get_frame_outline
+        pad = self.game.assetManager.OUTLINE_PADDING
+
+        trim = self.trim
+        blits = []
+        for member, (x, y), flipped, afraid, angry in zip(members, positions, flips, fear, anger):
+            image, (dx, dy) = trim(member.image_left if flipped else member.image)
+            blits.append((image, (x + dx, y + dy)))
+            border_color = (192, 192, 192) if afraid else (139, 0, 0) if angry else (0, 0, 255)
+            outline, (dx, dy) = trim(get_frame_outline(*member.frame_key, member.size, flipped, border_color))
+            blits.append((outline, (x - pad + dx, y - pad + dy)))
+        self.game.screen.blits(blits, doreturn=False)
+
+        if self.game.dirtyRects:
+            for (x, y), member in zip(positions, members):
+                self.game.mark_dirty((x - pad, y - pad, member.size[0] + pad * 2, member.size[1] + pad * 2))
+
+
+    def trim(self, surface):
+        """
+        Returns the visible part of a cached frame or outline surface and its offset. The scaled frames
+        are mostly transparent, and with hundreds on screen blitting only their bounding rect matters.
+        """
+        trimmed = self.trimmed.get(surface)
+        if trimmed is None:
+            bounds = surface.get_bounding_rect()
+            trimmed = self.trimmed[surface] = (surface.subsurface(bounds), bounds.topleft)
+        return trimmed
+
+
+class CrowdField:
+    def __init__(self, array):
+        """
+        Exposes one element of a crowd array as an attribute of a CrowdEnemy.
+        """
+        self.array = array
+
+    def __get__(self, member, owner=None):
+        if member is None:
+            return self
+        return getattr(member.crowd, self.array)[member.index].item()
+
+    def __set__(self, member, value):
+        getattr(member.crowd, self.array)[member.index] = value
+
+
+class CrowdStateMachine(StateMachine):
+    def change_state(self, new_state):
+        super().change_state(new_state)
+        for name, state in self.states.items():
+            if state is self.current_state:
+                self.enemy.crowd.state[self.enemy.index] = STATE_IDS.get(name, NO_STATE)
+                if name == 'memory_patrol':
+                    self.enemy.crowd.memory_start_time[self.enemy.index] = self.enemy.game.game_clock.ticks
+                break
+
+
+class CrowdEnemy(Enemy):
+    in_crowd = True
+
+    velocity_y = CrowdField('velocity_y')
+    grounded = CrowdField('grounded')
+    ground_level = CrowdField('ground_level')
+    fear = CrowdField('fear')
+    anger = CrowdField('anger')
+    flip = CrowdField('flip')
+    dead = CrowdField('dead')
+    witnessed_powerful_player = CrowdField('witnessed')
+    speed = CrowdField('speed')
+    state_cooldown = CrowdField('state_cooldown')
+    last_flip_time = CrowdField('last_flip_time')
+    last_state_change = CrowdField('last_state_change')
+    frameIndex = CrowdField('frame')
+    lastUpdate = CrowdField('last_frame_time')
+    animating = CrowdField('animating')
+
+    def __init__(self, game, crowd, pos, size, moveDistance=100, inputHandler=None):
+        """
+        Initializes a skeleton whose per-frame values live in an EnemyCrowd.
+
+        It behaves like Enemy, but Game updates and draws it through the crowd in batches
+        instead of calling update and render on it.
+
+        Args:
+            game (Game): The game the enemy belongs to.
+            crowd (EnemyCrowd): The store holding this enemy's row.
+            pos (list): The initial position.
+            size (list): The sprite size.
+            moveDistance (int, optional): The length of the patrol route. Defaults to 100.
+            inputHandler (InputHandler, optional): Unused by enemies. Defaults to None.
+
+        Returns:
+            None
+        """
+        self.crowd = crowd
+        self.index = crowd.add(self)
+        super().__init__(game, pos, size, moveDistance, inputHandler)
+        crowd.size[self.index] = self.size
+        machine = CrowdStateMachine(self)
+        machine.states = self.state_machine.states
+        self.state_machine = machine
+
+    @property
+    def pos(self):
+        # A row view, so code like enemy.pos[0] += knockback writes straight into the crowd
+        return self.crowd.pos[self.index]
+
+    @pos.setter
+    def pos(self, value):
+        self.crowd.pos[self.index] = value[:2]
+
+    @property
+    def previous_position(self):
+        return tuple(self.crowd.previous_pos[self.index].tolist())
+
+    @previous_position.setter
+    def previous_position(self, value):
+        self.crowd.previous_pos[self.index] = value if value is not None else self.crowd.pos[self.index]
+
+    @property
+    def start_pos(self):
+        return self.crowd.start_pos[self.index].item()
+
+    @start_pos.setter
+    def start_pos(self, value):
+        self.crowd.start_pos[self.index] = value
+
+    @property
+    def end_pos(self):
+        return self.crowd.end_pos[self.index].item()
+
+    @end_pos.setter
+    def end_pos(self, value):
+        self.crowd.end_pos[self.index] = value
+
+    @property
+    def last_known_player_pos(self):
+        # Enemy stores the player's own pos list here, so the remembered position is always the live one
+        return self.game.player.pos if self.crowd.remembers_player[self.index] else None
+
+    @last_known_player_pos.setter
+    def last_known_player_pos(self, value):
+        self.crowd.remembers_player[self.index] = value is not None
+
+    @property
+    def currentAnimation(self):
+        return ANIMATIONS[self.crowd.animation[self.index]]
+
+    @currentAnimation.setter
+    def currentAnimation(self, name):
+        self.crowd.animation[self.index] = ANIMATION_IDS[name]
+
+    def position(self):
+        return tuple(self.crowd.pos[self.index].tolist())
+
+    def update(self, deltaTime, player, all_enemies):
+        raise RuntimeError("Crowd enemies are updated in batches through EnemyCrowd.update")
@@ -1,10 +1,94 @@
+class SpatialHash:
+    def __init__(self, cell_size=256):
+        """
+        Initializes a uniform grid that buckets characters by the cells their rects touch.
+
+        Args:
+            cell_size (int, optional): The width and height of a grid cell in pixels. Defaults to 256.
+
+        Returns:
+            None
+        """
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def clear(self):
+        self.cells.clear()
+
+    def insert(self, character):
+        """
+        Adds a character to every cell its rect overlaps.
+        """
+        rect = character.rect
+        size = self.cell_size
+        for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                self.cells.setdefault((cx, cy), []).append(character)
+
+    def build(self, characters):
+        """
+        Rebuilds the grid from scratch for the given characters.
+        """
+        self.clear()
+        for character in characters:
+            self.insert(character)
+
+    def candidate_pairs(self):
+        """
+        Yields each pair of characters whose rects overlap exactly once, in insertion order.
+        """
+        seen = set()
+        for bucket in self.cells.values():
+            for i, character in enumerate(bucket):
+                for other in bucket[i + 1:]:
+                    key = (id(character), id(other)) if id(character) < id(other) else (id(other), id(character))
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    if character.rect.colliderect(other.rect):
+                        yield character, other
+
+
 class CollisionHandler:
+    broadphase = SpatialHash()
+
+    @staticmethod
+    def resolve_all(characters, allowed_overlap):
+        """
+        Resolves collisions between all characters once per frame.
+
+        The characters are bucketed into a spatial hash so only pairs whose rects overlap are considered,
+        pairs that could not be pushed apart are skipped, and the pixel-perfect mask test runs last.
+        Each pair is resolved at most once.
+
+        Args:
+            characters (List[Player]): Every character taking part in collisions this frame.
+            allowed_overlap (int): The horizontal overlap in pixels tolerated before characters are pushed apart.
+
+        Returns:
+            None
+        """
+        broadphase = CollisionHandler.broadphase
+        broadphase.build(characters)
+        for character, other in broadphase.candidate_pairs():
+            if CollisionHandler.horizontal_overlap(character, other) > allowed_overlap and \
+                    CollisionHandler.check_collision(character, other):
+                CollisionHandler.adjust_position(character, other, allowed_overlap)
+
     @staticmethod
     def resolve_collisions(character, others, allowed_overlap):
         for other in others:
-            if other != character and CollisionHandler.check_collision(character, other):
+            if other != character and character.rect.colliderect(other.rect) and \
+                    CollisionHandler.horizontal_overlap(character, other) > allowed_overlap and \
+                    CollisionHandler.check_collision(character, other):
                 CollisionHandler.adjust_position(character, other, allowed_overlap)
 
+    @staticmethod
+    def horizontal_overlap(character, other):
+        if character.rect.centerx < other.rect.centerx:
+            return character.rect.right - other.rect.left
+        return other.rect.right - character.rect.left
+
     @staticmethod
     def check_collision(character, other):
         offset_x = other.rect.x - character.rect.x
@@ -28,6 +112,4 @@ class CollisionHandler:
 
         character.pos = [character.rect.x, character.rect.y]
         other.pos = [other.rect.x, other.rect.y]
-        # Update masks as the position changes
-        character.update_mask()
-        other.update_mask()
+        # Masks are cached per frame and do not depend on position, so they need no rebuild here
@@ -1,3 +1,64 @@
+import numpy as np
+
+class PlatformIndex:
+    def __init__(self, platforms=()):
+        """
+        Initializes an interval index over the horizontal spans of static platforms.
+
+        Spans are sorted by their left edge, so the platforms under an entity are found with two binary
+        searches (any platform starting more than the widest span to the left cannot reach it) instead of
+        scanning every platform.
+
+        Args:
+            platforms (list, optional): Objects with pos and size, in priority order. Defaults to ().
+
+        Returns:
+            None
+        """
+        self.platforms = list(platforms)
+        count = len(self.platforms)
+        left = np.array([platform.pos[0] for platform in self.platforms], dtype=np.float64).reshape(count)
+        width = np.array([platform.size[0] for platform in self.platforms], dtype=np.float64).reshape(count)
+        self.top = np.array([platform.pos[1] for platform in self.platforms], dtype=np.float64).reshape(count)
+        self.order = np.argsort(left, kind='stable')
+        self.left = left[self.order]
+        self.right = (left + width)[self.order]
+        self.max_width = width.max() if count else 0.0
+
+    def __len__(self):
+        return len(self.platforms)
+
+    def contacts(self, x, y, width, height, velocity_y):
+        """
+        Finds the platform each entity lands on, matching Gravity.check_platform_collision: the first
+        platform in list order that overlaps the entity horizontally and is above its bottom edge,
+        for entities that are not moving up.
+
+        Args:
+            x, y, width, height, velocity_y (np.ndarray): One value per entity.
+
+        Returns:
+            np.ndarray: The index of the platform each entity lands on, or -1.
+        """
+        count = len(x)
+        landed = np.full(count, -1, dtype=np.int64)
+        if not self.platforms or not count:
+            return landed
+
+        lo = np.searchsorted(self.left, x - self.max_width, side='right')
+        hi = np.searchsorted(self.left, x + width, side='left')
+        lengths = np.maximum(hi - lo, 0)
+        rows = np.repeat(np.arange(count), lengths)
+        spans = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths - lo, lengths)
+        platform_ids = self.order[spans]
+        touching = (self.right[spans] > x[rows]) & (y[rows] + height[rows] > self.top[platform_ids]) & (velocity_y[rows] >= 0)
+
+        first = np.full(count, len(self.platforms), dtype=np.int64)
+        np.minimum.at(first, rows[touching], platform_ids[touching])
+        landed[first < len(self.platforms)] = first[first < len(self.platforms)]
+        return landed
+
+
 class Gravity:
     def __init__(self, gravity=9.81, max_fall_speed=400):
         """
@@ -50,18 +111,93 @@ class Gravity:
             entity.velocity_y = -jump_strength  # Negative to move up
             entity.grounded = False
     
+    def integrate(self, y, velocity_y, grounded, ground_level, height, x, width, deltaTime, platforms=None):
+        """
+        Runs apply, and check_platform_collision if platforms are given, for many entities at once.
+        Entities resting on their ground level stay grounded after the platform check. The arrays are updated in place.
+
+        Args:
+            y, velocity_y, grounded, ground_level (np.ndarray): Vertical state of every entity.
+            height, x, width (np.ndarray): Used for platform contacts.
+            deltaTime (float): The time elapsed since the last frame.
+            platforms (PlatformIndex, optional): Static platforms to land on. Defaults to None.
+
+        Returns:
+            None
+        """
+        airborne = ~grounded
+        velocity_y[airborne] = np.minimum(velocity_y[airborne] + self.gravity * deltaTime, self.max_fall_speed)
+        y += velocity_y * deltaTime
+
+        below = y > ground_level
+        y[below] = ground_level[below]
+        velocity_y[below] = 0
+        grounded |= below
+
+        if platforms is not None and len(platforms):
+            on_ground = y >= ground_level
+            landed = platforms.contacts(x, y, width, height, velocity_y)
+            on_platform = landed >= 0
+            y[on_platform] = platforms.top[landed[on_platform]] - height[on_platform]
+            velocity_y[on_platform] = 0
+            grounded[:] = on_platform | on_ground
+
+    def step(self, entities, deltaTime, platforms=None, crowd=None):
+        """
+        Applies gravity and platform contacts to every entity in one vectorized pass.
+
+        The entities' vertical state is gathered into arrays, integrated together and written back.
+        A crowd's members are integrated directly in its arrays.
+
+        Args:
+            entities (List[Entity]): Entities with pos, size, velocity_y, grounded and ground_level.
+            deltaTime (float): The time elapsed since the last frame.
+            platforms (PlatformIndex, optional): Static platforms to land on. Defaults to None.
+            crowd (EnemyCrowd, optional): A crowd to integrate as well. Defaults to None.
+
+        Returns:
+            None
+        """
+        if entities:
+            count = len(entities)
+            x, y = np.array([entity.pos[:2] for entity in entities], dtype=np.float64).reshape(count, 2).T.copy()
+            width, height = np.array([entity.size for entity in entities], dtype=np.float64).reshape(count, 2).T.copy()
+            velocity_y = np.array([entity.velocity_y for entity in entities], dtype=np.float64)
+            grounded = np.array([entity.grounded for entity in entities], dtype=bool)
+            ground_level = np.array([entity.ground_level for entity in entities], dtype=np.float64)
+            self.integrate(y, velocity_y, grounded, ground_level, height, x, width, deltaTime, platforms)
+            for entity, new_y, new_velocity, on_ground in zip(entities, y.tolist(), velocity_y.tolist(), grounded.tolist()):
+                entity.pos[1] = new_y
+                entity.velocity_y = new_velocity
+                entity.grounded = on_ground
+
+        if crowd is not None and crowd.count:
+            n = crowd.count
+            self.integrate(crowd.pos[:n, 1], crowd.velocity_y[:n], crowd.grounded[:n], crowd.ground_level[:n],
+                           crowd.size[:n, 1], crowd.pos[:n, 0], crowd.size[:n, 0], deltaTime, platforms)
+
     def check_platform_collision(self, entity, platforms):
         """
-        Checks for collision between the entity and the platforms.
+        Checks for collision between the entity and the platforms. An entity resting on its ground level
+        stays grounded when it is not on a platform.
 
         Args:
             entity (Entity): The entity to check collision for.
-            platforms (List[Platform]): The list of platforms to check collision against.
+            platforms (List[Platform] or PlatformIndex): The platforms to check collision against.
 
         Returns:
             None
         """
-        entity.grounded = False
+        if isinstance(platforms, PlatformIndex):
+            landed = platforms.contacts(*(np.array([value], dtype=np.float64) for value in
+                                          (entity.pos[0], entity.pos[1], entity.size[0], entity.size[1], entity.velocity_y)))[0]
+            entity.grounded = bool(landed >= 0) or entity.pos[1] >= entity.ground_level
+            if landed >= 0:
+                entity.pos[1] = platforms.top[landed] - entity.size[1]
+                entity.velocity_y = 0
+            return
+
+        entity.grounded = entity.pos[1] >= entity.ground_level
         for platform in platforms:
             if entity.pos[1] + entity.size[1] > platform.pos[1] and \
             entity.pos[0] + entity.size[0] > platform.pos[0] and \
@@ -137,3 +137,49 @@ class DummyInputHandler:
         # Left Analog Vertical - 1
         # Right Analog Horizontal - 2
         # Right Analog Vertical - 3
+
+    def disable_input(self):
+        pass
+
+    def enable_input(self):
+        pass
+
+class ScriptedInputHandler:
+    def __init__(self, script):
+        """
+        Initializes an input handler that replays a fixed script of inputs, one step per call to get_input.
+
+        Args:
+            script (list): A list of (frames, actions) pairs, where actions is an iterable of input names
+                such as 'move_right' or 'attack1' that are held for that many frames. The script loops.
+
+        Returns:
+            None
+        """
+        self.frames = []
+        for frames, actions in script:
+            inputs = {
+                'move_left': False,
+                'move_right': False,
+                'jump': False,
+                'attack1': False,
+                'attack2': False
+            }
+            for action in actions:
+                inputs[action] = True
+            self.frames.extend([inputs] * frames)
+        self.step = 0
+        self.enabled = True
+
+    def disable_input(self):
+        self.enabled = False
+
+    def enable_input(self):
+        self.enabled = True
+
+    def get_input(self):
+        inputs = self.frames[self.step % len(self.frames)]
+        self.step += 1
+        if not self.enabled:
+            return dict.fromkeys(inputs, False)
+        return dict(inputs)
@@ -0,0 +1,124 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+import pygame
+from util.settings import SPRITE_SETS
+from util.logger import get_logger
+
+log = get_logger(__name__)
+
+class AssetLoader:
+    def __init__(self, assetManager, sound_bank=None, workers=None):
+        """
+        Initializes a background loader that decodes images and sounds on a pool of worker threads.
+
+        PNG and audio decoding mostly runs outside the GIL, so it scales with the number of cores.
+        Steps that need the display, like convert_alpha and slicing a sheet into frames, are queued
+        and run on the main thread in batches by update(), so a loading screen can keep drawing.
+
+        Args:
+            assetManager (AssetManager): Receives the loaded sprite sheets.
+            sound_bank (SoundBank, optional): Receives the loaded sounds. Defaults to None.
+            workers (int, optional): The number of worker threads. Defaults to the number of CPUs.
+
+        Returns:
+            None
+        """
+        self.assetManager = assetManager
+        self.sound_bank = sound_bank
+        self.executor = ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 2, thread_name_prefix='asset-loader')
+        self.jobs = []  # (future or None, main-thread step or None) for everything not finished yet
+        self.decodes = {}  # path -> future, so sheets sharing an image decode it once
+        self.total = 0
+        self.completed = 0
+        self.start_time = time.perf_counter()
+
+    def add(self, future, finish):
+        self.jobs.append((future, finish))
+        self.total += 1
+
+    def queue_sprite_sheets(self, names):
+        """
+        Queues registered sprite sheets. PNG sheets are decoded on the pool; sheets from an atlas or
+        asset pack are already decoded and only need their main-thread step.
+        """
+        for name in names:
+            if name not in self.assetManager.registry:
+                continue  # Already loaded
+            source = self.assetManager.sheet_sources.get(name)
+            if source is None:
+                self.add(None, partial(self.assetManager.prefetch, [name]))
+                continue
+            path, frame_dimensions = source
+            future = self.decodes.get(path)
+            if future is None:
+                future = self.decodes[path] = self.executor.submit(pygame.image.load, path)
+            self.add(future, partial(self.assetManager.add_sprite_sheet, name, frame_dimensions=frame_dimensions))
+
+    def queue_set(self, set_name):
+        """
+        Queues every sprite sheet used by one character type, as listed in SPRITE_SETS.
+        """
+        self.queue_sprite_sheets(name for name, _, _ in SPRITE_SETS[set_name])
+
+    def queue_sounds(self, names=None):
+        """
+        Queues sounds from the sound bank, all registered sounds by default. They need no main-thread step.
+        """
+        for name in names or self.sound_bank.SOUNDS:
+            self.add(self.executor.submit(self.sound_bank.get, name), None)
+
+    @property
+    def progress(self):
+        return self.completed / self.total if self.total else 1.0
+
+    @property
+    def done(self):
+        return self.completed == self.total
+
+    def update(self, budget_ms=None):
+        """
+        Runs main-thread steps for whatever has finished decoding, stopping once budget_ms is spent.
+        Call it once per frame while a loading screen is shown.
+
+        Args:
+            budget_ms (float, optional): The time to spend this call. Defaults to None (no limit).
+
+        Returns:
+            None
+        """
+        start = time.perf_counter()
+        remaining = []
+        for i, (future, finish) in enumerate(self.jobs):
+            if budget_ms is not None and (time.perf_counter() - start) * 1000 >= budget_ms:
+                remaining.extend(self.jobs[i:])
+                break
+            if future is not None and not future.done():
+                remaining.append((future, finish))
+                continue
+            result = future.result() if future is not None else None  # Re-raises decode errors here
+            if finish is not None:
+                if future is not None:
+                    finish(result)
+                else:
+                    finish()
+            self.completed += 1
+        self.jobs = remaining
+        if self.done and self.total:
+            log.info("Loaded %d assets in %.0f ms", self.total, (time.perf_counter() - self.start_time) * 1000)
+            self.total = self.completed = 0
+            self.decodes.clear()
+
+    def finish(self):
+        """
+        Blocks until everything queued is loaded, running main-thread steps as decodes complete.
+        """
+        while not self.done:
+            self.update()
+            pending = [future for future, _ in self.jobs if future is not None and not future.done()]
+            if pending and len(pending) == len(self.jobs):
+                wait(pending, return_when=FIRST_COMPLETED)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
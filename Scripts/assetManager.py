@@ -1,22 +1,186 @@
+import json
+import mmap
+from functools import partial
+import os
+import struct
+import time
 import pygame
+from util.logger import get_logger
+from util.settings import SPRITE_SETS, TILEMAP
+from Scripts.tilemap import Tilemap
+
+log = get_logger(__name__)
+
+ATLAS_VERSION = 1
+
+
+def file_stamp(path):
+    """
+    Returns the size and modification time of a file, used to tell whether a built asset is out of date.
+    """
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def is_stale(index):
+    """
+    Returns True if an atlas or pack index was built by another version or from different source files.
+    """
+    try:
+        return index.get('version') != ATLAS_VERSION or any(
+            file_stamp(path) != stamp for path, stamp in index['sources'].items())
+    except OSError:
+        return True
+
+PACK_MAGIC = b'KCPACK'
+PACK_VERSION = 1
+PACK_HEADER = struct.Struct('<6sHI')  # Magic, pack version, length of the JSON index that follows
+PACK_ALIGNMENT = 16  # Page pixel data starts on a multiple of this many bytes
+
+
+class AssetPack:
+    def __init__(self, path):
+        """
+        Opens a binary asset pack: a header, a JSON atlas index and the atlas pages as raw RGBA pixels.
+        The file is memory-mapped, so pixel data is only paged in when a surface is built from it.
+
+        Args:
+            path (str): The path to the asset pack.
+
+        Returns:
+            None
+        """
+        self.file = open(path, 'rb')
+        self.data = None
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(self.data) < PACK_HEADER.size:
+                raise ValueError("file is too short to be an asset pack")
+            magic, version, index_length = PACK_HEADER.unpack_from(self.data)
+            if magic != PACK_MAGIC:
+                raise ValueError("not an asset pack")
+            if version != PACK_VERSION:
+                raise ValueError(f"unsupported asset pack version {version}")
+            self.index = json.loads(self.data[PACK_HEADER.size:PACK_HEADER.size + index_length])
+        except Exception:
+            self.close()
+            raise
+
+    def is_stale(self):
+        return is_stale(self.index)
+
+    def pages(self):
+        """
+        Wraps every page's pixel data in a surface without copying or decoding it.
+        The surfaces must be released before the pack is closed.
+        """
+        view = memoryview(self.data)
+        return [
+            pygame.image.frombuffer(view[offset:offset + width * height * 4], (width, height), 'RGBA')
+            for offset, width, height in self.index['pages']
+        ]
+
+    def close(self):
+        if self.data is not None:
+            self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
 
 class AssetManager:
+    OUTLINE_PADDING = 1  # Outline surfaces are this many pixels larger than the frame on each side
+
     def __init__(self):
         self.assets = {}
+        self.registry = {}  # Registered but not yet loaded assets: name -> loader returning the asset
+        self.sheet_sources = {}  # Registered PNG sprite sheets: name -> (path, frame dimensions)
+        self.used = set()  # Names requested through get_asset, for the unused asset report
+        self.frame_cache = {}
+        self.mask_cache = {}
+        self.outline_cache = {}
+        self.pack = None  # The mapped asset pack, kept open while its sheets may still be loaded
+        self.tilemap = None
 
     def load_asset(self, name, path):
         if name in self.assets:
-            print(f"Asset '{name}' is already loaded.")
+            log.debug("Asset '%s' is already loaded.", name)
             return
         try:
             image = pygame.image.load(path).convert_alpha()
             self.assets[name] = image
-            print(f"Loaded asset '{name}' from {path}")
+            log.info("Loaded asset '%s' from %s", name, path)
         except pygame.error as e:
-            print(f"Failed to load asset '{name}' from {path}: {str(e)}")
+            log.error("Failed to load asset '%s' from %s: %s", name, path, e)
+
+    def register(self, name, loader):
+        """
+        Registers an asset without loading it. The loader is called with no arguments the first time
+        the asset is requested or prefetched, and must return the asset.
+        """
+        if name not in self.assets:
+            self.registry[name] = loader
+
+    def register_sprite_sheet(self, name, path, frame_dimensions):
+        """
+        Registers a sprite sheet that is loaded and sliced on first use instead of right away.
+        """
+        self.sheet_sources[name] = (path, frame_dimensions)
+        self.register(name, partial(self.load_sheet_frames, path, frame_dimensions))
 
     def get_asset(self, name):
-        return self.assets[name]
+        """
+        Returns a loaded asset, loading it first if it is only registered.
+
+        Raises:
+            KeyError: If no asset with that name was loaded or registered.
+        """
+        asset = self.assets.get(name)
+        if asset is None:
+            asset = self.load_registered(name)
+        self.used.add(name)
+        return asset
+
+    def load_registered(self, name):
+        loader = self.registry.pop(name)
+        start = time.perf_counter()
+        asset = self.assets[name] = loader()
+        log.info("Loaded registered asset '%s' in %.1f ms", name, (time.perf_counter() - start) * 1000)
+        return asset
+
+    def prefetch(self, names):
+        """
+        Loads the given registered assets now, e.g. while a level starts, so their first use doesn't stall a frame.
+        """
+        for name in names:
+            if name in self.registry:
+                self.load_registered(name)
+
+    def prefetch_set(self, set_name):
+        """
+        Loads every sprite sheet used by one character type, as listed in SPRITE_SETS (e.g. 'goblin').
+        """
+        self.prefetch(name for name, _, _ in SPRITE_SETS[set_name])
+
+    def unused_assets(self):
+        """
+        Reports which assets have not been requested so far.
+
+        Returns:
+            tuple: Sorted names of loaded assets that were never used, and of registered assets that were never loaded.
+        """
+        loaded_unused = sorted(name for name in self.assets if name not in self.used)
+        never_loaded = sorted(self.registry)
+        return loaded_unused, never_loaded
+
+    def log_unused_assets(self):
+        loaded_unused, never_loaded = self.unused_assets()
+        log.info("Assets loaded but never used (%d): %s", len(loaded_unused), ', '.join(loaded_unused) or '-')
+        log.info("Assets registered but never loaded (%d): %s", len(never_loaded), ', '.join(never_loaded) or '-')
 
     def resize_asset(self, name, new_size):
         """
@@ -29,7 +193,7 @@ class AssetManager:
         Returns:
             None
         """
-        image = self.assets[name]
+        image = self.get_asset(name)
         scaled_image = pygame.transform.smoothscale(image, new_size)
         self.assets[name] = scaled_image
 
@@ -47,8 +211,25 @@ class AssetManager:
             None
         
         """
-        sprite_sheet = pygame.image.load(path).convert_alpha()
-        self.assets[name] = []
+        self.add_sprite_sheet(name, pygame.image.load(path), frame_dimensions)
+
+    def add_sprite_sheet(self, name, image, frame_dimensions):
+        """
+        Stores the frames of an already decoded sprite sheet image, replacing any registration under that name.
+        Must run on the main thread, since converting the image needs the display.
+        """
+        self.assets[name] = self.slice_sprite_sheet(image, frame_dimensions)
+        self.registry.pop(name, None)
+
+    def load_sheet_frames(self, path, frame_dimensions):
+        return self.slice_sprite_sheet(pygame.image.load(path), frame_dimensions)
+
+    def slice_sprite_sheet(self, image, frame_dimensions):
+        """
+        Converts a decoded sprite sheet image for fast blitting and returns its frames, left to right and top to bottom.
+        """
+        sprite_sheet = image.convert_alpha()
+        frames = []
         sheet_width, sheet_height = sprite_sheet.get_size()
         frame_width, frame_height = frame_dimensions
 
@@ -59,45 +240,197 @@ class AssetManager:
             for x in range(0, sheet_width, frame_width):
                 if x + frame_width <= sheet_width:
                     frame = sprite_sheet.subsurface((x, y, frame_width, frame_height))
-                    self.assets[name].append(frame)
+                    frames.append(frame)
                 #     print(f"Loaded frame at ({x}, {y}) with dimensions ({frame_width}, {frame_height})")
                 # else:
                 #     print(f"Skipped frame at ({x}, {y}) as it exceeds sprite sheet width")
+        return frames
+
+    def load_atlas(self, index_path):
+        """
+        Register every sprite sheet listed in an atlas index written by Scripts.atlasBuilder.
+
+        Frames are stored trimmed on a few packed pages, so this opens and decodes a handful of PNGs
+        instead of one per sheet. A sheet's frames are only cut from the pages when it is first used.
+
+        Args:
+            index_path (str): The path to the atlas JSON index.
+
+        Returns:
+            bool: True if the atlas was loaded, False if it is missing or older than its source sheets.
+        """
+        try:
+            with open(index_path) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            log.info("No sprite atlas at %s, loading individual sheets", index_path)
+            return False
+
+        if is_stale(index):
+            log.warning("Sprite atlas %s is out of date, loading individual sheets. "
+                        "Rebuild it with: python -m Scripts.atlasBuilder", index_path)
+            return False
+
+        directory = os.path.dirname(index_path)
+        pages = [pygame.image.load(os.path.join(directory, page)).convert_alpha() for page in index['pages']]
+        self.register_atlas_sheets(pages, index['sheets'])
+        log.info("Registered %d sprite sheets from atlas %s (%d pages)", len(index['sheets']), index_path, len(pages))
+        return True
+
+    def load_pack(self, path):
+        """
+        Register every sprite sheet in a binary asset pack written by Scripts.assetPack.
+
+        The pack holds the atlas pages as raw RGBA pixels, so they are memory-mapped and wrapped in
+        surfaces with pygame.image.frombuffer instead of being decoded from PNG. The pack stays mapped
+        so sheets can be cut from it when they are first used.
+
+        Args:
+            path (str): The path to the asset pack.
+
+        Returns:
+            bool: True if the pack was loaded, False if it is missing, unreadable or older than its source sheets.
+        """
+        try:
+            pack = AssetPack(path)
+        except FileNotFoundError:
+            log.info("No asset pack at %s", path)
+            return False
+        except (OSError, ValueError) as e:
+            log.warning("Could not read asset pack %s: %s", path, e)
+            return False
+
+        if pack.is_stale():
+            pack.close()
+            log.warning("Asset pack %s is out of date, loading PNG sources. "
+                        "Rebuild it with: python -m Scripts.assetPack", path)
+            return False
+        self.pack = pack
+        self.register_atlas_sheets(pack.pages(), pack.index['sheets'])
+        log.info("Registered %d sprite sheets from asset pack %s", len(pack.index['sheets']), path)
+        return True
+
+    def register_atlas_sheets(self, pages, sheets):
+        for name, sheet in sheets.items():
+            self.register(name, partial(self.unpack_frames, pages, sheet))
+
+    def unpack_frames(self, pages, sheet):
+        """
+        Restores every frame of an atlas sheet to its original size by placing the trimmed pixels
+        at their pivot offset, so the frames match what load_sprite_sheet would produce.
+        """
+        frame_size = tuple(sheet['frame_size'])
+        frames = []
+        for page, x, y, width, height, offset_x, offset_y in sheet['frames']:
+            frame = pygame.Surface(frame_size, pygame.SRCALPHA).convert_alpha()
+            frame.fill((0, 0, 0, 0))
+            if width and height:
+                # RGBA_MAX onto a cleared surface copies the pixels exactly instead of alpha blending them
+                frame.blit(pages[page], (offset_x, offset_y), (x, y, width, height), special_flags=pygame.BLEND_RGBA_MAX)
+            frames.append(frame)
+        return frames
 
     def get_frame(self, name, frame_index):
         """
         Retrieve a specific frame from a loaded sprite sheet.
         """
-        return self.assets[name][frame_index]
+        return self.get_asset(name)[frame_index]
+
+    def frame_count(self, name):
+        """
+        Return the number of frames in a loaded sprite sheet.
+        """
+        return len(self.get_asset(name))
+
+    def get_scaled_frame(self, name, frame_index, size, flipped=False):
+        """
+        Retrieve a frame scaled to the given size, optionally flipped horizontally.
+
+        Frames are scaled and flipped once, on first use, and cached under
+        (name, frame_index, size, flipped) so entities can look them up every frame for free.
+
+        Args:
+            name (str): The name of the sprite sheet.
+            frame_index (int): The index of the frame in the sprite sheet.
+            size (tuple): The target size of the frame in pixels.
+            flipped (bool): Whether the frame should be mirrored horizontally.
+
+        Returns:
+            pygame.Surface: The scaled (and flipped) frame.
+        """
+        key = (name, frame_index, tuple(size), flipped)
+        frame = self.frame_cache.get(key)
+        if frame is None:
+            if flipped:
+                frame = pygame.transform.flip(self.get_scaled_frame(name, frame_index, size), True, False)
+            else:
+                frame = pygame.transform.scale(self.get_asset(name)[frame_index], tuple(size))
+            self.frame_cache[key] = frame
+        return frame
+
+    def get_frame_mask(self, name, frame_index, size, flipped=False):
+        """
+        Retrieve the collision mask of a scaled frame, built once and cached under the same key as the frame.
+        """
+        key = (name, frame_index, tuple(size), flipped)
+        mask = self.mask_cache.get(key)
+        if mask is None:
+            mask = pygame.mask.from_surface(self.get_scaled_frame(name, frame_index, size, flipped))
+            self.mask_cache[key] = mask
+        return mask
+
+    def get_frame_outline(self, name, frame_index, size, flipped=False, color=(0, 0, 0)):
+        """
+        Retrieve a pre-rendered outline of a scaled frame so drawing a sprite border costs a single blit.
+
+        The outline surface is padded by OUTLINE_PADDING pixels on every side, so it should be
+        blitted at the sprite position minus OUTLINE_PADDING.
+
+        Args:
+            name (str): The name of the sprite sheet.
+            frame_index (int): The index of the frame in the sprite sheet.
+            size (tuple): The target size of the frame in pixels.
+            flipped (bool): Whether the frame is mirrored horizontally.
+            color (tuple): The RGB color of the outline.
+
+        Returns:
+            pygame.Surface: A transparent surface containing only the outline.
+        """
+        key = (name, frame_index, tuple(size), flipped, tuple(color))
+        outline = self.outline_cache.get(key)
+        if outline is None:
+            pad = self.OUTLINE_PADDING
+            outline = pygame.Surface((size[0] + pad * 2, size[1] + pad * 2), pygame.SRCALPHA)
+            for x, y in self.get_frame_mask(name, frame_index, size, flipped).outline():
+                pygame.draw.circle(outline, color, (x + pad, y + pad), 1)
+            self.outline_cache[key] = outline
+        return outline
+
+    def prepare_frames(self, name, size):
+        """
+        Scale and flip every frame of a sprite sheet ahead of time so the first use does not stall a frame.
+        """
+        for frame_index in range(self.frame_count(name)):
+            self.get_scaled_frame(name, frame_index, size)
+            self.get_scaled_frame(name, frame_index, size, flipped=True)
     
-    def load_tiles(self, path, tile_properties):
+    def load_tiles(self, path=TILEMAP):
         """
-        Load tiles from a tileset image file and store them in the `tiles` attribute of the `AssetManager` object.
-        
+        Load a level layout from a JSON file into a Tilemap, which pre-renders its static tiles into
+        chunks and indexes the solid ones. The tilemap is kept in `tilemap` for check_collision.
+
         Parameters:
-            path (str): The path to the tileset image file.
-            tile_properties (dict): A dictionary containing tile properties for each tile in the tileset. The keys are tuples representing the x and y coordinates of the tile in the tileset, and the values are dictionaries containing the properties of the tile.
-        
+            path (str, optional): The path to the level layout. Defaults to TILEMAP.
+
         Returns:
-            None
-        
+            Tilemap: The loaded tilemap.
         """
-        tileset = pygame.image.load(path).convert_alpha()
-        tile_width, tile_height = self.tile_size
-        for y in range(0, tileset.get_height(), tile_height):
-            for x in range(0, tileset.get_width(), tile_width):
-                tile = tileset.subsurface((x, y, tile_width, tile_height))
-                properties = tile_properties.get((x // tile_width, y // tile_height), {})
-                self.tiles.append((tile, properties))
+        self.tilemap = Tilemap.load(path)
+        return self.tilemap
 
     def check_collision(self, player_rect):
         """
         Check collision between the player and solid tiles.
         Returns True if there is a collision.
         """
-        for tile, properties in self.tiles:
-            if properties.get('solid', False):
-                tile_rect = pygame.Rect(tile.get_rect())
-                if tile_rect.colliderect(player_rect):
-                    return True
-        return False
+        return self.tilemap is not None and self.tilemap.collides(player_rect)
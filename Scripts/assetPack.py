@@ -0,0 +1,69 @@
+import argparse
+import json
+import os
+import pygame
+from util.settings import ASSETPACK, SPRITE_SHEETS
+from Scripts.assetManager import PACK_ALIGNMENT, PACK_HEADER, PACK_MAGIC, PACK_VERSION
+from Scripts.atlasBuilder import PAGE_SIZE, pack_sheets
+
+
+def write_pack(path=ASSETPACK, sheets=SPRITE_SHEETS, page_size=PAGE_SIZE):
+    """
+    Packs the given sprite sheets into atlas pages and writes them as one binary asset pack:
+    a header, the JSON atlas index, then every page's pre-decoded RGBA pixels.
+
+    The pack is written to a temporary file and moved into place, so a running game never sees
+    a half-written pack.
+
+    Args:
+        path (str, optional): Where the pack is written. Defaults to ASSETPACK.
+        sheets (list, optional): (name, path, frame size) entries. Defaults to SPRITE_SHEETS.
+        page_size (int, optional): The width and height of an atlas page. Defaults to PAGE_SIZE.
+
+    Returns:
+        dict: The index stored in the pack.
+    """
+    pages, index = pack_sheets(sheets, page_size)
+    pixels = [pygame.image.tobytes(page, 'RGBA') for page in pages]
+
+    # Page offsets depend on the index length, which depends on the offsets' digits, so settle them first
+    index['pages'] = [[0, page.get_width(), page.get_height()] for page in pages]
+    while True:
+        encoded = json.dumps(index, separators=(',', ':')).encode()
+        offset = align(PACK_HEADER.size + len(encoded))
+        offsets = []
+        for data in pixels:
+            offsets.append(offset)
+            offset = align(offset + len(data))
+        if offsets == [entry[0] for entry in index['pages']]:
+            break
+        for entry, page_offset in zip(index['pages'], offsets):
+            entry[0] = page_offset
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as f:
+        f.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(encoded)))
+        f.write(encoded)
+        for page_offset, data in zip(offsets, pixels):
+            f.write(b'\0' * (page_offset - f.tell()))
+            f.write(data)
+    os.replace(temporary_path, path)
+    return index
+
+
+def align(offset):
+    return (offset + PACK_ALIGNMENT - 1) // PACK_ALIGNMENT * PACK_ALIGNMENT
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Builds the binary asset pack the game loads at startup")
+    parser.add_argument('--output', default=ASSETPACK, help='where to write the asset pack')
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE, help='width and height of an atlas page')
+    args = parser.parse_args()
+
+    pygame.init()
+    index = write_pack(args.output, page_size=args.page_size)
+    print(f"Wrote {len(index['sheets'])} sheets on {len(index['pages'])} pages to {args.output} "
+          f"({os.path.getsize(args.output) / 1024 / 1024:.1f} MB)")
+    pygame.quit()
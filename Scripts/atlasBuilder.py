@@ -0,0 +1,168 @@
+import argparse
+import json
+import os
+import pygame
+from util.settings import ATLASPATH, SPRITE_SHEETS
+from Scripts.assetManager import ATLAS_VERSION, file_stamp
+
+PAGE_SIZE = 2048
+PADDING = 1  # Transparent gap between packed frames
+
+
+def slice_sheet(sheet, frame_dimensions):
+    """
+    Returns the frame rects of a sprite sheet in the same order AssetManager.load_sprite_sheet uses.
+    """
+    sheet_width, sheet_height = sheet.get_size()
+    frame_width, frame_height = frame_dimensions
+    return [
+        pygame.Rect(x, y, frame_width, frame_height)
+        for y in range(0, sheet_height, frame_height)
+        for x in range(0, sheet_width, frame_width)
+        if x + frame_width <= sheet_width
+    ]
+
+
+class ShelfPacker:
+    def __init__(self, page_size=PAGE_SIZE, padding=PADDING):
+        """
+        Packs rectangles onto fixed-size pages in rows ("shelves"). Feeding it rects sorted by
+        decreasing height keeps the wasted space small.
+
+        Args:
+            page_size (int, optional): The width and height of a page. Defaults to PAGE_SIZE.
+            padding (int, optional): The gap left after every rect. Defaults to PADDING.
+
+        Returns:
+            None
+        """
+        self.page_size = page_size
+        self.padding = padding
+        self.pages = []  # Used height of every page
+        self.shelf_x = self.shelf_y = self.shelf_height = 0
+
+    def new_page(self):
+        self.pages.append(0)
+        self.shelf_x = self.shelf_y = self.shelf_height = 0
+
+    def place(self, width, height):
+        """
+        Finds a spot for a width x height rect.
+
+        Returns:
+            tuple: The page index and the x, y position on that page.
+        """
+        if width + self.padding > self.page_size or height + self.padding > self.page_size:
+            raise ValueError(f"A {width}x{height} frame does not fit on a {self.page_size} pixel atlas page")
+        if not self.pages:
+            self.new_page()
+        if self.shelf_x + width > self.page_size:
+            # Start a new shelf below the current one
+            self.shelf_y += self.shelf_height
+            self.shelf_x = self.shelf_height = 0
+        if self.shelf_y + height > self.page_size:
+            self.new_page()
+
+        position = (len(self.pages) - 1, self.shelf_x, self.shelf_y)
+        self.shelf_x += width + self.padding
+        self.shelf_height = max(self.shelf_height, height + self.padding)
+        self.pages[-1] = max(self.pages[-1], self.shelf_y + height)
+        return position
+
+
+def pack_sheets(sheets=SPRITE_SHEETS, page_size=PAGE_SIZE):
+    """
+    Trims every frame of the given sprite sheets to its visible pixels and packs the trimmed frames
+    onto atlas pages.
+
+    Sheets that share a source image (such as the flying eye's idle and walk) are packed once.
+
+    Args:
+        sheets (list, optional): (name, path, frame size) entries. Defaults to SPRITE_SHEETS.
+        page_size (int, optional): The width and height of a page. Defaults to PAGE_SIZE.
+
+    Returns:
+        tuple: The page surfaces and an index of source stamps and per-sheet frame rects and pivot offsets.
+    """
+    # Trim every frame of every distinct source sheet
+    sources = {}
+    frames = []  # (trimmed surface, offset in the frame)
+    for _, path, frame_dimensions in sheets:
+        key = (path, tuple(frame_dimensions))
+        if key in sources:
+            continue
+        sheet = pygame.image.load(path)
+        sources[key] = []
+        for rect in slice_sheet(sheet, frame_dimensions):
+            frame = sheet.subsurface(rect)
+            bounds = frame.get_bounding_rect()
+            sources[key].append(len(frames))
+            frames.append((frame.subsurface(bounds), bounds.topleft))
+
+    # Pack the tallest frames first; fully transparent frames take no space
+    packer = ShelfPacker(page_size)
+    placements = [None] * len(frames)
+    for i in sorted(range(len(frames)), key=lambda i: (-frames[i][0].get_height(), -frames[i][0].get_width())):
+        width, height = frames[i][0].get_size()
+        if width and height:
+            placements[i] = packer.place(width, height)
+
+    pages = [pygame.Surface((page_size, max(height, 1)), pygame.SRCALPHA) for height in packer.pages]
+    for (frame, _), placement in zip(frames, placements):
+        if placement is not None:
+            page, x, y = placement
+            pages[page].blit(frame, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+
+    index = {'version': ATLAS_VERSION, 'sources': {}, 'sheets': {}}
+    for name, path, frame_dimensions in sheets:
+        index['sources'][path] = file_stamp(path)
+        entries = []
+        for i in sources[(path, tuple(frame_dimensions))]:
+            frame, (offset_x, offset_y) = frames[i]
+            page, x, y = placements[i] or (0, 0, 0)
+            entries.append([page, x, y, frame.get_width(), frame.get_height(), offset_x, offset_y])
+        index['sheets'][name] = {'source': path, 'frame_size': list(frame_dimensions), 'frames': entries}
+    return pages, index
+
+
+def build_atlas(sheets=SPRITE_SHEETS, output=ATLASPATH, page_size=PAGE_SIZE):
+    """
+    Packs the given sprite sheets and writes the pages as PNGs plus a JSON index of frame rects and pivot offsets.
+
+    Args:
+        sheets (list, optional): (name, path, frame size) entries. Defaults to SPRITE_SHEETS.
+        output (str, optional): The directory the pages and atlas.json are written to. Defaults to ATLASPATH.
+        page_size (int, optional): The width and height of a page. Defaults to PAGE_SIZE.
+
+    Returns:
+        dict: The atlas index that was written.
+    """
+    pages, index = pack_sheets(sheets, page_size)
+    os.makedirs(output, exist_ok=True)
+    index['pages'] = []
+    for i, page in enumerate(pages):
+        index['pages'].append(f"atlas_{i}.png")
+        pygame.image.save(page, os.path.join(output, index['pages'][-1]))
+
+    with open(os.path.join(output, 'atlas.json'), 'w') as f:
+        json.dump(index, f, indent=1)
+    return index
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Packs the game's sprite sheets into atlas pages")
+    parser.add_argument('--output', default=ATLASPATH, help='directory for the atlas pages and index')
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE, help='width and height of an atlas page')
+    args = parser.parse_args()
+
+    pygame.init()
+    index = build_atlas(output=args.output, page_size=args.page_size)
+    frames = sum(len(sheet['frames']) for sheet in index['sheets'].values())
+    source_pixels = sum(w * h for w, h in (pygame.image.load(path).get_size() for path in index['sources']))
+    atlas_pixels = 0
+    for page in index['pages']:
+        width, height = pygame.image.load(os.path.join(args.output, page)).get_size()
+        atlas_pixels += width * height
+    print(f"Packed {frames} frames from {len(index['sheets'])} sheets into {len(index['pages'])} pages "
+          f"({atlas_pixels / source_pixels:.0%} of the source sheet area)")
+    pygame.quit()
@@ -1,37 +1,48 @@
 import pygame
-from util.settings import WORLD_WIDTH
+from util.settings import WORLD_WIDTH, WORLD_HEIGHT
 
 class Camera:
+    CULL_MARGIN = 16  # Extra room around the view for outlines and interpolation
+
     def __init__(self, player, width, height):
+        """
+        Initializes a camera that follows the player and maps world positions to the screen.
+
+        Args:
+            player (Player): The character the camera follows.
+            width (int): The width of the view in pixels.
+            height (int): The height of the view in pixels.
+
+        Returns:
+            None
+        """
         self.player = player
         self.rect = pygame.Rect(0, 0, width, height)
-        self.last_player_x = player.pos[0]  # Initialize with the player's starting x position
         self.follow_vertical = False
+        self.update()
 
     def update(self):
-        # Calculate the change in the player's x position since the last frame
-        dx = self.player.pos[0] - self.last_player_x
-        print(f"dx: {dx}")  # Debug statement to check the change in position
-
-        # Move the camera rect in the opposite direction of the player's movement
-        self.rect.x -= dx
-        print(f"Camera rect after update: {self.rect}")  # Debug statement to check camera position
-
-        # Update the last_player_x for the next frame
-        self.last_player_x = self.player.pos[0]
+        """
+        Centers the view on the player's drawn position, keeping it inside the world. Call once per
+        rendered frame, before anything is drawn.
+        """
+        x, y = self.player.render_position()
+        self.rect.centerx = round(x + self.player.size[0] / 2)
+        if self.follow_vertical:
+            self.rect.centery = round(y + self.player.size[1] / 2)
 
         # Ensure the camera stays within the world bounds
-        if self.rect.left < 0:
-            self.rect.left = 0
-        if self.rect.right > WORLD_WIDTH:
-            self.rect.right = WORLD_WIDTH
+        self.rect.clamp_ip(pygame.Rect(0, 0, max(WORLD_WIDTH, self.rect.width), max(WORLD_HEIGHT, self.rect.height)))
+
+    def to_screen(self, pos):
+        return (pos[0] - self.rect.x, pos[1] - self.rect.y)
 
     def apply(self, entity):
         # Adjust entity's position for rendering based on the camera's position
-        return (entity.player_rect.x - self.rect.x, entity.player_rect.y - self.rect.y)
-
-
-
-
-
+        return (entity.rect.x - self.rect.x, entity.rect.y - self.rect.y)
 
+    def is_visible(self, rect):
+        """
+        Returns whether anything drawn for a world-space rect, including its outline, can be on screen.
+        """
+        return self.rect.inflate(self.CULL_MARGIN * 2, self.CULL_MARGIN * 2).colliderect(rect)
@@ -0,0 +1,143 @@
+import threading
+import time
+from collections import deque
+import pygame
+from util.profiler import percentile
+
+class DebugOverlay:
+    HISTORY = 120  # Frames kept for the rolling graphs and averages
+    GRAPH_SIZE = (240, 60)
+    GRAPH_SCALE_MS = 50  # Frame time at the top of the graph
+    BUDGET_MS = 1000 / 60
+    PHASE_COLORS = {
+        'enemy update': (255, 99, 71),
+        'player update': (255, 215, 0),
+        'world': (64, 224, 208),
+        'collision': (186, 85, 211),
+        'level render': (139, 90, 43),
+        'enemy render': (30, 144, 255),
+        'player render': (50, 205, 50),
+        'attack render': (255, 0, 0),
+        'hud': (220, 220, 220),
+    }
+
+    def __init__(self, game):
+        """
+        Initializes the profiler overlay shown while the game is in debug mode.
+
+        Args:
+            game (Game): The game whose frame phases are timed and drawn over.
+
+        Returns:
+            None
+        """
+        self.game = game
+        self.font = pygame.font.SysFont('Arial', 14)
+        self.phases = [
+            ('enemy update', game.update_enemies, True),
+            ('player update', game.update_player, True),
+            ('world', game.update_world, True),
+            ('collision', game.update_collisions, True),
+            ('level render', game.render_level, False),
+            ('enemy render', game.render_enemies, False),
+            ('player render', game.render_player, False),
+            ('attack render', game.render_attacks, False),
+            ('hud', game.render_hud, False),
+        ]
+        self.reset()
+
+    def reset(self):
+        """
+        Clears the recorded history, so stale samples from an earlier debug session are not shown.
+        """
+        self.frame_times = deque(maxlen=self.HISTORY)
+        self.phase_times = {name: deque(maxlen=self.HISTORY) for name, _, _ in self.phases}
+        self.tick_counts = deque(maxlen=self.HISTORY)
+        self.begin_frame()
+
+    def begin_frame(self):
+        self.frame_start = time.perf_counter()
+        self.frame_phases = dict.fromkeys(self.phase_times, 0.0)
+        self.frame_ticks = 0
+
+    def profile_update(self, deltaTime):
+        """
+        Runs one simulation tick with every update phase timed. A frame can run several ticks,
+        so their times are summed until profile_render closes the frame.
+        """
+        for name, phase, takes_delta in self.phases:
+            if takes_delta:
+                start = time.perf_counter()
+                phase(deltaTime)
+                self.frame_phases[name] += (time.perf_counter() - start) * 1000
+        self.frame_ticks += 1
+
+    def profile_render(self):
+        """
+        Runs the render phases timed, records the frame and draws the overlay on top.
+        """
+        for name, phase, takes_delta in self.phases:
+            if not takes_delta:
+                start = time.perf_counter()
+                phase()
+                self.frame_phases[name] += (time.perf_counter() - start) * 1000
+        for name, elapsed in self.frame_phases.items():
+            self.phase_times[name].append(elapsed)
+        self.tick_counts.append(self.frame_ticks)
+        self.frame_times.append((time.perf_counter() - self.frame_start) * 1000)
+        self.render()
+
+    def profile_frame(self, deltaTime):
+        """
+        Runs one tick and one render, timed, as a single frame.
+        """
+        self.begin_frame()
+        self.profile_update(deltaTime)
+        self.profile_render()
+
+    def render(self):
+        screen = self.game.screen
+        width, height = self.GRAPH_SIZE
+        lines = self.stat_lines()
+        line_height = self.font.get_linesize()
+        panel = pygame.Surface((width + 20, height + 20 + line_height * len(lines)), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+
+        # Rolling frame-time graph with the 60 FPS budget as a reference line
+        graph = pygame.Rect(10, 10, width, height)
+        pygame.draw.rect(panel, (80, 80, 80), graph, 1)
+        budget_y = graph.bottom - int(min(self.BUDGET_MS / self.GRAPH_SCALE_MS, 1) * height)
+        pygame.draw.line(panel, (0, 160, 0), (graph.left, budget_y), (graph.right - 1, budget_y))
+        if len(self.frame_times) > 1:
+            step = width / (self.HISTORY - 1)
+            points = [
+                (graph.left + int(i * step), graph.bottom - 1 - int(min(ms / self.GRAPH_SCALE_MS, 1) * (height - 1)))
+                for i, ms in enumerate(self.frame_times)
+            ]
+            pygame.draw.lines(panel, (255, 255, 255), False, points)
+
+        y = graph.bottom + 10
+        for text, color in lines:
+            panel.blit(self.font.render(text, True, color), (10, y))
+            y += line_height
+        screen.blit(panel, (10, 50))
+
+    def stat_lines(self):
+        frame_times = list(self.frame_times)
+        lines = []
+        if frame_times:
+            lines.append((f"frame {frame_times[-1]:5.2f} ms  avg {sum(frame_times) / len(frame_times):5.2f}  "
+                          f"p95 {percentile(frame_times, 0.95):5.2f}  max {max(frame_times):5.2f}", (255, 255, 255)))
+        for name, _, _ in self.phases:
+            samples = self.phase_times[name]
+            if samples:
+                lines.append((f"{name:<14} {sum(samples) / len(samples):5.2f} ms  max {max(samples):5.2f}",
+                              self.PHASE_COLORS[name]))
+
+        audio_player = self.game.audioPlayer
+        busy_channels = sum(1 for channel in audio_player.channels if channel.get_busy())
+        ticks = self.tick_counts[-1] if self.tick_counts else 0
+        lines.append((f"enemies {len(self.game.enemies)}  particles {self.game.particles.count}  ticks {ticks}", (255, 255, 255)))
+        lines.append((f"audio channels {busy_channels}/{len(audio_player.channels)}  queued {len(audio_player.sound_queue)}  "
+                      f"threads {threading.active_count()}", (255, 255, 255)))
+        return lines
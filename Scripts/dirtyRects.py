@@ -0,0 +1,68 @@
+import pygame
+
+class DirtyRectTracker:
+    MAX_RECTS = 96  # Past this many rects a single full-screen update is cheaper than the list
+
+    def __init__(self, screen, background):
+        """
+        Initializes the tracker for dirty-rectangle rendering. Instead of clearing and flipping the whole
+        screen, only the areas drawn last frame are restored from the background, and only the areas drawn
+        last frame and this frame are sent to the display.
+
+        Args:
+            screen (pygame.Surface): The display surface.
+            background (pygame.Surface): A screen-sized surface the erased areas are restored from.
+
+        Returns:
+            None
+        """
+        self.screen = screen
+        self.background = background
+        self.screen_rect = screen.get_rect()
+        self.previous = []
+        self.current = []
+        self.full_redraw = True
+
+    def invalidate(self):
+        """
+        Makes the next frame clear and update the whole screen, e.g. after the background or an overlay changed.
+        """
+        self.full_redraw = True
+
+    def mark(self, rect):
+        """
+        Records an area drawn this frame. Rects are clipped to the screen and empty ones are ignored.
+        """
+        rect = self.screen_rect.clip(rect)
+        if rect.width and rect.height:
+            self.current.append(rect)
+
+    def erase(self):
+        """
+        Restores the background under everything drawn last frame, and under anything already drawn this
+        frame before rendering started (such as attack rays drawn during updates).
+        """
+        if self.full_redraw:
+            self.screen.blit(self.background, (0, 0))
+            self.current = []
+            return
+        blit = self.screen.blit
+        background = self.background
+        for rect in self.previous:
+            blit(background, rect, rect)
+        for rect in self.current:
+            blit(background, rect, rect)
+        # Areas drawn before rendering never reached the display, so they don't need updating
+        self.current = []
+
+    def flush(self):
+        """
+        Sends the changed areas to the display and starts a new frame.
+        """
+        if self.full_redraw or len(self.previous) + len(self.current) > self.MAX_RECTS:
+            pygame.display.update()
+            self.full_redraw = False
+        else:
+            pygame.display.update(self.previous + self.current)
+        self.previous = self.current
+        self.current = []
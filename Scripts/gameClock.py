@@ -0,0 +1,56 @@
+class GameClock:
+    def __init__(self, time_scale=1.0, fixed_step=None):
+        """
+        Initializes the game clock that every cooldown, animation timer and scheduled callback reads from.
+
+        The clock only moves when advance() is called once per frame, so reading it costs an attribute
+        lookup instead of an SDL call, and game time can be paused, scaled or stepped deterministically.
+
+        Args:
+            time_scale (float, optional): Multiplier applied to real time. Defaults to 1.0.
+            fixed_step (float, optional): If set, every advance moves the clock by this many seconds
+                (times time_scale) regardless of how much real time passed. Defaults to None.
+
+        Returns:
+            None
+        """
+        self.time_scale = time_scale
+        self.fixed_step = fixed_step
+        self.paused = False
+        self.time = 0.0  # Game time in seconds
+        self.ticks = 0  # Game time in whole milliseconds, the drop-in for pygame.time.get_ticks()
+        self.delta = 0.0  # Game seconds covered by the last advance
+        self.frame = 0
+
+    def advance(self, real_delta):
+        """
+        Moves game time forward for one frame.
+
+        Args:
+            real_delta (float): The real time in seconds since the last frame.
+
+        Returns:
+            float: The game time step in seconds, 0 while paused.
+        """
+        if self.paused:
+            self.delta = 0.0
+        elif self.fixed_step is not None:
+            self.delta = self.fixed_step * self.time_scale
+        else:
+            self.delta = real_delta * self.time_scale
+        self.time += self.delta
+        self.ticks = int(self.time * 1000)
+        self.frame += 1
+        return self.delta
+
+    def get_ticks(self):
+        return self.ticks
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    def toggle_pause(self):
+        self.paused = not self.paused
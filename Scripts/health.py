@@ -36,6 +36,7 @@ class Health:
         # Draw a border around the health bar, if needed
         if self.border_width > 0:
             pygame.draw.rect(self.game.screen, self.border_color, (self.x, self.y, self.width, self.height), self.border_width)
+        self.game.mark_dirty((self.x, self.y, self.width, self.height))
         
          # Debugging text
         # debug_font = pygame.font.Font(None, 30)  
@@ -1,55 +1,128 @@
 import pygame
-import random
-import math
+import numpy as np
 
-class Particle:
-    def __init__(self, game, color, x, y):
+BLOOD_COLOR = (255, 87, 51)
+
+class ParticleEmitter:
+    ALPHA_LEVELS = 16  # Alpha is quantized to this many steps so rendered sprites can be shared
+
+    def __init__(self, game, capacity=4096):
+        """
+        Initializes a particle emitter that keeps every particle in NumPy arrays.
+
+        Args:
+            game (Game): The game object whose screen particles are drawn on.
+            capacity (int, optional): The maximum number of live particles. Defaults to 4096.
+
+        Returns:
+            None
+        """
         self.game = game
-        self.x = x
-        self.y = y
-        self.size = random.randint(2, 5)
-        self.color = color  
-        self.alpha = 255  
-        self.speed = random.uniform(0, 5)
-        self.angle = random.uniform(0, math.pi * 2)
-        self.lifetime = 0.2 
-        self.elapsed_time = 0
+        self.capacity = capacity
+        self.count = 0
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.velocity = np.zeros((capacity, 2), dtype=np.float32)
+        self.age = np.zeros(capacity, dtype=np.float32)
+        self.lifetime = np.ones(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.sprite_cache = {}
+        self.rng = np.random.default_rng()
 
-    def update(self, deltaTime):
-        self.elapsed_time += deltaTime
-        
-        # Fade the particle over its lifetime
-        lifetime_ratio = self.elapsed_time / self.lifetime
-        self.alpha = max(0, 255 * (1 - lifetime_ratio))  # Fade from 255 to 0
+    def emit(self, x, y, count, color, size_range=(2, 5), speed_range=(0, 5), lifetime_range=(0.2, 0.2)):
+        """
+        Spawns a burst of particles at the given position, each moving in a random direction.
 
-        if self.elapsed_time >= self.lifetime:
-            return False  # Indicate that this particle should be removed
-        
-        # Move the particle
-        self.x += math.cos(self.angle) * self.speed * deltaTime
-        self.y += math.sin(self.angle) * self.speed * deltaTime
+        Args:
+            x (float): The x coordinate of the burst.
+            y (float): The y coordinate of the burst.
+            count (int): The number of particles to spawn. Extra particles are dropped once the emitter is full.
+            color (tuple): The RGB color of the particles.
+            size_range (tuple, optional): The inclusive range of starting radii in pixels.
+            speed_range (tuple, optional): The range of speeds in pixels per second.
+            lifetime_range (tuple, optional): The range of lifetimes in seconds.
 
-        # Optionally, reduce the size
-        self.size = max(0, self.size - 0.1 * deltaTime)
+        Returns:
+            None
+        """
+        count = min(count, self.capacity - self.count)
+        if count <= 0:
+            return
+        start, end = self.count, self.count + count
+        angle = self.rng.uniform(0, np.pi * 2, count)
+        speed = self.rng.uniform(speed_range[0], speed_range[1], count)
+        self.pos[start:end] = (x, y)
+        self.velocity[start:end, 0] = np.cos(angle) * speed
+        self.velocity[start:end, 1] = np.sin(angle) * speed
+        self.age[start:end] = 0
+        self.lifetime[start:end] = self.rng.uniform(lifetime_range[0], lifetime_range[1], count)
+        self.size[start:end] = self.rng.integers(size_range[0], size_range[1], count, endpoint=True)
+        self.color[start:end] = color
+        self.count = end
 
-        return True  # Indicate that the particle is still alive
+    def emit_blood(self, x, y, count=30):
+        """
+        Spawns a burst of blood: slightly bigger, faster and longer-lived than regular particles.
+        """
+        self.emit(x, y, count, BLOOD_COLOR, size_range=(4, 7), speed_range=(1, 10), lifetime_range=(0.5, 1.5))
+
+    def update(self, deltaTime):
+        """
+        Ages, moves and shrinks every live particle in one vectorized pass, then drops expired ones.
+        """
+        n = self.count
+        if n == 0:
+            return
+        self.age[:n] += deltaTime
+        self.pos[:n] += self.velocity[:n] * deltaTime
+        np.maximum(self.size[:n] - 0.1 * deltaTime, 0, out=self.size[:n])
+
+        alive = (self.age[:n] < self.lifetime[:n]) & (self.size[:n] > 0)
+        alive_count = int(np.count_nonzero(alive))
+        if alive_count < n:
+            for array in (self.pos, self.velocity, self.age, self.lifetime, self.size, self.color):
+                array[:alive_count] = array[:n][alive]
+            self.count = alive_count
+
+    def get_sprite(self, color, radius, alpha_level):
+        """
+        Returns a pre-rendered circle for the given color, radius and quantized alpha, building it on first use.
+        """
+        key = (color, radius, alpha_level)
+        sprite = self.sprite_cache.get(key)
+        if sprite is None:
+            alpha = int(255 * alpha_level / (self.ALPHA_LEVELS - 1))
+            sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (*color, alpha), (radius, radius), radius)
+            self.sprite_cache[key] = sprite
+        return sprite
 
     def render(self):
-        if self.size > 0 and self.alpha > 0:  # Only draw if the particle still has size and alpha
-            color_with_alpha = (*self.color, int(self.alpha))  # Add alpha to the color
-            surface_with_alpha = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)  # Create a surface with alpha
-            pygame.draw.circle(surface_with_alpha, color_with_alpha, (self.size, self.size), int(self.size))
-            self.game.screen.blit(surface_with_alpha, (int(self.x - self.size), int(self.y - self.size)))
-
-class BloodParticle(Particle):
-    def __init__(self, game, x, y):
-        color = (255, 87, 51) 
-        super().__init__(game, color, x, y)
-        angle = random.uniform(0, 2 * math.pi)
-        self.size = random.randint(4, 7)  # Slightly bigger particles for blood
-        self.speed = random.uniform(1, 10)  # Faster moving particles
-        self.lifetime = random.uniform(0.5, 1.5)  # Longer lifetime for dramatic effect
+        """
+        Draws every visible particle with a single batched blit call.
+        """
+        n = self.count
+        if n == 0:
+            return
+        fade = np.clip(1 - self.age[:n] / self.lifetime[:n], 0, 1)
+        alpha_levels = np.rint(fade * (self.ALPHA_LEVELS - 1)).astype(np.int32)
+        radii = self.size[:n].astype(np.int32)
+        visible = (alpha_levels > 0) & (radii > 0)
+        if not visible.any():
+            return
 
-    def update(self, deltaTime):
-        super().update(deltaTime)
+        radii = radii[visible]
+        corners = (self.pos[:n][visible] - radii[:, None] - self.game.camera.rect.topleft).astype(np.int32)
+        colors = [tuple(color) for color in self.color[:n][visible].tolist()]
+        get_sprite = self.get_sprite
+        self.game.screen.blits(
+            [(get_sprite(color, radius, level), (x, y))
+             for color, radius, level, (x, y) in zip(colors, radii.tolist(), alpha_levels[visible].tolist(), corners.tolist())],
+            doreturn=False,
+        )
 
+        # One bounding rect for the whole batch keeps the dirty list short
+        diameters = radii * 2
+        left, top = corners.min(axis=0).tolist()
+        right, bottom = (corners + diameters[:, None]).max(axis=0).tolist()
+        self.game.mark_dirty((left, top, right - left, bottom - top))
@@ -3,9 +3,10 @@ import random
 import math
 from util.settings import *
 from util.Audio import AudioPlayer
-from Scripts.Gravity import Gravity 
 from Scripts.health import Health
-from Scripts.CollisionHandler import CollisionHandler
+from util.logger import get_logger
+
+log = get_logger(__name__)
 
 class Player:
     def __init__(self, game, pos, size, inputHandler):
@@ -38,25 +39,24 @@ class Player:
         self.velocity_y = 0
         self.grounded = False
         self.ground_level = 600
-        self.gravity = Gravity()
+        self.gravity = self.game.gravity  # Shared by every entity
 
-        self.audio_player = AudioPlayer()
-        self.audio_player.setup_sounds()
+        self.audio_player = AudioPlayer.shared().handle()
         
+        # Animations map to sprite sheet names; frames are looked up through the asset manager's cache
         self.animations = {
-              "idle": game.assetManager.get_asset('knight_idle'),
-              "run": game.assetManager.get_asset('knight_run'),
-              "jump": game.assetManager.get_asset('knight_jump'),
-              "attack1": game.assetManager.get_asset('knight_attack'),
-              "attack2": game.assetManager.get_asset('knight_attack2'),
-              "death": game.assetManager.get_asset('knight_death')
+              "idle": 'knight_idle',
+              "run": 'knight_run',
+              "jump": 'knight_jump',
+              "attack1": 'knight_attack',
+              "attack2": 'knight_attack2',
+              "death": 'knight_death'
         }
         self.frameIndex = 0
         self.currentAnimation = "idle"
         self.animationSpeed = 0.1
-        self.lastUpdate = pygame.time.get_ticks()
-        self.image = pygame.transform.scale(self.animations[self.currentAnimation][self.frameIndex], self.size)
-        self.mask = pygame.mask.from_surface(self.image)
+        self.lastUpdate = self.game.game_clock.ticks
+        self.set_frame_image()
         
         self.health = Health(self.game, 50, 20, 400, 20, 100, fg_color=(192,192,192), bg_color=(255, 0, 0))
 
@@ -65,6 +65,7 @@ class Player:
         
         self.attacked = False
         self.death_animation_done = False
+        self.previous_position = None  # Position before the last simulation tick, for render interpolation
     def update(self,deltaTime,all_characters):
         """
         Updates the player's position and state based on the given time delta and input.
@@ -115,26 +116,42 @@ class Player:
 
         self.animationUpdate(moving, self.Jumping, attack1,attack2)
         # print(f"Player position after input: {self.pos}")
-        CollisionHandler.resolve_collisions(self, all_characters, allowed_overlap=305)
+        # Collisions are resolved once per frame for every character by Game through CollisionHandler.resolve_all
     
     def update_mask(self):
-        self.mask = pygame.mask.from_surface(self.image)
+        self.mask = self.game.assetManager.get_frame_mask(*self.frame_key, self.size, self.flip)
+
+    def animation_length(self, animation=None):
+        """
+        Returns the number of frames in the given animation, or in the current one if none is given.
+        """
+        return self.game.assetManager.frame_count(self.animations[animation or self.currentAnimation])
+
+    def set_frame_image(self):
+        """
+        Looks up the pre-scaled right- and left-facing images for the current animation frame.
+        """
+        sheet = self.animations[self.currentAnimation]
+        self.frame_key = (sheet, self.frameIndex)
+        self.image = self.game.assetManager.get_scaled_frame(sheet, self.frameIndex, self.size)
+        self.image_left = self.game.assetManager.get_scaled_frame(sheet, self.frameIndex, self.size, flipped=True)
+        self.update_mask()
 
     def animationUpdate(self, moving, jumping, attack1, attack2):
-        now = pygame.time.get_ticks()
+        now = self.game.game_clock.ticks
 
         # Only update the frame index if it's time and the death animation isn't completed
         if now - self.lastUpdate > int(1000 * self.animationSpeed) and not self.death_animation_done:
             self.lastUpdate = now
 
             # Ensure the frame index does not exceed the number of frames
-            if self.frameIndex < len(self.animations[self.currentAnimation]) - 1:
+            if self.frameIndex < self.animation_length() - 1:
                 self.frameIndex += 1
             elif self.currentAnimation != "death":
                 # Reset the animation only if it's not the death animation
                 self.frameIndex = 0
             # If it's the death animation and the last frame, set the flag
-            if self.currentAnimation == "death" and self.frameIndex == len(self.animations[self.currentAnimation]) - 1:
+            if self.currentAnimation == "death" and self.frameIndex == self.animation_length() - 1:
                 self.death_animation_done = True
                 self.inputHandler.disable_input()
 
@@ -152,17 +169,37 @@ class Player:
                 self.currentAnimation = "idle"
 
         # Update the sprite image if the current animation and frame index are valid
-        if 0 <= self.frameIndex < len(self.animations[self.currentAnimation]):
-            self.image = pygame.transform.scale(self.animations[self.currentAnimation][self.frameIndex], self.size)
-            self.image_left = pygame.transform.flip(self.image, True, False)
+        if 0 <= self.frameIndex < self.animation_length():
+            self.set_frame_image()
         else:
             # Log an error or handle unexpected case
-            print(f"Invalid frame index {self.frameIndex} for animation {self.currentAnimation}")
+            log.error("Invalid frame index %s for animation %s", self.frameIndex, self.currentAnimation)
+
+    def position(self):
+        """
+        Returns where the sprite is drawn for the current simulation state.
+        """
+        return (self.pos[0], self.pos[1])
+
+    def store_previous_position(self):
+        self.previous_position = self.position()
+
+    def render_position(self):
+        """
+        Blends the positions before and after the last simulation tick by the game's render alpha,
+        so movement looks smooth when the display rate differs from the tick rate.
+        """
+        x, y = self.position()
+        if self.previous_position is None:
+            return (x, y)
+        alpha = self.game.render_alpha
+        previous_x, previous_y = self.previous_position
+        return (previous_x + (x - previous_x) * alpha, previous_y + (y - previous_y) * alpha)
 
     def render(self):
         """
         Renders the current animation of the player on the game screen.
-        It uses a mask to create a precise border around the sprite.
+        It blits a cached outline built from the frame's mask to create a precise border around the sprite.
 
         Parameters:
             None
@@ -175,27 +212,26 @@ class Player:
         else:
             current_anim = self.image
 
-        sprite_pos = (self.pos[0], self.pos[1])
+        sprite_pos = self.game.camera.to_screen(self.render_position())
         self.game.screen.blit(current_anim, sprite_pos)
 
-        self.mask = pygame.mask.from_surface(current_anim)
-        outline = self.mask.outline()  
+        self.update_mask()
 
         border_color = (0, 0, 0)  
 
-        for point in outline:
-            adjusted_point = (point[0] + sprite_pos[0], point[1] + sprite_pos[1])
-            pygame.draw.circle(self.game.screen, border_color, adjusted_point, 1) 
+        outline = self.game.assetManager.get_frame_outline(*self.frame_key, self.size, self.flip, border_color)
+        pad = self.game.assetManager.OUTLINE_PADDING
+        self.game.mark_dirty(self.game.screen.blit(outline, (sprite_pos[0] - pad, sprite_pos[1] - pad)))
 
         # self.health.render() 
     
     def can_attack(self):
-        now = pygame.time.get_ticks()
+        now = self.game.game_clock.ticks
         return now - self.last_attack_time >= self.attack_cooldown * 1000
 
     def attack(self):
         if self.can_attack():
-            self.last_attack_time = pygame.time.get_ticks()
+            self.last_attack_time = self.game.game_clock.ticks
 
             if self.currentAnimation in ["attack1", "attack2"] and self.frameIndex in [4, 6]:
                 ray_length = 5
@@ -209,9 +245,7 @@ class Player:
                 ]
 
                 for start, end in rays:
-                    # if self.game.debug_mode:
-                    pygame.draw.line(self.game.screen, (255, 0, 0), start, end, 2)
-                        # self.render()
+                    self.game.add_attack_ray(start, end, 2)
 
                     for enemy in self.game.enemies:
                         if self.line_rect_collision(start, end, enemy.enemy_rect):
@@ -223,13 +257,14 @@ class Player:
                                 enemy.pos[0] += knockback_distance * direction_multiplier
                                 enemy.enemy_rect.x += knockback_distance * direction_multiplier
                                 enemy.enemy_health.apply_decay(20) if self.currentAnimation == "attack2" else enemy.enemy_health.apply_decay(10)
+                                self.game.particles.emit_blood(enemy.enemy_rect.centerx, enemy.enemy_rect.centery)
                             else:
-                                print("Already attacked")
+                                log.debug("Already attacked")
                         else:
                             enemy.attacked = False
-                            print("Miss")
+                            log.debug("Miss")
                     else:
-                        print("No enemies or not in range")
+                        log.debug("No enemies or not in range")
 
     def line_rect_collision(self,ray_start, ray_end, rect):
         # This function needs to determine if the line from ray_start to ray_end intersects the rectangle 'rect'
@@ -0,0 +1,162 @@
+import numpy as np
+
+class ProximityService:
+    def __init__(self):
+        """
+        Initializes a per-frame index of entity positions for distance and neighbour queries.
+
+        Positions are captured once per frame by rebuild. Neighbour counts for a radius are then computed
+        for every entity in one vectorized pass and cached, so isolation checks, fear updates and any
+        flocking logic cost a lookup each instead of a Python loop over every other entity.
+        Only entities within radius horizontally are ever compared.
+
+        Returns:
+            None
+        """
+        self.entities = []
+        self.index = {}  # id(entity) -> row
+        self.positions = np.zeros((0, 2))
+        self.counts = {}  # radius -> neighbour count of every row
+        self.isolation = {}  # radius -> whether every row has no neighbour
+        self.order = self.sorted_points = None  # Rows sorted by x, computed on first use
+
+    def rebuild(self, entities, crowd=None):
+        """
+        Captures the positions of the given entities for this frame. A crowd's members come first,
+        copied straight from its position array.
+
+        Args:
+            entities (list): Entities with a pos.
+            crowd (EnemyCrowd, optional): A crowd whose members are indexed too. Defaults to None.
+
+        Returns:
+            None
+        """
+        positions = [entity.pos[:2] for entity in entities]
+        self.entities = list(entities)
+        if crowd is not None and crowd.count:
+            self.entities = crowd.members + self.entities
+            positions = np.vstack([crowd.pos[:crowd.count], np.array(positions, dtype=np.float64).reshape(-1, 2)])
+        self.positions = np.array(positions, dtype=np.float64).reshape(-1, 2)
+        self.index = {id(entity): i for i, entity in enumerate(self.entities)}
+        self.counts.clear()
+        self.isolation.clear()
+        self.order = self.sorted_points = None
+
+    def row(self, entity):
+        return self.index.get(id(entity))
+
+    def neighbor_counts(self, radius):
+        """
+        Returns the number of other entities closer than radius to each entity, in rebuild order.
+        """
+        counts = self.counts.get(radius)
+        if counts is None:
+            counts = self.counts[radius] = self.compute_counts(radius)
+        return counts
+
+    def isolated(self, radius):
+        """
+        Returns whether each entity has no other entity closer than radius, in rebuild order.
+        Cheaper than neighbor_counts when only isolation matters.
+        """
+        isolated = self.isolation.get(radius)
+        if isolated is None:
+            isolated = self.isolation[radius] = self.compute_isolation(radius)
+        return isolated
+
+    def sorted_by_x(self):
+        if self.order is None:
+            self.order = np.argsort(self.positions[:, 0], kind='stable')
+            self.sorted_points = self.positions[self.order]
+        return self.order, self.sorted_points
+
+    def window_hits(self, sorted_points, rows, radius):
+        """
+        Tests the given rows of the x-sorted points against every point within radius horizontally.
+        Each row's candidates form one contiguous window, and all windows are expanded into
+        (row, column) pairs and tested in one pass.
+
+        Returns:
+            tuple: The row of every pair closer than radius, and the number of such pairs per row.
+        """
+        xs = sorted_points[:, 0]
+        lo = np.searchsorted(xs, xs[rows] - radius, side='left')
+        hi = np.searchsorted(xs, xs[rows] + radius, side='right')
+        lengths = hi - lo
+        pair_rows = np.repeat(np.arange(len(rows)), lengths)
+        columns = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths - lo, lengths)
+        points = sorted_points[rows]
+        dx = points[pair_rows, 0] - sorted_points[columns, 0]
+        dy = points[pair_rows, 1] - sorted_points[columns, 1]
+        hits = pair_rows[dx * dx + dy * dy < radius * radius]
+        return np.bincount(hits, minlength=len(rows)) - 1  # Not counting itself
+
+    def compute_counts(self, radius):
+        n = len(self.positions)
+        if n < 2:
+            return np.zeros(n, dtype=np.int64)
+        order, sorted_points = self.sorted_by_x()
+        counts = np.empty(n, dtype=np.int64)
+        counts[order] = self.window_hits(sorted_points, np.arange(n), radius)
+        return counts
+
+    def compute_isolation(self, radius):
+        n = len(self.positions)
+        if n < 2:
+            return np.ones(n, dtype=bool)
+        order, sorted_points = self.sorted_by_x()
+
+        # Two entities in the same grid cell smaller than radius / sqrt(2) are always within radius,
+        # and neighbours in x order are often close too. Together these settle most entities; only
+        # the rest are tested against their whole window.
+        cells = np.floor(sorted_points / (radius / 1.5)).astype(np.int64)
+        _, cell, cell_sizes = np.unique(cells, axis=0, return_inverse=True, return_counts=True)
+        isolated = cell_sizes[cell.reshape(-1)] == 1
+        gaps = sorted_points[1:] - sorted_points[:-1]
+        close = gaps[:, 0] ** 2 + gaps[:, 1] ** 2 < radius * radius
+        isolated[1:] &= ~close
+        isolated[:-1] &= ~close
+        rows = np.flatnonzero(isolated)
+        if len(rows):
+            isolated[rows] = self.window_hits(sorted_points, rows, radius) == 0
+
+        unsorted = np.empty(n, dtype=bool)
+        unsorted[order] = isolated
+        return unsorted
+
+    def count_within(self, entity, radius):
+        """
+        Returns the number of other entities closer than radius to entity, or None if it is not indexed.
+        """
+        i = self.row(entity)
+        return None if i is None else int(self.neighbor_counts(radius)[i])
+
+    def is_isolated(self, entity, radius):
+        """
+        Returns whether no other entity is closer than radius to entity, or None if it is not indexed.
+        """
+        i = self.row(entity)
+        return None if i is None else bool(self.isolated(radius)[i])
+
+    def distance(self, entity, other):
+        """
+        Returns the distance between two indexed entities, or None if either is not indexed.
+        """
+        i, j = self.row(entity), self.row(other)
+        if i is None or j is None:
+            return None
+        dx, dy = self.positions[i] - self.positions[j]
+        return float(np.hypot(dx, dy))
+
+    def neighbors(self, entity, radius):
+        """
+        Returns the other entities closer than radius to entity, nearest first.
+        """
+        i = self.row(entity)
+        if i is None:
+            return []
+        offsets = self.positions - self.positions[i]
+        distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        close = np.flatnonzero(distances < radius)
+        return [self.entities[j] for j in close[np.argsort(distances[close], kind='stable')] if j != i]
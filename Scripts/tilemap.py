@@ -0,0 +1,174 @@
+import json
+import numpy as np
+import pygame
+from util.logger import get_logger
+
+log = get_logger(__name__)
+
+EMPTY = '.'
+
+
+class Span:
+    def __init__(self, pos, size):
+        """
+        The top of a run of solid tiles, shaped like the platforms Gravity lands entities on.
+        """
+        self.pos = pos
+        self.size = size
+
+
+class Tilemap:
+    def __init__(self, layout, tileset=None):
+        """
+        Initializes a tilemap from a level layout, as loaded from JSON by AssetManager.load_tiles.
+
+        The static tiles are drawn once into chunk_size x chunk_size tile chunks, so drawing the level
+        costs one blit per visible chunk instead of one per tile. Solid tiles are kept in a boolean grid,
+        so a collision query only looks at the cells a rect touches.
+
+        Args:
+            layout (dict): The level: tile_size, chunk_size, a tiles legend mapping a character to its
+                color or tileset cell and whether it is solid, and layers of rows drawn bottom to top.
+            tileset (pygame.Surface, optional): The image tileset cells are cut from. Defaults to None.
+
+        Returns:
+            None
+        """
+        self.tile_size = layout.get('tile_size', 32)
+        self.chunk_size = layout.get('chunk_size', 16)
+        self.legend = layout.get('tiles', {})
+        self.layers = [layer['rows'] for layer in layout.get('layers', [])]
+
+        self.rows = max((len(rows) for rows in self.layers), default=0)
+        self.columns = max((len(row) for rows in self.layers for row in rows), default=0)
+        self.width = self.columns * self.tile_size
+        self.height = self.rows * self.tile_size
+
+        self.solid = np.zeros((self.rows, self.columns), dtype=bool)
+        for rows in self.layers:
+            for y, row in enumerate(rows):
+                for x, key in enumerate(row):
+                    if key != EMPTY and self.legend.get(key, {}).get('solid', False):
+                        self.solid[y, x] = True
+
+        self.tile_images = self.build_tile_images(tileset)
+        self.chunks = self.build_chunks()
+
+    def build_tile_images(self, tileset):
+        size = self.tile_size
+        images = {}
+        for key, properties in self.legend.items():
+            image = pygame.Surface((size, size), pygame.SRCALPHA)
+            if 'tileset' in properties and tileset is not None:
+                column, row = properties['tileset']
+                image.blit(tileset, (0, 0), (column * size, row * size, size, size))
+            else:
+                image.fill(properties.get('color', (255, 0, 255)))
+            images[key] = image.convert_alpha()
+        return images
+
+    def build_chunks(self):
+        """
+        Draws every chunk that has at least one tile into its own surface.
+
+        Returns:
+            dict: (chunk column, chunk row) -> (surface, offset of the surface in the chunk).
+        """
+        chunk_pixels = self.chunk_size * self.tile_size
+        chunks = {}
+        for rows in self.layers:
+            for y, row in enumerate(rows):
+                for x, key in enumerate(row):
+                    image = self.tile_images.get(key)
+                    if key == EMPTY or image is None:
+                        continue
+                    chunk_key = (x // self.chunk_size, y // self.chunk_size)
+                    chunk = chunks.get(chunk_key)
+                    if chunk is None:  # Only chunks with tiles get a surface
+                        chunk = chunks[chunk_key] = pygame.Surface((chunk_pixels, chunk_pixels), pygame.SRCALPHA).convert_alpha()
+                        chunk.fill((0, 0, 0, 0))
+                    chunk.blit(image, ((x % self.chunk_size) * self.tile_size, (y % self.chunk_size) * self.tile_size))
+        # Keep only the drawn part of each chunk, so sparse chunks don't blend empty pixels every frame
+        for chunk_key, chunk in chunks.items():
+            bounds = chunk.get_bounding_rect()
+            chunks[chunk_key] = (chunk.subsurface(bounds), bounds.topleft)
+        log.info("Built %d tilemap chunks for a %dx%d tile level", len(chunks), self.columns, self.rows)
+        return chunks
+
+    def render(self, surface, view):
+        """
+        Draws the chunks that overlap the view.
+
+        Args:
+            surface (pygame.Surface): The surface to draw on.
+            view (pygame.Rect): The visible area in level coordinates; its top left is drawn at (0, 0).
+
+        Returns:
+            None
+        """
+        chunk_pixels = self.chunk_size * self.tile_size
+        blits = []
+        for cy in range(max(view.top // chunk_pixels, 0), (view.bottom - 1) // chunk_pixels + 1):
+            for cx in range(max(view.left // chunk_pixels, 0), (view.right - 1) // chunk_pixels + 1):
+                chunk = self.chunks.get((cx, cy))
+                if chunk is not None:
+                    image, (dx, dy) = chunk
+                    blits.append((image, (cx * chunk_pixels + dx - view.x, cy * chunk_pixels + dy - view.y)))
+        surface.blits(blits, doreturn=False)
+
+    def cells(self, rect):
+        """
+        Returns the row and column slices of the cells a rect touches, clipped to the level.
+        """
+        size = self.tile_size
+        return (slice(max(rect.top // size, 0), max((rect.bottom - 1) // size + 1, 0)),
+                slice(max(rect.left // size, 0), max((rect.right - 1) // size + 1, 0)))
+
+    def is_solid(self, x, y):
+        """
+        Returns whether the tile under a point in level coordinates is solid.
+        """
+        column, row = int(x // self.tile_size), int(y // self.tile_size)
+        return 0 <= row < self.rows and 0 <= column < self.columns and bool(self.solid[row, column])
+
+    def collides(self, rect):
+        """
+        Returns whether a rect in level coordinates touches any solid tile.
+        """
+        rows, columns = self.cells(rect)
+        return bool(self.solid[rows, columns].any())
+
+    def solid_rects(self, rect):
+        """
+        Returns the rects of the solid tiles a rect touches, for resolving the collision.
+        """
+        rows, columns = self.cells(rect)
+        size = self.tile_size
+        return [pygame.Rect((columns.start + x) * size, (rows.start + y) * size, size, size)
+                for y, x in zip(*np.nonzero(self.solid[rows, columns]))]
+
+    def platforms(self):
+        """
+        Returns the walkable tops of the solid tiles, one Span per horizontal run of solid tiles
+        with nothing solid above them. They can be handed to Gravity through a PlatformIndex.
+        """
+        size = self.tile_size
+        spans = []
+        open_above = self.solid.copy()
+        open_above[1:] &= ~self.solid[:-1]
+        for y in range(self.rows):
+            row = np.concatenate(([False], open_above[y], [False]))
+            edges = np.flatnonzero(row[1:] != row[:-1])
+            for start, end in zip(edges[::2], edges[1::2]):
+                spans.append(Span([int(start) * size, y * size], [int(end - start) * size, size]))
+        return spans
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads a level layout from a JSON file, with its tileset image if it names one.
+        """
+        with open(path) as f:
+            layout = json.load(f)
+        tileset = pygame.image.load(layout['tileset']).convert_alpha() if layout.get('tileset') else None
+        return cls(layout, tileset)
@@ -0,0 +1,55 @@
+import heapq
+import itertools
+import pygame
+
+class TimerService:
+    def __init__(self, clock=pygame.time.get_ticks):
+        """
+        Initializes a main-thread timer service for "after N ms, do X" callbacks.
+
+        Timers are kept in a heap ordered by due time, so each update only looks at timers that are due.
+
+        Args:
+            clock (callable, optional): Returns the current time in milliseconds. Defaults to pygame.time.get_ticks.
+
+        Returns:
+            None
+        """
+        self.clock = clock
+        self.heap = []
+        self.counter = itertools.count()
+        self.active = set()
+
+    def schedule(self, delay_ms, callback, *args):
+        """
+        Schedules callback(*args) to run on the first update at least delay_ms milliseconds from now.
+
+        Returns:
+            int: A timer id that can be passed to cancel.
+        """
+        timer_id = next(self.counter)
+        heapq.heappush(self.heap, (self.clock() + delay_ms, timer_id, callback, args))
+        self.active.add(timer_id)
+        return timer_id
+
+    def cancel(self, timer_id):
+        """
+        Cancels a pending timer. Cancelling a timer that already ran does nothing.
+        """
+        self.active.discard(timer_id)
+
+    def pending(self):
+        return len(self.active)
+
+    def update(self):
+        """
+        Runs every timer that is due, in due order. Must be called from the main thread once per frame.
+        """
+        now = self.clock()
+        heap = self.heap
+        while heap and heap[0][0] <= now:
+            _, timer_id, callback, args = heapq.heappop(heap)
+            if timer_id not in self.active:
+                continue  # Cancelled
+            self.active.discard(timer_id)
+            callback(*args)
@@ -0,0 +1,222 @@
+import argparse
+import json
+import platform
+import random
+import subprocess
+import pygame
+from game import Game
+from Enemies.BaseEnemy import Enemy
+from Enemies.crowd import EnemyCrowd
+from Enemies.Goblin import Goblin
+from Enemies.Mushroom import Mushroom
+from Enemies.FlyingEye import FlyingEye
+from Enemies.FireWorm import FireWorm
+from Scripts.CollisionHandler import CollisionHandler
+from Scripts.InputHandler import ScriptedInputHandler, DummyInputHandler
+from util.profiler import FrameProfiler
+from util.settings import SCREENW
+
+# Enemy class, size and spawn height for every enemy type a scenario can use
+ENEMY_TYPES = {
+    'skeleton': (Enemy, [400, 400], 288),
+    'goblin': (Goblin, [400, 400], 288),
+    'mushroom': (Mushroom, [400, 400], 288),
+    'flyingeye': (FlyingEye, [400, 400], 288),
+    'fireworm': (FireWorm, [300, 300], 360),
+}
+SECTIONS = ('ai', 'animation', 'collision', 'render', 'audio')
+
+# Run right, swing, run left, heavy swing, jump and idle, looped for the whole scenario
+PLAYER_SCRIPT = [
+    (60, ['move_right']),
+    (20, ['attack1']),
+    (60, ['move_left']),
+    (20, ['attack2']),
+    (10, ['jump']),
+    (30, []),
+]
+
+
+def spawn_enemies(game, mix, count, rng):
+    """
+    Spawns count enemies spread across the screen, cycling through the enemy types in mix.
+    """
+    enemies = []
+    for i in range(count):
+        enemy_class, size, y = ENEMY_TYPES[mix[i % len(mix)]]
+        x = rng.randint(-100, SCREENW - 200)
+        if enemy_class is Enemy:
+            # Game.create_skeleton makes crowd members when the game has a crowd
+            enemies.append(game.create_skeleton(pos=[x, y], size=list(size)))
+        else:
+            enemies.append(enemy_class(game, pos=[x, y], size=list(size)))
+    return enemies
+
+
+def instrument(game, profiler):
+    """
+    Wraps the game's per-frame work so the profiler can attribute time to AI, animation, collision,
+    rendering and audio. Only instance attributes are replaced; the returned callable undoes all of it.
+    """
+    wrapped = []
+
+    def wrap(obj, attribute, section):
+        if hasattr(obj, attribute):
+            setattr(obj, attribute, profiler.wrap(section, getattr(obj, attribute)))
+            wrapped.append((obj, attribute))
+
+    for enemy in game.enemies:
+        wrap(enemy.state_machine, 'update', 'ai')
+        wrap(enemy, 'evaluate_combat_state', 'ai')
+        wrap(enemy, 'animationUpdate', 'animation')
+        wrap(enemy, 'update_image', 'animation')
+        wrap(enemy, 'render', 'render')
+    wrap(game.proximity, 'rebuild', 'ai')
+    wrap(game.proximity, 'compute_isolation', 'ai')
+    wrap(game.proximity, 'compute_counts', 'ai')
+    if game.crowd is not None:
+        wrap(game.crowd, 'move', 'ai')
+        wrap(game.crowd, 'update_animations', 'animation')
+        wrap(game.crowd, 'resolve_player_collisions', 'collision')
+        wrap(game.crowd, 'render', 'render')
+    wrap(game.player, 'animationUpdate', 'animation')
+    wrap(game, 'render_level', 'render')
+    wrap(game.player, 'render', 'render')
+    wrap(game.player.health, 'render', 'render')
+    wrap(game.particles, 'render', 'render')
+    wrap(game.audioPlayer, 'enqueue_sound', 'audio')
+    wrap(game.audioPlayer, 'update', 'audio')
+
+    resolve_all = CollisionHandler.__dict__['resolve_all']
+    CollisionHandler.resolve_all = staticmethod(profiler.wrap('collision', resolve_all.__func__))
+
+    def restore():
+        for obj, attribute in wrapped:
+            delattr(obj, attribute)
+        CollisionHandler.resolve_all = resolve_all
+    return restore
+
+
+def run_scenario(mix, count, frames, warmup, deltaTime, seed, crowd=False):
+    """
+    Builds a headless Game with the given enemy mix, drives the player with scripted inputs
+    and returns the frame time summary for the measured frames. With crowd set, skeletons
+    are spawned into an EnemyCrowd and updated in batches.
+    """
+    rng = random.Random(seed)
+    random.seed(seed)
+    game = Game(headless=True)
+    game.game_clock.fixed_step = deltaTime
+    game.player.inputHandler = ScriptedInputHandler(PLAYER_SCRIPT)
+    for name in mix:
+        game.assetManager.prefetch_set(name)
+    if crowd:
+        game.crowd = EnemyCrowd(game, capacity=count)
+    game.enemies = spawn_enemies(game, mix, count, rng)
+
+    def step():
+        pygame.event.pump()
+        game.screen.fill('#f7b32b')
+        game.update(game.game_clock.advance(deltaTime))
+        game.update_camera()
+        game.render()
+        game.audioPlayer.update()
+
+    for _ in range(warmup):
+        step()
+
+    profiler = FrameProfiler(SECTIONS)
+    restore = instrument(game, profiler)
+    try:
+        for _ in range(frames):
+            profiler.begin_frame()
+            step()
+            profiler.end_frame()
+    finally:
+        restore()
+
+    result = profiler.summary()
+    result.update({'name': f"{'+'.join(mix)} x{count}{' crowd' if crowd else ''}", 'mix': list(mix), 'count': count, 'crowd': crowd})
+    return result
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_result(result):
+    frame = result['frame_ms']
+    print(f"{result['name']:<40} mean {frame['mean']:7.2f} ms  p95 {frame['p95']:7.2f} ms  p99 {frame['p99']:7.2f} ms")
+    for name, section in result['sections'].items():
+        print(f"    {name:<12} mean {section['mean']:7.2f} ms  p95 {section['p95']:7.2f} ms  p99 {section['p99']:7.2f} ms")
+
+
+def compare(base_path, head_path):
+    """
+    Prints the change in frame and section times between two result files, scenario by scenario.
+    """
+    with open(base_path) as f:
+        base = {result['name']: result for result in json.load(f)['scenarios']}
+    with open(head_path) as f:
+        head = {result['name']: result for result in json.load(f)['scenarios']}
+
+    def delta(old, new):
+        return f"{old:7.2f} -> {new:7.2f} ms ({(new - old) / old * 100 if old else 0:+6.1f}%)"
+
+    for name, result in head.items():
+        if name not in base:
+            print(f"{name}: only in {head_path}")
+            continue
+        old = base[name]
+        print(name)
+        for stat in ('mean', 'p95', 'p99'):
+            print(f"    frame {stat:<6} {delta(old['frame_ms'][stat], result['frame_ms'][stat])}")
+        for section, timing in result['sections'].items():
+            if section in old['sections']:
+                print(f"    {section:<12} {delta(old['sections'][section]['mean'], timing['mean'])}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Knight's Conquest scenario benchmarks")
+    parser.add_argument('--enemies', default='skeleton', help=f"comma-separated enemy mix from: {', '.join(ENEMY_TYPES)}")
+    parser.add_argument('--counts', default='1,10,50,200', help='comma-separated enemy counts to benchmark')
+    parser.add_argument('--frames', type=int, default=300, help='measured frames per scenario')
+    parser.add_argument('--warmup', type=int, default=30, help='unmeasured frames before each scenario')
+    parser.add_argument('--dt', type=float, default=1 / 60, help='fixed time step in seconds')
+    parser.add_argument('--crowd', action='store_true', help='spawn skeletons into a batched crowd store')
+    parser.add_argument('--seed', type=int, default=1, help='random seed for spawn positions and combat rolls')
+    parser.add_argument('--output', default='benchmark_results.json', help='where to write the JSON results')
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'HEAD'), help='compare two result files instead of running')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+    else:
+        mix = [name.strip() for name in args.enemies.split(',')]
+        unknown = [name for name in mix if name not in ENEMY_TYPES]
+        if unknown:
+            parser.error(f"unknown enemy types: {', '.join(unknown)}")
+
+        scenarios = []
+        for count in (int(value) for value in args.counts.split(',')):
+            result = run_scenario(mix, count, args.frames, args.warmup, args.dt, args.seed, args.crowd)
+            print_result(result)
+            scenarios.append(result)
+
+        report = {
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'frames': args.frames,
+            'warmup': args.warmup,
+            'dt': args.dt,
+            'seed': args.seed,
+            'scenarios': scenarios,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+        pygame.quit()
@@ -1,27 +1,54 @@
+import os
 import pygame
 import pygame.fastevent
-from util.settings import SCREENH, SCREENW, HEROSPRITEPATH, SKELETONPATH, GOBLINPATH, MUSHROOMPATH, EYEPATH, ABILPATH, WORMPATH
+from util.settings import SCREENH, SCREENW, SIMULATION_RATE, MAX_CATCH_UP_STEPS, HEADLESS_DEFAULT_FRAMES, ASSETPACK, ATLASINDEX, SPRITE_SHEETS, TILEMAP
 from Scripts.player import Player
 from Scripts.assetManager import AssetManager
+from Scripts.assetLoader import AssetLoader
 from Scripts.InputHandler import InputHandler, DummyInputHandler
 from Scripts.camera import Camera
 from Enemies.BaseEnemy import Enemy 
+from Enemies.crowd import EnemyCrowd, CrowdEnemy
 from Enemies.Goblin import Goblin
 from Enemies.Mushroom import Mushroom
 from Enemies.FireWorm import FireWorm
-from Scripts.Gravity import Gravity
+from Scripts.Gravity import Gravity, PlatformIndex
+from Scripts.CollisionHandler import CollisionHandler
+from Scripts.proximity import ProximityService
+from Scripts.particles import ParticleEmitter
+from Scripts.debugOverlay import DebugOverlay
+from Scripts.dirtyRects import DirtyRectTracker
+from Scripts.timers import TimerService
+from Scripts.gameClock import GameClock
 from util.Audio import AudioPlayer
 from Scripts.health import Health
 # from util.SaveLoad import GameSaver
+import argparse
 import sys
+import time
+from util.logger import get_logger, configure_logging
+
+log = get_logger('game')
 
 class Game:
-    def __init__(self):
+    def __init__(self, headless=False, tick_rate=SIMULATION_RATE, dirty_rects=False, crowd=0):
+        # Headless mode uses SDL's dummy drivers so no window or audio device is needed
+        self.headless = headless
+        if headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
         pygame.init()
         self.debug_mode = False
         self.screenSize = (SCREENW, SCREENH)
         self.screen = pygame.display.set_mode((SCREENW, SCREENH))
         self.clock = pygame.time.Clock()
+        self.tick_step = 1 / tick_rate
+        self.game_clock = GameClock(fixed_step=self.tick_step)
+        self.render_alpha = 1.0  # How far rendering is between the last two simulation ticks
+        self.background = pygame.Surface(self.screenSize).convert()
+        self.background.fill('#f7b32b')
+        # Dirty-rect mode restores and updates only the areas drawn to, instead of flipping the whole screen
+        self.dirtyRects = DirtyRectTracker(self.screen, self.background) if dirty_rects else None
         pygame.display.set_caption("Knight's Conquest")
         pygame.display.set_icon(pygame.image.load('Assets/gameIcon.webp'))
         self.font = pygame.font.SysFont('Arial', 24)
@@ -38,116 +65,365 @@ class Game:
 
         self.assetManager = AssetManager()
         
-        #Player Animation
-        self.assetManager.load_sprite_sheet('knight_idle', HEROSPRITEPATH + "/Idle.png", (180, 180))
-        self.assetManager.load_sprite_sheet('knight_run', HEROSPRITEPATH + "/Run.png", (180, 180))
-        self.assetManager.load_sprite_sheet('knight_jump', HEROSPRITEPATH + "/Jump.png", (180, 180))
-        self.assetManager.load_sprite_sheet('knight_attack', HEROSPRITEPATH + "/Attack1.png", (180, 180))
-        self.assetManager.load_sprite_sheet('knight_attack2', HEROSPRITEPATH + "/Attack2.png", (180, 180))
-        self.assetManager.load_sprite_sheet('knight_death', HEROSPRITEPATH + "/Death.png", (180, 180))
-
-        #Enemy Animation
-        self.assetManager.load_sprite_sheet('skeleton_idle', SKELETONPATH + "/idle.png", (150, 150))
-        self.assetManager.load_sprite_sheet('skeleton_walk', SKELETONPATH + "/Walk.png", (150, 150))
-        self.assetManager.load_sprite_sheet('skeleton_attack', SKELETONPATH + "/Attack.png", (150, 150))
-        self.assetManager.load_sprite_sheet('skeleton_death', SKELETONPATH + "/Death.png", (150, 150))
-        self.assetManager.load_sprite_sheet('skeleton_shield', SKELETONPATH + "/Shield.png", (150, 150))
-        self.assetManager.load_sprite_sheet('skeleton_hit', SKELETONPATH + "/Take Hit.png", (150, 150))
-
-        #Goblin Animation
-        self.assetManager.load_sprite_sheet('goblin_idle', GOBLINPATH + '/Idle.png', (150, 150))
-        self.assetManager.load_sprite_sheet('goblin_walk', GOBLINPATH + '/Run.png', (150, 150))
-        self.assetManager.load_sprite_sheet('goblin_attack', GOBLINPATH + '/Attack.png', (150, 150))
-        self.assetManager.load_sprite_sheet('goblin_death', GOBLINPATH + '/Death.png', (150, 150))
-        self.assetManager.load_sprite_sheet('goblin_attack2', GOBLINPATH + '/Attack2.png', (150, 150))
-        self.assetManager.load_sprite_sheet('goblin_hit', GOBLINPATH + "/Take Hit.png", (150, 150))
-
-        #Mushroom Animation
-        self.assetManager.load_sprite_sheet('mushroom_idle', MUSHROOMPATH + '/Idle.png', (150, 150))
-        self.assetManager.load_sprite_sheet('mushroom_walk', MUSHROOMPATH + '/Run.png', (150, 150))
-        self.assetManager.load_sprite_sheet('mushroom_attack', MUSHROOMPATH + '/Attack.png', (150, 150))
-        self.assetManager.load_sprite_sheet('mushroom_death', MUSHROOMPATH + '/Death.png', (150, 150))
-        self.assetManager.load_sprite_sheet('mushroom_attack2', MUSHROOMPATH + '/Attack2.png', (150, 150))
-        self.assetManager.load_sprite_sheet('mushroom_attack3', MUSHROOMPATH + '/Attack3.png', (150, 150))
-        self.assetManager.load_sprite_sheet('mushroom_hit', MUSHROOMPATH + "/Take Hit.png", (150, 150))
-
-        #Flying Eye Animation
-        self.assetManager.load_sprite_sheet('eye_idle', EYEPATH + '/Flight.png', (150, 150))
-        self.assetManager.load_sprite_sheet('eye_walk', EYEPATH + '/Flight.png', (150, 150))
-        self.assetManager.load_sprite_sheet('eye_attack', EYEPATH + '/Attack.png', (150, 150))
-        self.assetManager.load_sprite_sheet('eye_death', EYEPATH + '/Death.png', (150, 150))
-        self.assetManager.load_sprite_sheet('eye_attack2', EYEPATH + '/Attack2.png', (150, 150))
-        self.assetManager.load_sprite_sheet('eye_attack3', EYEPATH + '/Attack3.png', (150, 150))
-        self.assetManager.load_sprite_sheet('eye_hit', EYEPATH + "/Take Hit.png", (150, 150))
-
-        self.assetManager.load_sprite_sheet('worm_death', WORMPATH + '/Death.png', (90, 90))
-        self.assetManager.load_sprite_sheet('worm_idle', WORMPATH + '/Idle.png', (90, 90))
-        self.assetManager.load_sprite_sheet('worm_walk', WORMPATH + '/Walk.png', (90, 90))
-        self.assetManager.load_sprite_sheet('worm_attack', WORMPATH + '/Attack.png', (90, 90))
-        self.assetManager.load_sprite_sheet('worm_hit', WORMPATH + "/Get Hit.png", (90, 90))
-
-        #Ability Animations
-        self.assetManager.load_sprite_sheet('M_Projectile', ABILPATH + '/M_Projectile_sprite.png', (50, 50))
-        self.assetManager.load_sprite_sheet('FE_Projectile', ABILPATH + '/FE_projectile_sprite.png', (48, 48))
-        self.assetManager.load_sprite_sheet('Bomb', ABILPATH + '/Bomb_sprite.png', (100, 100))
-        self.assetManager.load_sprite_sheet('Sword', ABILPATH + '/Sword_sprite.png', (102, 102))
-        self.assetManager.load_sprite_sheet('Fireball', ABILPATH + '/Move.png', (46, 46))
-        
+        # Registers every animation from the asset pack or the packed atlas if one has been built and is up to date.
+        # Sheets load on first use, so only the characters in the level are loaded; those are prefetched below
+        if not (self.assetManager.load_pack(ASSETPACK) or self.assetManager.load_atlas(ATLASINDEX)):
+            for name, path, frame_dimensions in SPRITE_SHEETS:
+                self.assetManager.register_sprite_sheet(name, path, frame_dimensions)
+
+        self.audioPlayer = AudioPlayer.shared()
+        self.audioPlayer.clock = self.game_clock.get_ticks
+
+        # Decodes the level's sprite sheets and all sounds on worker threads behind a loading screen
+        loader = AssetLoader(self.assetManager, self.audioPlayer.bank)
+        loader.queue_set('knight')
+        loader.queue_set('skeleton')
+        loader.queue_sounds()
+        if headless:
+            loader.finish()
+        else:
+            self.show_loading_screen(loader)
+        loader.shutdown()
+
+        # The level's static tiles are drawn from cached chunks
+        self.tilemap = self.assetManager.load_tiles(TILEMAP)
+
+        self.particles = ParticleEmitter(self)
+        self.attack_rays = []  # (start, end, width) in world coordinates, recorded by the last tick's attacks
+        self.timers = TimerService(self.game_clock.get_ticks)
+        self.proximity = ProximityService()
+        self.gravity = Gravity()
+        self.platforms = PlatformIndex()
+        # Gravity is off until levels have ground and platforms; ground_level is below the screen for now
+        self.physics = False
+
         self.player = Player(self, pos=[-5, 300], size=[400, 400], inputHandler=self.PlayerInputHandler)
         
         self.enemies = []
-        self.enemies.append(Enemy(self, pos=[110, 288], size=[400, 400], inputHandler=self.enemyInputHandler))
-        self.enemies.append(Enemy(self, pos=[115, 288], size=[400, 400], inputHandler=self.enemyInputHandler))
+        # Crowd mode keeps skeletons in a structure-of-arrays store and updates them in batches
+        self.crowd = EnemyCrowd(self, capacity=max(crowd + 2, 2)) if crowd else None
+        self.enemies.append(self.create_skeleton(pos=[110, 288], size=[400, 400]))
+        self.enemies.append(self.create_skeleton(pos=[115, 288], size=[400, 400]))
+        if self.crowd is not None:
+            self.spawn_crowd(crowd)
         # self.enemies.append(Goblin(self, pos=[105, 288], size=[400, 400]))
         # self.enemies.append(Mushroom(self, pos=[105, 288], size=[400, 400]))
         # self.enemies.append(FireWorm(self, pos=[210, 360], size=[300, 300]))
 
+        self.camera = Camera(self.player, SCREENW, SCREENH)
+        if self.dirtyRects:
+            self.draw_background()
+
         self.health = Health(self, 50, 20, 400, 20, 100, fg_color=(192,192,192), bg_color=(255, 0, 0))
-        self.gravity = Gravity()
         # self.gameSaver = GameSaver(self)
-        self.audioPlayer = AudioPlayer()
+        self.debugOverlay = DebugOverlay(self)
+
+    def create_skeleton(self, pos, size, moveDistance=100):
+        if self.crowd is not None:
+            return CrowdEnemy(self, self.crowd, pos=pos, size=size, moveDistance=moveDistance, inputHandler=self.enemyInputHandler)
+        return Enemy(self, pos=pos, size=size, moveDistance=moveDistance, inputHandler=self.enemyInputHandler)
+
+    def spawn_crowd(self, count):
+        """
+        Adds count skeletons spread evenly across the screen.
+
+        Args:
+            count (int): The number of skeletons to add.
+
+        Returns:
+            None
+        """
+        spacing = SCREENW / max(count, 1)
+        for i in range(count):
+            self.enemies.append(self.create_skeleton(pos=[int(i * spacing) - 150, 288], size=[400, 400]))
+
+    def solo_enemies(self):
+        """
+        Returns the enemies that are updated and drawn one by one, which is all of them outside crowd mode.
+        """
+        if self.crowd is None:
+            return self.enemies
+        return [enemy for enemy in self.enemies if not enemy.in_crowd]
+
+    def show_loading_screen(self, loader):
+        """
+        Draws a progress bar at full frame rate while the loader decodes assets in the background.
+        Each frame spends at most half a frame's budget on the loader's main-thread steps.
+        """
+        bar = pygame.Rect(SCREENW // 4, SCREENH // 2 - 10, SCREENW // 2, 20)
+        while not loader.done:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    loader.shutdown()
+                    pygame.quit()
+                    sys.exit()
+            loader.update(budget_ms=8)
+
+            self.screen.fill('#f7b32b')
+            pygame.draw.rect(self.screen, (60, 60, 60), bar)
+            pygame.draw.rect(self.screen, (192, 192, 192), (bar.x, bar.y, int(bar.width * loader.progress), bar.height))
+            pygame.draw.rect(self.screen, (255, 255, 255), bar, 2)
+            text = self.font.render(f"Loading... {int(loader.progress * 100)}%", True, pygame.Color('white'))
+            self.screen.blit(text, (bar.centerx - text.get_width() // 2, bar.y - text.get_height() - 10))
+            pygame.display.update()
+            self.clock.tick(60)
 
     def run(self):
         # try:
+            # Fixed-timestep loop: real frame time fills an accumulator that is drained in fixed simulation
+            # ticks, so gameplay behaves the same at any frame rate, and rendering blends the last two ticks
+            accumulator = 0.0
             while True:
-                self.deltaTime = self.clock.tick(60) / 1000
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        pygame.quit()
-                        sys.exit()
-                    elif event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_x:  # Press 'x' to toggle debug mode
-                            self.debug_mode = not self.debug_mode
-                            if self.debug_mode:
-                                print('debug on')
-                            else:
-                                print('debug off')
-
-                self.screen.fill('#f7b32b')
-                
-                # Spawns All The Enemies
-                for enemy in self.enemies:
-                    enemy.update(self.deltaTime, self.player, self.enemies)
-                    enemy.render()
-                
-                # Spawns and Updates The Player
-                self.player.update(self.deltaTime, self.enemies)
-                self.player.render()
-                self.player.health.render()
-
-                
-                # Calculate and draw FPS
-                fps = self.clock.get_fps()
-                fps_text = self.font.render(f"FPS: {int(fps)}", True, pygame.Color('white'))
-                self.screen.blit(fps_text, (SCREENW - fps_text.get_width() - 10, 10))
-
-                pygame.display.update()
+                frame_time = self.clock.tick(60) / 1000
+                self.handle_events()
+
+                if self.debug_mode:
+                    self.debugOverlay.begin_frame()
+
+                if self.game_clock.paused:
+                    accumulator = 0.0
+                    self.render_alpha = 1.0
+                else:
+                    # After a stall, run at most MAX_CATCH_UP_STEPS ticks and let the game slow down instead
+                    accumulator = min(accumulator + frame_time, self.tick_step * MAX_CATCH_UP_STEPS)
+                    while accumulator >= self.tick_step:
+                        self.tick()
+                        accumulator -= self.tick_step
+                    self.render_alpha = accumulator / self.tick_step
+
+                self.update_camera()
+                if self.debug_mode:
+                    # Times every phase and draws the profiler overlay; the plain path below pays nothing for it
+                    self.screen.fill('#f7b32b')
+                    self.debugOverlay.profile_render()
+                elif self.dirtyRects:
+                    self.dirtyRects.erase()
+                    self.render()
+                else:
+                    self.screen.fill('#f7b32b')
+                    self.render()
+
+                # Starts every sound queued this frame
+                self.audioPlayer.update()
+
+                if self.dirtyRects and not self.debug_mode:
+                    self.dirtyRects.flush()
+                else:
+                    pygame.display.update()
         # except Exception as e:
         #     self.cleanUp(e)
+
+    def tick(self):
+        """
+        Advances the simulation by one fixed step.
+        """
+        self.player.store_previous_position()
+        for enemy in self.solo_enemies():
+            enemy.store_previous_position()
+        if self.crowd is not None:
+            self.crowd.store_previous_positions()
+        self.deltaTime = self.game_clock.advance(self.tick_step)
+        if self.debug_mode:
+            self.debugOverlay.profile_update(self.deltaTime)
+        else:
+            self.update(self.deltaTime)
+
+    def run_headless(self, frames=None, seconds=None, deltaTime=1 / 60):
+        """
+        Steps the simulation with a fixed delta time as fast as the CPU allows, without rendering.
+
+        Parameters:
+            frames (int, optional): The number of frames to simulate.
+            seconds (float, optional): The amount of game time to simulate, used when frames is not given.
+            deltaTime (float, optional): The fixed time step in seconds. Defaults to 1/60.
+                The game clock is put in fixed-step mode so cooldowns advance with simulated time.
+
+        Returns:
+            int: The number of frames simulated.
+        """
+        if frames is None:
+            frames = round(seconds / deltaTime) if seconds is not None else HEADLESS_DEFAULT_FRAMES
+        self.game_clock.fixed_step = deltaTime
+        for _ in range(frames):
+            self.deltaTime = self.game_clock.advance(deltaTime)
+            pygame.event.pump()
+            self.update(self.deltaTime)
+            self.audioPlayer.update()
+        return frames
+
+    def handle_events(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.assetManager.log_unused_assets()
+                pygame.quit()
+                sys.exit()
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_p:  # Press 'p' to pause or resume game time
+                    self.game_clock.toggle_pause()
+                elif event.key == pygame.K_x:  # Press 'x' to toggle debug mode
+                    self.debug_mode = not self.debug_mode
+                    if self.debug_mode:
+                        self.debugOverlay.reset()
+                        log.info('debug on')
+                    else:
+                        if self.dirtyRects:
+                            self.dirtyRects.invalidate()  # Clears the overlay on the next frame
+                        log.info('debug off')
+
+    def update(self, deltaTime):
+        self.update_enemies(deltaTime)
+        self.update_player(deltaTime)
+        self.update_world(deltaTime)
+        self.update_collisions(deltaTime)
+
+    def update_enemies(self, deltaTime):
+        # The first update phase of a tick, so the attack rays shown are always the last tick's
+        self.attack_rays.clear()
+        # Updates All The Enemies
+        solo_enemies = self.solo_enemies()
+        self.proximity.rebuild(solo_enemies, self.crowd)
+        if self.crowd is not None:
+            self.crowd.update(deltaTime, self.player)
+        for enemy in solo_enemies:
+            enemy.update(deltaTime, self.player, self.enemies)
+
+    def update_player(self, deltaTime):
+        # Updates The Player
+        self.player.update(deltaTime, self.enemies)
+
+    def update_world(self, deltaTime):
+        # Runs timed state transitions such as removing dead enemies, outside the enemy loop
+        self.timers.update()
+        self.particles.update(deltaTime)
+
+    def update_collisions(self, deltaTime):
+        if self.physics:
+            self.update_physics(deltaTime)
+
+        # Resolves every colliding pair once per frame
+        CollisionHandler.resolve_all([self.player] + self.solo_enemies(), allowed_overlap=305)
+        if self.crowd is not None:
+            self.crowd.resolve_player_collisions(self.player, allowed_overlap=305)
+
+    def update_physics(self, deltaTime):
+        # Integrates gravity and platform contacts for every character in one pass
+        self.gravity.step([self.player] + self.solo_enemies(), deltaTime, self.platforms, self.crowd)
+
+    def update_camera(self):
+        """
+        Moves the camera to the player's drawn position. Call once per rendered frame, before drawing.
+        """
+        view = self.camera.rect.topleft
+        self.camera.update()
+        if self.dirtyRects and self.camera.rect.topleft != view:
+            # The level scrolled: shift the background and draw only the strips that came into view.
+            # Everything on screen moved, so this frame is a full update rather than dirty rects.
+            self.scroll_background(self.camera.rect.x - view[0], self.camera.rect.y - view[1])
+            self.dirtyRects.invalidate()
+
+    def draw_background(self, area=None):
+        # Dirty-rect mode restores the screen from the background, so the visible level is drawn into it
+        self.background.set_clip(area)
+        self.background.fill('#f7b32b')
+        self.tilemap.render(self.background, self.camera.rect)
+        self.background.set_clip(None)
+
+    def scroll_background(self, dx, dy):
+        width, height = self.background.get_size()
+        if abs(dx) >= width or abs(dy) >= height:
+            self.draw_background()
+            return
+        self.background.scroll(-dx, -dy)
+        if dx:
+            self.draw_background(pygame.Rect(width - dx if dx > 0 else 0, 0, abs(dx), height))
+        if dy:
+            self.draw_background(pygame.Rect(0, height - dy if dy > 0 else 0, width, abs(dy)))
+
+    def render(self):
+        self.render_level()
+        self.render_enemies()
+        self.render_player()
+        self.render_attacks()
+        self.render_hud()
+
+    def render_level(self):
+        # Already part of the background in dirty-rect mode, except under the debug overlay's full redraws
+        if not self.dirtyRects or self.debug_mode:
+            self.tilemap.render(self.screen, self.camera.rect)
+
+    def render_enemies(self):
+        # Spawns All The Enemies
+        if self.crowd is not None:
+            self.crowd.render()
+        # Enemies outside the view skip drawing, mask lookups and outlines entirely
+        pad = self.assetManager.OUTLINE_PADDING
+        for enemy in self.solo_enemies():
+            if self.camera.is_visible(enemy.rect.inflate(pad * 2, pad * 2)):
+                enemy.render()
+        self.particles.render()
+
+    def render_player(self):
+        # Spawns The Player
+        pad = self.assetManager.OUTLINE_PADDING
+        if self.camera.is_visible(self.player.rect.inflate(pad * 2, pad * 2)):
+            self.player.render()
+
+    def add_attack_ray(self, start, end, width):
+        """
+        Records an attack ray to draw this frame. Attacks happen during the tick, before the screen is
+        cleared, so they are drawn in the render phase instead of straight away.
+        """
+        self.attack_rays.append((start, end, width))
+
+    def render_attacks(self):
+        for start, end, width in self.attack_rays:
+            self.mark_dirty(pygame.draw.line(self.screen, (255, 0, 0), self.camera.to_screen(start), self.camera.to_screen(end), width))
+
+    def render_hud(self):
+        self.player.health.render()
+
+        # Calculate and draw FPS
+        fps = self.clock.get_fps()
+        fps_text = self.font.render(f"FPS: {int(fps)}", True, pygame.Color('white'))
+        self.mark_dirty(self.screen.blit(fps_text, (SCREENW - fps_text.get_width() - 10, 10)))
+
+    def mark_dirty(self, rect):
+        """
+        Records an area drawn this frame so dirty-rect mode can update and later erase it.
+        Does nothing when the whole screen is redrawn every frame.
+        """
+        if self.dirtyRects:
+            self.dirtyRects.mark(rect)
             
     def cleanUp(self, exception):
-        print(f"An error occurred: {exception}")
+        log.error("An error occurred: %s", exception)
         pygame.quit()
         sys.exit()
 
-Game().run()
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Knight's Conquest")
+    parser.add_argument('--headless', action='store_true', help='run the simulation without a window or audio device')
+    parser.add_argument('--frames', type=int, help='number of frames to simulate in headless mode')
+    parser.add_argument('--seconds', type=float, help='amount of game time to simulate in headless mode')
+    parser.add_argument('--dt', type=float, default=1 / 60, help='fixed time step in seconds for headless mode')
+    parser.add_argument('--tick-rate', type=int, default=SIMULATION_RATE, help='simulation ticks per second (default %(default)s)')
+    parser.add_argument('--dirty-rects', action='store_true', help='redraw and update only the changed parts of the screen; frames where the camera scrolls still update the whole screen')
+    parser.add_argument('--crowd', type=int, default=0, help='add this many skeletons, updated in batches as a crowd')
+    parser.add_argument('--log', default=os.environ.get('KC_LOG'),
+                        help='log levels, e.g. "WARNING,Enemies=DEBUG,Scripts.camera=INFO" (defaults to $KC_LOG)')
+    parser.add_argument('--log-buffer', type=int, default=0, help='keep this many recent log records, at every level down to DEBUG, and dump them on a crash')
+    args = parser.parse_args()
+    if args.tick_rate <= 0:
+        parser.error('--tick-rate must be a positive number of ticks per second')
+    configure_logging(args.log, ring_buffer_size=args.log_buffer)
+
+    if args.headless:
+        game = Game(headless=True, tick_rate=args.tick_rate, crowd=args.crowd)
+        start = time.perf_counter()
+        frames = game.run_headless(frames=args.frames, seconds=args.seconds, deltaTime=args.dt)
+        elapsed = time.perf_counter() - start
+        print(f"Simulated {frames} frames in {elapsed:.2f}s ({frames / elapsed:.1f} frames/s)")
+        game.assetManager.log_unused_assets()
+        pygame.quit()
+    else:
+        Game(tick_rate=args.tick_rate, dirty_rects=args.dirty_rects, crowd=args.crowd).run()
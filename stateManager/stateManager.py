@@ -1,13 +1,17 @@
 import random
-import threading
 import pygame
-from concurrent.futures import ThreadPoolExecutor
+from util.logger import get_logger
+
+log = get_logger(__name__)
 
 
 class State:
     def __init__(self, enemy):
         self.enemy = enemy
-        self.deltaTime = pygame.time.Clock().tick(60) / 1000
+
+    @property
+    def deltaTime(self):
+        return self.enemy.game.game_clock.delta
 
     def enter(self):
         pass
@@ -22,38 +26,35 @@ class PatrolState(State):
     def enter(self):
         self.enemy.currentAnimation = "run"
         self.enemy.frameIndex = 0
-        print("Entering Patrol State")
+        log.debug("Entering Patrol State")
 
     def execute(self):
-        # Start patrol in a separate thread
-        patrol_thread = threading.Thread(target=self.handle_patrol)
-        patrol_thread.start()
+        # Runs on the main thread, so movement happens in tick order and replays are deterministic
+        self.handle_patrol()
 
     def handle_patrol(self):
         # Patrol logic
         self.enemy.patrol()
 
     def exit(self):
-        print("Exiting Patrol State")
+        log.debug("Exiting Patrol State")
 
 class ChaseState(State):
     def enter(self):
-        print(f"Entering {type(self).__name__} state")
+        log.debug("Entering %s state", type(self).__name__)
         self.enemy.currentAnimation = "run" if type(self).__name__ == "PatrolState" else "attack"
         self.enemy.frameIndex = 0
         self.enemy.animationUpdate()  # Ensure the animation is updated immediately
 
     def execute(self):
-        # Start chase in a separate thread
-        chase_thread = threading.Thread(target=self.handle_chase)
-        chase_thread.start()
+        self.handle_chase()
 
     def handle_chase(self):
         # Chase logic
         self.enemy.chase(self.enemy.game.player)
 
     def exit(self):
-        print("Exiting Chase State")
+        log.debug("Exiting Chase State")
 
 class AttackState:
     def __init__(self, enemy):
@@ -64,7 +65,7 @@ class AttackState:
         self.enemy.currentAnimation = "attack"
         self.enemy.frameIndex = 0
         self.has_attacked = False  # Reset the flag when entering the state
-        print("Entering Attack State")
+        log.debug("Entering Attack State")
 
     def execute(self):
         if not self.has_attacked:  # Only execute attack logic once per state entry
@@ -81,7 +82,7 @@ class AttackState:
             ((ray_start[0], ray_start[1] + 10), (ray_start[0] - ray_length, ray_start[1] + 10) if self.enemy.flip else (ray_start[0] + ray_length, ray_start[1] + 10))
         ]
         for start, end in rays:
-            pygame.draw.line(self.enemy.game.screen, (255, 0, 0), start, end, 3)
+            self.enemy.game.add_attack_ray(start, end, 3)
 
     def handle_attack(self):
         self.enemy.attack(self.enemy.game.player)
@@ -92,7 +93,7 @@ class AttackState:
             self.enemy.game.player.attacked = True
             damage = 20
             self.enemy.game.player.health.apply_decay(damage)
-            print(f"Player hit with attack, knockback {knockback_distance}, damage {damage}.")
+            log.info("Player hit with attack, knockback %s, damage %s.", knockback_distance, damage)
             self.has_attacked = True  # Set the flag indicating that an attack has been made
 
     def line_rect_collision(self, attacker, target_rect):
@@ -100,7 +101,7 @@ class AttackState:
         return attack_rect.colliderect(target_rect)
 
     def exit(self):
-        print("Exiting Attack State")
+        log.debug("Exiting Attack State")
         self.enemy.game.player.attacked = False  # Ensure to reset the attacked flag when exiting the state
 
 class FleeState:
@@ -111,11 +112,10 @@ class FleeState:
             self.enemy.currentAnimation = "run"  # Assuming the run animation shows the enemy in a fleeing state
             # self.enemy.audio_player.enqueue_sound(self.enemy.audio_player.fearSound)  # Play a fear sound if available
             self.enemy.frameIndex = 0
-            print("Entering Flee State")
+            log.debug("Entering Flee State")
 
         def execute(self):
-            flee_thread = threading.Thread(target=self.handle_flee)
-            flee_thread.start()
+            self.handle_flee()
         
         def handle_flee(self):
             self.enemy.flee()
@@ -125,31 +125,31 @@ class FleeState:
 
 
 class DamageState():
+    RECOVERY_TIME = 400  # milliseconds
+
     def __init__(self, enemy):
         self.enemy = enemy
+        self.timer = None
 
     def enter(self):
         self.enemy.currentAnimation = "hit"
         self.enemy.frameIndex = 0
-        self.time_in_state = 0
-        self.start_time = pygame.time.get_ticks() / 1000.0  
-        print("Entering Damage State")
+        # Recover on the main thread once the hit animation has played
+        self.timer = self.enemy.game.timers.schedule(self.RECOVERY_TIME, self.recover)
+        log.debug("Entering Damage State")
 
     def execute(self):
-        # Start the damage handling in a separate thread
-        damage_thread = threading.Thread(target=self.handle_damage)
-        damage_thread.start()
-
-    def handle_damage(self):
-        while self.time_in_state < 0.4:  
-            current_time = pygame.time.get_ticks() / 1000.0
-            self.time_in_state = current_time - self.start_time  
-            pygame.time.wait(10) 
+        pass
 
+    def recover(self):
+        self.timer = None
         self.exit()
 
     def exit(self):
-        print("Exiting Damage State")
+        if self.timer is not None:
+            self.enemy.game.timers.cancel(self.timer)
+            self.timer = None
+        log.debug("Exiting Damage State")
         self.enemy.attacked = False  
         # self.enemy.state_machine.change_state('patrol')  
 
@@ -157,46 +157,40 @@ class DeathState():
     def __init__(self, enemy, game):
         self.enemy = enemy
         self.game = game
-        self.deltaTime = pygame.time.Clock().tick(60) / 1000
         self.animation_complete = False
-        self.lock = threading.Lock()  
+        self.timer = None
 
     def enter(self):
         self.enemy.currentAnimation = "death"
         self.enemy.frameIndex in [0,5]
         self.time_in_state = 0.4
-        print("Entering Death State")
+        # Schedule the removal once, instead of polling from a thread every frame
+        if self.timer is None and not self.animation_complete:
+            self.timer = self.game.timers.schedule(int(self.time_in_state * 1000), self.handle_death)
+        log.debug("Entering Death State")
 
     def execute(self):
-        death_thread = threading.Thread(target=self.handle_death)
-        death_thread.start()
+        pass
 
     def handle_death(self):
-        start_time = pygame.time.get_ticks() / 1000.0  # get current time in seconds
-        while not self.animation_complete:
-            with self.lock:
-                current_time = pygame.time.get_ticks() / 1000.0  # update current time
-                if current_time - start_time >= self.time_in_state:
-                    self.animation_complete = True
-                    self.mark_enemy_dead()
-
-        if self.animation_complete:
-            self.remove_enemy()
+        self.timer = None
+        self.animation_complete = True
+        self.mark_enemy_dead()
+        self.remove_enemy()
 
     def mark_enemy_dead(self):
         if not self.enemy.dead:
             self.enemy.dead = True
 
     def remove_enemy(self):
-        with self.lock:
-            if self.enemy.dead and self.animation_complete:
-                # Directly remove the specific enemy without additional checks
-                if self.enemy in self.game.enemies:
-                    self.game.enemies.remove(self.enemy)
-                self.exit()
+        if self.enemy.dead and self.animation_complete:
+            # Directly remove the specific enemy without additional checks
+            if self.enemy in self.game.enemies:
+                self.game.enemies.remove(self.enemy)
+            self.exit()
 
     def exit(self):
-        print("Exiting Death State")
+        log.debug("Exiting Death State")
 
 class FlyingEyePatrolState(State):
     def enter(self):
@@ -211,13 +205,13 @@ class FlyingEyePatrolState(State):
 
         if self.enemy.enemy_rect.y < self.enemy.target_y:
             self.enemy.enemy_rect.y += self.enemy.speed * self.deltaTime  # Adjust this calculation
-            print(f"Moving down to target. New y: {self.enemy.enemy_rect.y}")
+            log.debug("Moving down to target. New y: %s", self.enemy.enemy_rect.y)
         elif self.enemy.enemy_rect.y > self.enemy.target_y:
             self.enemy.enemy_rect.y -= self.enemy.speed * self.deltaTime  # Adjust this calculation
-            print(f"Moving up to target. New y: {self.enemy.enemy_rect.y}")
+            log.debug("Moving up to target. New y: %s", self.enemy.enemy_rect.y)
         else:
-            print("Target Y reached, changing state.")
-            self.enemy.change_state('flying_eye_patrol')
+            log.debug("Target Y reached, changing state.")
+            self.enemy.state_machine.change_state('flying_eye_patrol')
 
     def exit(self):
         super().exit()
@@ -251,7 +245,7 @@ class MemoryPatrolState(State):
     def __init__(self, enemy):
         self.enemy = enemy
         self.patrol_time = 5000  # Time in milliseconds to patrol last known position
-        self.start_patrol_time = pygame.time.get_ticks()
+        self.start_patrol_time = self.enemy.game.game_clock.ticks
 
     def enter(self):
         self.target_pos = self.enemy.last_known_player_pos
@@ -260,10 +254,10 @@ class MemoryPatrolState(State):
         if self.target_pos is not None:
             # Move towards the last known player position
             if self.enemy.enemy_rect.x < self.target_pos[0]:
-                self.enemy.enemy_rect.x += self.enemy.adjustedspeed
+                self.enemy.move_x(self.enemy.adjustedspeed)
                 self.enemy.flip = False
             elif self.enemy.enemy_rect.x > self.target_pos[0]:
-                self.enemy.enemy_rect.x -= self.enemy.adjustedspeed
+                self.enemy.move_x(-self.enemy.adjustedspeed)
                 self.enemy.flip = True
 
             # Check if reached or close to last known position
@@ -271,7 +265,7 @@ class MemoryPatrolState(State):
                 self.enemy.patrol()
             
             # Check if patrol time has elapsed
-            if pygame.time.get_ticks() - self.start_patrol_time > self.patrol_time:
+            if self.enemy.game.game_clock.ticks - self.start_patrol_time > self.patrol_time:
                 self.enemy.last_known_player_pos = None  # Reset memory
                 self.enemy.state_machine.change_state('patrol')  # Change state to normal patrol
 
@@ -298,7 +292,7 @@ class StateMachine:
 
             # Check if the new state exists, default to 'patrol' if not found
             if new_state not in self.states:
-                print(f"State '{new_state}' not found. Defaulting to 'patrol'.")
+                log.warning("State '%s' not found. Defaulting to 'patrol'.", new_state)
                 new_state = 'patrol'
 
             if self.current_state:
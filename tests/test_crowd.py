@@ -0,0 +1,113 @@
+import random
+import pytest
+from conftest import ROOT
+
+# Skeletons 150px apart keep each other company, the lone ones grow afraid and flee, and the pair
+# near the player chases and attacks. No two skeletons ever overlap, since crowd members don't push
+# each other, and the player starts touching only one of them.
+SPAWNS = [0, 150, 1500, 3000, 3150]
+PLAYER_X = 3000
+TICKS = 300
+
+
+def make_game(crowd):
+    from game import Game
+    game = Game(headless=True, crowd=1) if crowd else Game(headless=True)
+    if crowd:
+        game.crowd.clear()
+    game.enemies.clear()
+    for x in SPAWNS:
+        game.enemies.append(game.create_skeleton(pos=[x, 288], size=[400, 400]))
+    game.player.pos[0] = game.player.rect.x = PLAYER_X
+    return game
+
+
+def snapshot(game):
+    return [(enemy.position()[0], enemy.flip, type(enemy.state_machine.current_state).__name__,
+             float(enemy.fear), float(enemy.anger), enemy.currentAnimation, enemy.frameIndex)
+            for enemy in game.enemies]
+
+
+def simulate(crowd):
+    random.seed(5)
+    game = make_game(crowd)
+    ticks = []
+    for _ in range(TICKS):
+        game.run_headless(frames=1)
+        ticks.append(snapshot(game))
+    return ticks
+
+
+@pytest.fixture(autouse=True)
+def in_root(monkeypatch):
+    # The game loads its assets relative to the repository root
+    monkeypatch.chdir(ROOT)
+
+
+def test_crowd_matches_solo_enemies():
+    solo, crowd = simulate(False), simulate(True)
+    for tick, (expected, actual) in enumerate(zip(solo, crowd)):
+        assert len(expected) == len(actual)
+        for a, b in zip(expected, actual):
+            assert a[0] == pytest.approx(b[0], abs=1e-6), tick
+            assert a[1:] == b[1:], tick
+    states = {enemy[2] for tick in solo for enemy in tick}
+    assert {'PatrolState', 'ChaseState', 'AttackState', 'FleeState'} <= states
+
+
+def make_crowd(count, capacity):
+    from Enemies.crowd import EnemyCrowd, CrowdEnemy
+    game = make_game(False)
+    crowd = EnemyCrowd(game, capacity=capacity)
+    members = [CrowdEnemy(game, crowd, pos=[i * 100, 288], size=[400, 400]) for i in range(count)]
+    for i, member in enumerate(members):
+        member.fear = i
+    return crowd, members
+
+
+def assert_rows(crowd, members):
+    assert crowd.count == len(members)
+    assert crowd.members == members
+    for index, member in enumerate(members):
+        assert member.index == index
+        assert member.crowd is crowd
+
+
+def test_grow_keeps_existing_rows():
+    crowd, members = make_crowd(5, capacity=2)
+    assert crowd.capacity >= 5
+    assert_rows(crowd, members)
+    for i, member in enumerate(members):
+        assert list(member.pos) == [i * 100, 288]
+        assert member.fear == i
+
+
+def test_release_moves_the_last_row_into_the_gap():
+    crowd, members = make_crowd(5, capacity=8)
+    released = members[1]
+    crowd.release(1)
+    assert_rows(crowd, [members[0], members[4], members[2], members[3]])
+    assert list(members[4].pos) == [400, 288]
+    assert members[4].fear == 4
+    # The released member keeps its own values
+    assert released.crowd is not crowd
+    assert list(released.pos) == [100, 288]
+    assert released.fear == 1
+
+
+def test_release_of_the_last_row():
+    crowd, members = make_crowd(3, capacity=4)
+    crowd.release(2)
+    assert_rows(crowd, members[:2])
+    assert list(members[2].pos) == [200, 288]
+
+
+def test_clear_releases_every_member():
+    crowd, members = make_crowd(4, capacity=4)
+    crowd.clear()
+    assert crowd.count == 0
+    assert crowd.members == []
+    for i, member in enumerate(members):
+        assert member.crowd is not crowd
+        assert list(member.pos) == [i * 100, 288]
+        assert member.fear == i
@@ -0,0 +1,89 @@
+import copy
+import random
+import numpy as np
+from Scripts.Gravity import Gravity, PlatformIndex
+
+
+class Entity:
+    def __init__(self, x, y, velocity_y, grounded):
+        self.pos = [x, y]
+        self.size = [40, 60]
+        self.velocity_y = velocity_y
+        self.grounded = grounded
+        self.ground_level = 600
+
+
+class Platform:
+    def __init__(self, x, y, width):
+        self.pos = [x, y]
+        self.size = [width, 20]
+
+
+def random_world(seed):
+    rng = random.Random(seed)
+    platforms = [Platform(rng.uniform(0, 2500), rng.uniform(100, 590), rng.uniform(50, 400)) for _ in range(100)]
+    # Some entities start resting on the ground, the rest anywhere, some of them moving up
+    entities = [Entity(rng.uniform(0, 5000), rng.choice([600, rng.uniform(0, 650)]), rng.uniform(-300, 300), rng.random() < 0.3)
+                for _ in range(500)]
+    return platforms, entities
+
+
+def assert_same(expected, actual):
+    for a, b in zip(expected, actual):
+        assert abs(a.pos[1] - b.pos[1]) < 1e-9
+        assert a.velocity_y == b.velocity_y
+        assert a.grounded == b.grounded
+
+
+def test_step_matches_the_per_entity_loop():
+    gravity = Gravity()
+    for seed in (1, 2, 3):
+        platforms, entities = random_world(seed)
+        index = PlatformIndex(platforms)
+        looped, batched = copy.deepcopy(entities), copy.deepcopy(entities)
+        for _ in range(60):
+            for entity in looped:
+                gravity.apply(entity, 1 / 60)
+                gravity.check_platform_collision(entity, platforms)
+            gravity.step(batched, 1 / 60, index)
+            assert_same(looped, batched)
+
+
+def test_step_without_platforms_matches_apply():
+    gravity = Gravity()
+    _, entities = random_world(4)
+    looped, batched = copy.deepcopy(entities), copy.deepcopy(entities)
+    for _ in range(60):
+        for entity in looped:
+            gravity.apply(entity, 1 / 60)
+        gravity.step(batched, 1 / 60)
+        assert_same(looped, batched)
+
+
+def test_platform_index_matches_the_platform_list():
+    gravity = Gravity()
+    platforms, entities = random_world(5)
+    index = PlatformIndex(platforms)
+    with_list, with_index = copy.deepcopy(entities), copy.deepcopy(entities)
+    for a, b in zip(with_list, with_index):
+        gravity.check_platform_collision(a, platforms)
+        gravity.check_platform_collision(b, index)
+    for a, b in zip(with_list, with_index):
+        assert a.pos == b.pos and a.grounded == b.grounded and a.velocity_y == b.velocity_y
+
+
+def test_entity_resting_on_the_ground_stays_grounded():
+    gravity = Gravity()
+    resting = Entity(4000, 600, 0, True)
+    gravity.step([resting], 1 / 60, PlatformIndex([Platform(0, 300, 100)]))
+    assert resting.grounded
+    assert resting.pos[1] == 600
+
+
+def test_first_platform_in_list_order_wins():
+    lower, upper = Platform(0, 500, 200), Platform(0, 450, 200)
+    entity = Entity(50, 460, 10, False)  # Overlaps both
+    index = PlatformIndex([lower, upper])
+    landed = index.contacts(*(np.array([value], dtype=np.float64) for value in
+                              (entity.pos[0], entity.pos[1], entity.size[0], entity.size[1], entity.velocity_y)))
+    assert landed.tolist() == [0]
@@ -0,0 +1,38 @@
+import pytest
+from conftest import ROOT
+
+
+@pytest.fixture
+def game(monkeypatch):
+    monkeypatch.chdir(ROOT)  # Assets are loaded relative to the repository root
+    from game import Game
+    game = Game(headless=True)
+    # One patrolling skeleton, with the player out of its reach
+    del game.enemies[1:]
+    game.player.pos[0] = game.player.rect.x = 1500
+    enemy = game.enemies[0]
+    enemy.state_machine.change_state('patrol')
+    enemy.flip = False
+    return game
+
+
+def distance_moved(game, frames=30):
+    enemy = game.enemies[0]
+    start = enemy.position()[0]
+    game.run_headless(frames=frames)
+    return enemy.position()[0] - start
+
+
+def test_headless_run_moves_at_full_speed(game):
+    assert distance_moved(game) == pytest.approx(50)
+
+
+def test_headless_run_follows_the_time_scale(game):
+    game.game_clock.time_scale = 0.5
+    assert distance_moved(game) == pytest.approx(25)
+
+
+def test_paused_headless_run_does_not_move(game):
+    game.game_clock.pause()
+    assert distance_moved(game) == 0
+    assert game.game_clock.ticks == 0
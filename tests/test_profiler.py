@@ -0,0 +1,31 @@
+from util.profiler import percentile, summarize
+
+
+def test_percentile_uses_nearest_rank():
+    samples = list(range(1, 101))
+    assert percentile(samples, 0.5) == 50
+    assert percentile(samples, 0.95) == 95
+    assert percentile(samples, 0.99) == 99
+    assert percentile(samples, 1.0) == 100
+    assert percentile(samples, 0.0) == 1
+
+
+def test_percentile_is_not_pushed_up_by_float_error():
+    samples = list(range(1, 101))
+    # 0.07 * 100 == 7.000000000000001, and likewise for 14, 28, 55 and 56
+    assert percentile(samples, 0.07) == 7
+    assert percentile(samples, 0.14) == 14
+    assert [percentile(samples, p / 100) for p in range(1, 101)] == samples
+
+
+def test_percentile_of_unsorted_and_tiny_samples():
+    assert percentile([3, 1, 2], 0.5) == 2
+    assert percentile([7], 0.99) == 7
+    assert percentile([], 0.95) == 0.0
+
+
+def test_summarize_reports_milliseconds():
+    summary = summarize([0.001] * 99 + [0.1])
+    assert summary['p95'] == 1.0
+    assert summary['p99'] == 1.0
+    assert abs(summary['mean'] - 1.99) < 1e-9
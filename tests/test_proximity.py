@@ -0,0 +1,57 @@
+import numpy as np
+from Scripts.proximity import ProximityService
+
+
+class Entity:
+    def __init__(self, x, y):
+        self.pos = [x, y]
+
+
+def brute_force_counts(points, radius):
+    offsets = points[:, None, :] - points[None, :, :]
+    close = (offsets ** 2).sum(axis=2) < radius * radius
+    return close.sum(axis=1) - 1
+
+
+def random_entities(seed, count, spread):
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(0, spread, size=(count, 2))
+    points[: count // 4, 1] = 300  # Many entities share a row, like skeletons on the ground
+    return [Entity(x, y) for x, y in points.tolist()]
+
+
+def test_neighbor_counts_and_isolation_match_brute_force():
+    for seed, count, spread in ((1, 300, 2000), (2, 50, 300), (3, 500, 10000)):
+        entities = random_entities(seed, count, spread)
+        proximity = ProximityService()
+        proximity.rebuild(entities)
+        points = np.array([entity.pos for entity in entities])
+        for radius in (10, 100, 200):
+            expected = brute_force_counts(points, radius)
+            assert np.array_equal(proximity.neighbor_counts(radius), expected)
+            assert np.array_equal(proximity.isolated(radius), expected == 0)
+
+
+def test_entity_queries():
+    a, b, c = Entity(0, 0), Entity(30, 40), Entity(500, 0)
+    outsider = Entity(1, 1)
+    proximity = ProximityService()
+    proximity.rebuild([a, b, c])
+
+    assert proximity.distance(a, b) == 50
+    assert proximity.count_within(a, 60) == 1
+    assert proximity.is_isolated(c, 200) is True
+    assert proximity.is_isolated(a, 200) is False
+    assert proximity.neighbors(a, 1000) == [b, c]
+    assert proximity.distance(a, outsider) is None
+    assert proximity.is_isolated(outsider, 200) is None
+
+
+def test_single_and_empty_sets():
+    proximity = ProximityService()
+    proximity.rebuild([])
+    assert len(proximity.isolated(200)) == 0
+    lone = Entity(5, 5)
+    proximity.rebuild([lone])
+    assert proximity.is_isolated(lone, 200) is True
+    assert proximity.count_within(lone, 200) == 0
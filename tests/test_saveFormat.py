@@ -0,0 +1,60 @@
+import json
+import pytest
+from util.saveFormat import DEAD, FLIPPED, SAVE_HEADER, SaveReader, SaveWriter, is_save
+
+
+def build_save(enemy_count=3, compress=True):
+    writer = SaveWriter()
+    writer.set_player(12.5, 300.0, 80.0)
+    for i in range(enemy_count):
+        writer.add_enemy('Goblin' if i % 2 else 'Enemy', i * 10.25, 288.0, 400, 400, 25.0 - i,
+                         'patrol' if i % 3 else None, FLIPPED if i % 2 else DEAD)
+    writer.add_sound('skeletonWalk', 2)
+    writer.add_sound('swordSwing', 1)
+    return writer.to_bytes(compress)
+
+
+@pytest.mark.parametrize('compress', [True, False])
+def test_round_trip(compress):
+    save = SaveReader(build_save(compress=compress))
+    assert tuple(save.player) == (12.5, 300.0, 80.0)
+
+    enemies = list(save.enemies())
+    assert len(enemies) == 3
+    assert [enemy.type for enemy in enemies] == ['Enemy', 'Goblin', 'Enemy']
+    assert [enemy.state for enemy in enemies] == [None, 'patrol', 'patrol']
+    assert [enemy.flags for enemy in enemies] == [DEAD, FLIPPED, DEAD]
+    assert enemies[2].x == 20.5 and enemies[2].width == 400 and enemies[2].health == 23.0
+
+    assert [tuple(sound) for sound in save.sounds()] == [('skeletonWalk', 2), ('swordSwing', 1)]
+
+
+def test_names_are_stored_once():
+    save = SaveReader(build_save(enemy_count=200))
+    assert sorted(save.strings) == ['Enemy', 'Goblin', 'patrol', 'skeletonWalk', 'swordSwing']
+    assert len(list(save.enemies())) == 200
+
+
+def test_compressed_save_is_much_smaller_than_json_and_hex():
+    data = build_save(enemy_count=300)
+    legacy = json.dumps({'enemies': [{'type': 'Enemy', 'position': [i * 10.25, 288.0], 'size': [400, 400],
+                                      'currentState': 'PatrolState'} for i in range(300)]})
+    assert len(data) * 10 < len(legacy.encode('utf-8').hex())
+
+
+def test_legacy_json_saves_are_not_mistaken_for_binary():
+    legacy = json.dumps({'player': {'position': [0, 0], 'health': 100}, 'enemies': [], 'audio': []}).encode('utf-8')
+    assert not is_save(legacy)
+    assert is_save(build_save())
+
+
+def test_bad_data_is_rejected():
+    data = build_save(compress=False)
+    with pytest.raises(ValueError):
+        SaveReader(data[:SAVE_HEADER.size - 1])
+    with pytest.raises(ValueError):
+        SaveReader(b'XXXX' + data[4:])
+    with pytest.raises(ValueError):
+        SaveReader(data[:4] + (99).to_bytes(2, 'little') + data[6:])
+    with pytest.raises(ValueError):
+        SaveReader(data[:-5])
@@ -0,0 +1,79 @@
+import sqlite3
+from util.saveStore import SCHEMA_VERSION, SaveStore
+
+
+def legacy_database(path, rows):
+    # The table games wrote before slots, with hex text values
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE game_state (id INTEGER PRIMARY KEY, iv TEXT, data TEXT)")
+    conn.executemany("INSERT INTO game_state (iv, data) VALUES (?, ?)",
+                     [(bytes([i]).hex() * 16, bytes([i]).hex() * 64) for i in range(rows)])
+    conn.commit()
+    conn.close()
+
+
+def test_migrates_legacy_rows_into_the_default_slot(tmp_path):
+    path = str(tmp_path / 'saves.db')
+    legacy_database(path, 32)
+    store = SaveStore(path, keep=None)
+    assert store.conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    assert store.conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    (slot, count, saved_at), = store.slots()
+    assert (slot, count) == ('default', 32)
+    assert saved_at > 0
+    iv, data = store.latest()
+    assert iv == '1f' * 16 and data == '1f' * 64  # Legacy hex text is left for the loader to decode
+    store.close()
+
+    # Opening again does not migrate twice
+    store = SaveStore(path, keep=None)
+    assert store.slots()[0][1] == 32
+    store.close()
+
+
+def test_slots_keep_their_own_latest_save(tmp_path):
+    store = SaveStore(str(tmp_path / 'saves.db'))
+    store.write(b'iv-a', b'first', 'a')
+    store.write(b'iv-b', b'other', 'b')
+    store.write(b'iv-a', b'second', 'a')
+    assert store.latest('a') == (b'iv-a', b'second')
+    assert store.latest('b') == (b'iv-b', b'other')
+    assert store.latest('missing') is None
+    assert [(slot, count) for slot, count, _ in store.slots()] == [('a', 2), ('b', 1)]
+
+    store.delete('a')
+    assert [slot for slot, _, _ in store.slots()] == ['b']
+    store.delete()
+    assert store.slots() == []
+    store.close()
+
+
+def test_prunes_each_slot_to_the_newest_saves(tmp_path):
+    store = SaveStore(str(tmp_path / 'saves.db'), keep=3, vacuum_interval=None)
+    for i in range(10):
+        store.write(b'iv', bytes([i]), 'kiosk')
+    store.write(b'iv', b'x', 'other')
+    rows = store.conn.execute("SELECT data FROM game_state WHERE slot = 'kiosk' ORDER BY id").fetchall()
+    assert [row[0] for row in rows] == [bytes([7]), bytes([8]), bytes([9])]
+    assert dict((slot, count) for slot, count, _ in store.slots()) == {'kiosk': 3, 'other': 1}
+    store.close()
+
+
+def test_max_age_always_keeps_the_newest_save(tmp_path):
+    store = SaveStore(str(tmp_path / 'saves.db'), keep=None, max_age=0, vacuum_interval=None)
+    for i in range(5):
+        store.write(b'iv', bytes([i]))
+    assert store.slots()[0][1] == 1
+    assert store.latest() == (b'iv', bytes([4]))
+    store.close()
+
+
+def test_vacuums_every_interval(tmp_path):
+    store = SaveStore(str(tmp_path / 'saves.db'), keep=1, vacuum_interval=4)
+    for i in range(3):
+        store.write(b'iv', bytes(4096))
+    assert store.saves_since_vacuum == 3
+    store.write(b'iv', bytes(4096))
+    assert store.saves_since_vacuum == 0
+    assert store.conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    store.close()
@@ -0,0 +1,91 @@
+import random
+import pygame
+import pytest
+from Scripts.tilemap import Tilemap
+
+LEGEND = {
+    '#': {'color': [90, 60, 30], 'solid': True},
+    '=': {'color': [120, 120, 120], 'solid': True},
+    '*': {'color': [40, 160, 40], 'solid': False},
+}
+
+
+@pytest.fixture(scope='module', autouse=True)
+def display():
+    # Tile images are converted for the display, so one has to exist
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    yield
+    pygame.display.quit()
+
+
+def random_layout(seed, columns=23, rows=17, tile_size=8, chunk_size=4):
+    rng = random.Random(seed)
+    layers = [
+        {'rows': [''.join(rng.choice('..#=') for _ in range(columns)) for _ in range(rows)]},
+        {'rows': [''.join(rng.choice('.....*') for _ in range(columns)) for _ in range(rows)]},
+    ]
+    return {'tile_size': tile_size, 'chunk_size': chunk_size, 'tiles': LEGEND, 'layers': layers}
+
+
+def tile_rects(tilemap, solid_only):
+    size = tilemap.tile_size
+    rects = []
+    for layer in tilemap.layers:
+        for y, row in enumerate(layer):
+            for x, key in enumerate(row):
+                if key != '.' and (not solid_only or LEGEND[key]['solid']):
+                    rects.append((pygame.Rect(x * size, y * size, size, size), key))
+    return rects
+
+
+def test_collision_queries_match_per_tile_rects():
+    tilemap = Tilemap(random_layout(1))
+    solid = {(rect.x, rect.y, rect.w, rect.h) for rect, _ in tile_rects(tilemap, solid_only=True)}
+    rng = random.Random(2)
+    for _ in range(500):
+        # Rects reach past every edge of the level as well as inside it
+        rect = pygame.Rect(rng.randint(-40, tilemap.width + 10), rng.randint(-40, tilemap.height + 10),
+                           rng.randint(1, 60), rng.randint(1, 60))
+        expected = {tile for tile in solid if rect.colliderect(pygame.Rect(tile))}
+        assert tilemap.collides(rect) == bool(expected)
+        assert {(r.x, r.y, r.w, r.h) for r in tilemap.solid_rects(rect)} == expected
+
+
+def test_is_solid_matches_the_layout():
+    tilemap = Tilemap(random_layout(3))
+    solid = {(rect.x, rect.y) for rect, _ in tile_rects(tilemap, solid_only=True)}
+    for y in range(-8, tilemap.height + 8, 4):
+        for x in range(-8, tilemap.width + 8, 4):
+            size = tilemap.tile_size
+            assert tilemap.is_solid(x, y) == ((x // size * size, y // size * size) in solid)
+
+
+def test_platforms_are_the_open_topped_runs():
+    layout = {'tile_size': 10, 'tiles': LEGEND, 'layers': [{'rows': [
+        '..==..#',
+        '####..#',
+        '..*....',
+        '=#=.##.',
+    ]}]}
+    spans = [(span.pos, span.size) for span in Tilemap(layout).platforms()]
+    assert spans == [
+        ([20, 0], [20, 10]),  # The platform on top covers the ground under it
+        ([60, 0], [10, 10]),
+        ([0, 10], [20, 10]),
+        ([0, 30], [30, 10]),  # Tiles of different kinds join into one run
+        ([40, 30], [20, 10]),
+    ]
+
+
+@pytest.mark.parametrize('view', [(0, 0), (13, 5), (-20, -9), (37, 21), (150, 110)])
+def test_chunked_render_matches_per_tile_blits(view):
+    tilemap = Tilemap(random_layout(4))
+    view = pygame.Rect(view, (70, 50))
+    chunked = pygame.Surface(view.size, pygame.SRCALPHA)
+    tilemap.render(chunked, view)
+
+    expected = pygame.Surface(view.size, pygame.SRCALPHA)
+    for rect, key in tile_rects(tilemap, solid_only=False):
+        expected.blit(tilemap.tile_images[key], rect.move(-view.x, -view.y))
+    assert pygame.image.tobytes(chunked, 'RGBA') == pygame.image.tobytes(expected, 'RGBA')
@@ -0,0 +1,70 @@
+from Scripts.timers import TimerService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def test_timers_run_in_due_order_once_due():
+    clock = FakeClock()
+    timers = TimerService(clock)
+    ran = []
+    timers.schedule(300, ran.append, 'c')
+    timers.schedule(100, ran.append, 'a')
+    timers.schedule(200, ran.append, 'b')
+
+    clock.now = 99
+    timers.update()
+    assert ran == []
+
+    clock.now = 250
+    timers.update()
+    assert ran == ['a', 'b']
+    assert timers.pending() == 1
+
+    clock.now = 1000
+    timers.update()
+    assert ran == ['a', 'b', 'c']
+    assert timers.pending() == 0
+
+
+def test_timers_due_together_run_in_schedule_order():
+    clock = FakeClock()
+    timers = TimerService(clock)
+    ran = []
+    for name in 'xyz':
+        timers.schedule(50, ran.append, name)
+    clock.now = 50
+    timers.update()
+    assert ran == ['x', 'y', 'z']
+
+
+def test_cancelled_timer_does_not_run():
+    clock = FakeClock()
+    timers = TimerService(clock)
+    ran = []
+    kept = timers.schedule(10, ran.append, 'kept')
+    cancelled = timers.schedule(10, ran.append, 'cancelled')
+    timers.cancel(cancelled)
+    clock.now = 10
+    timers.update()
+    assert ran == ['kept']
+    timers.cancel(kept)  # Already ran, so nothing happens
+    assert timers.pending() == 0
+
+
+def test_timer_scheduled_by_a_callback_waits_for_its_own_delay():
+    clock = FakeClock()
+    timers = TimerService(clock)
+    ran = []
+    timers.schedule(10, lambda: timers.schedule(10, ran.append, 'second'))
+    clock.now = 10
+    timers.update()
+    assert ran == []
+    clock.now = 20
+    timers.update()
+    assert ran == ['second']
@@ -1,15 +1,11 @@
 import pygame
 import os
-import time
 from collections import namedtuple, deque
 import threading
-from concurrent.futures import ThreadPoolExecutor
-import logging
 
 SoundData = namedtuple('SoundData', ['sound', 'priority'])
 
-class AudioPlayer:
-    DEBOUNCE_INTERVAL = 500  # milliseconds
+class SoundBank:
     AUDIOFILES = {
         'MUSICPATH': 'audio/sword/',
         'KNIGHTSOUND': 'audio/knight/',
@@ -19,100 +15,174 @@ class AudioPlayer:
         'FLYINGSOUND': 'audio/FlyingEye/',
         'WORMSOUND': 'audio/Worm/'
     }
+    SOUNDS = {
+        'attack1Sound': ('sword-hit-medium.wav', 2),
+        'attack2Sound': ('nasty-knife-stab-2.wav', 2),
+        'rightfoot': ('knight-right-footstep-forestgrass-2-with-chainmail.wav', 1),
+        'leftfoot': ('knight-left-footstep-forestgrass-5-with-chainmail.wav', 1),
+        'skeletonWalk': ('step-skeleton.mp3', 1),
+        'goblinWalk': ('goblin_03.wav', 2),
+        'wormWalk': ('snake.wav', 2),
+        'mushroomatt1': ('clap.wav', 2),
+        'mushroomatt2': ('monster-bite.wav', 2),
+        'mushroomatt3': ('projectile-hit.flac', 2),
+        'mushroomWalk': ('sludge-footsteps-1.wav', 2),
+        'flyingEyeWalk': ('wing-flap.wav', 1),
+        'flyingAttack': ('fast-collision-reverb.flac', 3),
+        'wormAttack': ('fire-ball.wav', 2),
+    }
 
     def __init__(self):
         """
-        Initializes the AudioPlayer instance and sets up the thread pool.
+        Initializes an empty sound bank. Sounds are decoded from disk on first use and then shared.
         """
-        pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=1024)
-        self.channels = []
-        self.sound_queue = deque()
-        self.currently_playing = {}
-        self.sound_last_played = {}
+        self.sounds = {}
         self.lock = threading.Lock()
-        self.running = True
-        self.executor = ThreadPoolExecutor(max_workers=10)  
-        self.update_thread = threading.Thread(target=self.run_update)
-        self.update_thread.start()
 
-    def enqueue_sound(self, sound_data):
+    def load_audio(self, path):
         """
-        Enqueues a sound to be played in the thread pool.
+        Load an audio file from the specified path.
         """
-        self.executor.submit(self._enqueue_sound_task, sound_data)
+        directories = self.AUDIOFILES.values()
+        for directory in directories:
+            full_path = os.path.join(directory, path)
+            if os.path.exists(full_path):
+                return pygame.mixer.Sound(full_path)
+        raise FileNotFoundError(f"Failed to load sound from any specified directory: {path}")
 
-    def _enqueue_sound_task(self, sound_data):
+    def get(self, name):
         """
-        Task to enqueue sound, ensuring it adheres to the debounce interval.
+        Returns the SoundData registered under the given name, loading it the first time it is requested.
         """
-        if sound_data and sound_data.sound:
-            current_time = pygame.time.get_ticks()
-            last_played = self.sound_last_played.get(sound_data.sound, 0)
-            if (current_time - last_played) >= self.DEBOUNCE_INTERVAL:
-                with self.lock:
-                    self.sound_queue.append(sound_data)
-                    self.sound_last_played[sound_data.sound] = current_time
+        sound_data = self.sounds.get(name)
+        if sound_data is None:
+            # Decoding happens outside the lock so several loader threads can decode at once
+            path, priority = self.SOUNDS[name]
+            sound = self.load_audio(path)
+            with self.lock:
+                sound_data = self.sounds.setdefault(name, SoundData(sound, priority=priority))
+        return sound_data
 
-    def run_update(self):
+    def name_of(self, sound):
         """
-        Runs the update loop for the AudioPlayer.
-        Continuously checks for new sounds to play in the thread pool.
-        This method includes comprehensive error handling to manage potential issues
-        with thread pool shutdown, task submission, and other unexpected errors.
+        Returns the name a loaded sound is registered under, or None for sounds not from the bank.
         """
-        while self.running:
-            try:
-                time.sleep(0.05)  # Adjust sleep time for better responsiveness
+        for name, sound_data in self.sounds.items():
+            if sound_data.sound is sound:
+                return name
+        return None
 
-                # Only submit tasks if the player is still running and the executor is active
-                if self.running:
-                    try:
-                        self.executor.submit(self.update)
-                    except RuntimeError as e:
-                        # Handle the case where the executor has been shut down
-                        logging.error(f"Task submission failed: {e}")
-                        break  # Exit the loop since we can't submit new tasks
+    def load_all(self):
+        """
+        Loads every registered sound up front.
+        """
+        for name in self.SOUNDS:
+            self.get(name)
 
-            except Exception as e:
-                # Catch any other unexpected exceptions that could crash the thread
-                logging.error(f"An error occurred in run_update: {e}", exc_info=True)
-                break  # Exit the loop to prevent continuous errors
+class AudioHandle:
+    def __init__(self, player):
+        """
+        Initializes a lightweight per-entity view of the shared AudioPlayer.
 
-        logging.info("Exiting run_update loop.")
+        Sound attributes such as `skeletonWalk` resolve to the shared sound bank, so creating
+        a handle costs no threads, mixer setup or file loads.
+        """
+        self.player = player
 
-    def play_sound(self, sound_data):
+    def __getattr__(self, name):
+        try:
+            return self.player.bank.get(name)
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def enqueue_sound(self, sound_data):
+        self.player.enqueue_sound(sound_data)
+
+    def get_channel(self, required_priority):
+        return self.player.get_channel(required_priority)
+
+class AudioPlayer:
+    DEBOUNCE_INTERVAL = 500  # milliseconds
+    AUDIOFILES = SoundBank.AUDIOFILES
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
         """
-        Plays a sound on a channel using the thread pool.
+        Returns the process-wide AudioPlayer, creating it on first use.
         """
-        self.executor.submit(self._play_sound_task, sound_data)
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
 
-    def _play_sound_task(self, sound_data):
+    def __init__(self):
+        """
+        Initializes the AudioPlayer instance.
+        Prefer AudioPlayer.shared() so the whole game uses a single mixer and sound bank.
+        Queued sounds are started by update(), which the game calls once per frame.
+        """
+        pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=1024)
+        self.bank = SoundBank()
+        self.channels = []
+        self.mixer_channels = {}  # Channel objects by mixer index, reused so they compare equal
+        self.sound_queue = deque()
+        self.currently_playing = {}
+        self.sound_last_played = {}
+        self.lock = threading.Lock()
+        self.running = True
+        self.clock = pygame.time.get_ticks  # Replaced with the game clock once a Game exists
+
+    def enqueue_sound(self, sound_data):
+        """
+        Enqueues a sound to be started on the next update, ensuring it adheres to the debounce interval.
+        Safe to call from the game thread or from state worker threads.
+        """
+        if not self.running or not sound_data or not sound_data.sound:
+            return
+        current_time = self.clock()
+        with self.lock:
+            last_played = self.sound_last_played.get(sound_data.sound)
+            if last_played is None or (current_time - last_played) >= self.DEBOUNCE_INTERVAL:
+                self.sound_queue.append(sound_data)
+                self.sound_last_played[sound_data.sound] = current_time
+
+    def play_sound(self, sound_data):
         """
-        Task to play sound on an appropriate channel based on priority.
+        Plays a sound on an appropriate channel based on priority.
+
+        Returns:
+            bool: True if a channel was found and the sound started, False otherwise.
         """
         channel = self.get_channel(sound_data.priority)
         if channel:
             channel.play(sound_data.sound)
-            with self.lock:
-                self.currently_playing[channel] = sound_data
+            self.currently_playing[channel] = sound_data
+            return True
+        return False
 
     def update(self):
         """
-        Updates the audio player by checking and playing sounds from the queue.
+        Services the mixer: frees finished channels and starts every queued sound a channel can be found for.
+        Sounds that cannot get a channel stay queued for the next update.
         """
         with self.lock:
             self.cleanup_channels()
-            if self.sound_queue:
-                sound_data = self.sound_queue.popleft()
-                self.play_sound(sound_data)
+            while self.sound_queue:
+                if not self.play_sound(self.sound_queue[0]):
+                    break
+                self.sound_queue.popleft()
 
     def stop(self):
         """
-        Stops the audio player and shuts down the thread pool.
+        Stops the audio player and drops any queued sounds.
         """
         self.running = False
-        self.update_thread.join()
-        self.executor.shutdown(wait=True)  # Ensure all tasks are completed before shutting down
+        with self.lock:
+            self.sound_queue.clear()
+        self.stop_all_sounds()
 
     def get_channel(self, required_priority):
         """
@@ -129,12 +199,15 @@ class AudioPlayer:
 
     def create_new_channel(self):
         """
-        Creates a new channel if possible.
+        Creates a new channel if possible, skipping mixer channels that are already tracked or still busy.
         """
-        if len(self.channels) < pygame.mixer.get_num_channels():
-            new_channel = pygame.mixer.Channel(len(self.channels))
-            self.channels.append(new_channel)
-            return new_channel
+        for index in range(pygame.mixer.get_num_channels()):
+            new_channel = self.mixer_channels.get(index)
+            if new_channel is None:
+                new_channel = self.mixer_channels[index] = pygame.mixer.Channel(index)
+            if new_channel not in self.channels and not new_channel.get_busy():
+                self.channels.append(new_channel)
+                return new_channel
         return None
 
     def cleanup_channels(self):
@@ -144,35 +217,25 @@ class AudioPlayer:
         self.channels = [channel for channel in self.channels if channel.get_busy()]
         self.currently_playing = {channel: sound for channel, sound in self.currently_playing.items() if channel.get_busy()}
 
+    def handle(self):
+        """
+        Returns a lightweight handle for an entity to enqueue sounds through this player.
+        """
+        return AudioHandle(self)
+
     def load_audio(self, path):
         """
         Load an audio file from the specified path.
         """
-        directories = self.AUDIOFILES.values()
-        for directory in directories:
-            full_path = os.path.join(directory, path)
-            if os.path.exists(full_path):
-                return pygame.mixer.Sound(full_path)
-        raise FileNotFoundError(f"Failed to load sound from any specified directory: {path}")
+        return self.bank.load_audio(path)
 
     def setup_sounds(self):
         """
         Set up sounds with associated priorities and debounce handling.
+        Sounds come from the shared bank, so each file is only decoded once.
         """
-        self.attack1Sound = SoundData(self.load_audio('sword-hit-medium.wav'), priority=2)
-        self.attack2Sound = SoundData(self.load_audio('nasty-knife-stab-2.wav'), priority=2)
-        self.rightfoot = SoundData(self.load_audio('knight-right-footstep-forestgrass-2-with-chainmail.wav'), priority=1)
-        self.leftfoot = SoundData(self.load_audio('knight-left-footstep-forestgrass-5-with-chainmail.wav'), priority=1)
-        self.skeletonWalk = SoundData(self.load_audio('step-skeleton.mp3'), priority=1)
-        self.goblinWalk = SoundData(self.load_audio('goblin_03.wav'), priority=2)
-        self.wormWalk = SoundData(self.load_audio('snake.wav'), priority=2)
-        self.mushroomatt1 = SoundData(self.load_audio('clap.wav'), priority=2)
-        self.mushroomatt2 = SoundData(self.load_audio('monster-bite.wav'), priority=2)
-        self.mushroomatt3 = SoundData(self.load_audio('projectile-hit.flac'), priority=2)
-        self.mushroomWalk = SoundData(self.load_audio('sludge-footsteps-1.wav'), priority=2)
-        self.flyingEyeWalk = SoundData(self.load_audio('wing-flap.wav'), priority=1)
-        self.flyingAttack = SoundData(self.load_audio('fast-collision-reverb.flac'), priority=3)
-        self.wormAttack = SoundData(self.load_audio('fire-ball.wav'), priority=2)
+        for name in SoundBank.SOUNDS:
+            setattr(self, name, self.bank.get(name))
     
     def get_audio_state(self):
         """
@@ -180,9 +243,9 @@ class AudioPlayer:
         """
         audio_state = []
         for channel, sound_data in self.currently_playing.items():
-            sound_name = sound_data.sound.get_buffer().raw  # Assuming the sound name can be extracted or stored somehow
-            priority = sound_data.priority
-            audio_state.append((sound_name, priority))
+            sound_name = self.bank.name_of(sound_data.sound)  # Saved by name, so a save holds no audio data
+            if sound_name is not None:
+                audio_state.append((sound_name, sound_data.priority))
         return audio_state
 
     def set_audio_state(self, audio_state):
@@ -191,9 +254,9 @@ class AudioPlayer:
         """
         self.stop_all_sounds()
         for sound_name, priority in audio_state:
-            sound = self.load_audio(sound_name)  # Assuming you have a way to load the sound by name
-            sound_data = SoundData(sound, priority)
-            self.play_sound(sound_data)
+            if sound_name in SoundBank.SOUNDS:
+                sound_data = SoundData(self.bank.get(sound_name).sound, priority)
+                self.play_sound(sound_data)
 
     def stop_all_sounds(self):
         """
@@ -1,4 +1,4 @@
-import sqlite3
+import base64
 import json
 import os
 import firebase_admin
@@ -8,8 +8,12 @@ from Crypto.Util.Padding import pad, unpad
 from Enemies.Goblin import Goblin
 from Enemies.Mushroom import Mushroom
 from Enemies.FlyingEye import FlyingEye
+from Enemies.FireWorm import FireWorm
 from Enemies.BaseEnemy import Enemy  
 from stateManager.stateManager import *
+from util.saveFormat import SAVE_VERSION, SaveReader, SaveWriter, is_save, FLIPPED, DEAD
+from util.saveStore import SaveStore
+from util.settings import LOCAL_SAVE_DB, SAVE_SLOT
 import threading
 
 state_mapping = {
@@ -22,6 +26,14 @@ state_mapping = {
     'SpecialMushroomAttackState': SpecialMushroomAttackState
 }
 
+enemy_classes = {
+    'Enemy': Enemy,
+    'Goblin': Goblin,
+    'Mushroom': Mushroom,
+    'FlyingEye': FlyingEye,
+    'FireWorm': FireWorm,
+}
+
 class GameSaver:
     def __init__(self, game, path='game_states/default_save', key=None):
         """
@@ -40,15 +52,16 @@ class GameSaver:
         self.key = key if key else os.urandom(16)
         self.iv = os.urandom(AES.block_size)
         self.db_ref = db.reference(self.db_path)
-        self.local_db_path = 'local_game_state.db'
+        self.local_db_path = LOCAL_SAVE_DB
         self.lock = threading.Lock()
         self.init_local_db()
 
     def init_local_db(self):
         """
-        Initializes a local SQLite database to store game state data.
+        Opens the local SQLite save store, migrating a database written by older versions of the game.
 
-        This function creates a new SQLite database file at the specified `local_db_path` if it does not already exist. It then creates a table named 'game_state' with three columns: 'id' (primary key), 'iv' (text), and 'data' (text).
+        The store keeps one connection open in WAL mode, groups saves into named slots and prunes old saves
+        after every save (see util/saveStore.py and the SAVE_* settings).
 
         Parameters:
             self (object): The instance of the class.
@@ -56,51 +69,56 @@ class GameSaver:
         Returns:
             None
         """
-        conn = sqlite3.connect(self.local_db_path)
-        cursor = conn.cursor()
-        cursor.execute('''CREATE TABLE IF NOT EXISTS game_state
-                          (id INTEGER PRIMARY KEY, iv TEXT, data TEXT)''')
-        conn.commit()
-        conn.close()
+        self.store = SaveStore(self.local_db_path)
+
+    def list_saves(self):
+        """
+        Returns a (slot, number of saves, time of the newest save) tuple for every local slot holding a save.
+        """
+        return self.store.slots()
+
+    def close(self):
+        self.store.close()
 
     def serialize_game_state(self):
         """
-        Serializes the game state into a JSON string.
+        Serializes the game state into the compressed binary save format (see util/saveFormat.py).
 
         Returns:
-            str: The JSON string representation of the game state.
+            bytes: The save, ready to be encrypted.
         """
-        player_state = {
-            'position': self.game.player.pos,
-            'health': self.game.health.current_health
-        }
-        enemies_state = [
-            {'type': enemy.__class__.__name__,
-             'position': enemy.pos,
-             'size': enemy.size,
-             'currentState': type(enemy.state_machine.current_state).__name__}
-            for enemy in self.game.enemies
-        ]
-        audio_state = self.game.audioPlayer.get_audio_state()
-        game_state = {'player': player_state, 'enemies': enemies_state, 'audio': audio_state}
-        return json.dumps(game_state)
+        writer = SaveWriter()
+        writer.set_player(self.game.player.pos[0], self.game.player.pos[1], self.game.health.current_health)
+        for enemy in self.game.enemies:
+            machine = enemy.state_machine
+            state = next((name for name, state in machine.states.items() if state is machine.current_state), None)
+            flags = (FLIPPED if enemy.flip else 0) | (DEAD if enemy.dead else 0)
+            writer.add_enemy(enemy.__class__.__name__, enemy.position()[0], enemy.position()[1], enemy.size[0], enemy.size[1],
+                             enemy.enemy_health.current_health, state, flags)
+        for sound_name, priority in self.game.audioPlayer.get_audio_state():
+            writer.add_sound(sound_name, priority)
+        return writer.to_bytes()
 
     def encrypt(self, plaintext):
+        if isinstance(plaintext, str):
+            plaintext = plaintext.encode('utf-8')
         cipher = AES.new(self.key, AES.MODE_CBC, self.iv)
-        return cipher.encrypt(pad(plaintext.encode('utf-8'), AES.block_size))
+        return cipher.encrypt(pad(plaintext, AES.block_size))
 
-    def save_game(self):
-        thread = threading.Thread(target=self._save_game_thread)
+    def save_game(self, slot=SAVE_SLOT):
+        thread = threading.Thread(target=self._save_game_thread, args=(slot,))
         thread.start()
 
-    def _save_game_thread(self):
+    def _save_game_thread(self, slot=SAVE_SLOT):
         """
-        Save the game state to Firebase and locally.
+        Save the game state to Firebase and to a local save slot.
 
         This function saves the game state by serializing it, encrypting it, and storing it in both Firebase and a local SQLite database.
+        SQLite stores the IV and ciphertext as raw BLOBs; Firebase only holds text, so it gets them base64-encoded.
 
         Parameters:
             self (object): The instance of the class.
+            slot (str, optional): The local slot to save to. Firebase keeps only the latest save. Defaults to SAVE_SLOT.
         
         Returns:
             None
@@ -111,27 +129,25 @@ class GameSaver:
         with self.lock:
             try:
                 state = self.serialize_game_state()
+                self.iv = os.urandom(AES.block_size)  # CBC must not reuse an IV with the same key
                 encrypted_data = self.encrypt(state)
                 self.db_ref.set({
-                    'iv': self.iv.hex(),
-                    'data': encrypted_data.hex()
+                    'format': SAVE_VERSION,
+                    'iv': base64.b64encode(self.iv).decode('ascii'),
+                    'data': base64.b64encode(encrypted_data).decode('ascii')
                 })
-                conn = sqlite3.connect(self.local_db_path)
-                cursor = conn.cursor()
-                cursor.execute("INSERT INTO game_state (iv, data) VALUES (?, ?)",
-                               (self.iv.hex(), encrypted_data.hex()))
-                conn.commit()
-                conn.close()
+                self.store.write(self.iv, encrypted_data, slot)
                 print("Game saved securely to Firebase and locally.")
             except Exception as e:
                 print(f"Error saving game: {e}")
 
-    def load_game(self, from_local=False):
+    def load_game(self, from_local=False, slot=SAVE_SLOT):
         """
         Load a saved game from either the local database or the Firebase database.
 
         Parameters:
             from_local (bool): If True, load the game from the local database. If False, load the game from the Firebase database.
+            slot (str, optional): The local slot to load the newest save of. Defaults to SAVE_SLOT.
 
         Returns:
             None
@@ -143,21 +159,22 @@ class GameSaver:
             - The `self.lock` context manager is used to ensure thread safety during the loading process.
             - The `self.db_ref` object is assumed to be an instance of a Firebase database reference.
         """
-        thread = threading.Thread(target=self._load_game_thread, args=(from_local,))
+        thread = threading.Thread(target=self._load_game_thread, args=(from_local, slot))
         thread.start()
 
-    def _load_game_thread(self, from_local):
+    def _load_game_thread(self, from_local, slot=SAVE_SLOT):
         """
         Load a saved game from either the local database or the Firebase database.
 
         Parameters:
             from_local (bool): If True, load the game from the local database. If False, load the game from the Firebase database.
+            slot (str, optional): The local slot to load the newest save of. Defaults to SAVE_SLOT.
 
         Returns:
             None
 
         This function loads a saved game by querying the appropriate database based on the value of the `from_local` parameter.
-        If `from_local` is True, it connects to the local database, retrieves the most recent saved game data, and decrypts it.
+        If `from_local` is True, it retrieves the most recent save in the slot from the local store, and decrypts it.
         The decrypted data is then deserialized and used to restore the game state.
         If `from_local` is False, it retrieves the saved game data from the Firebase database and performs the same decryption and deserialization steps.
         If the game is loaded successfully, a message is printed to indicate that the game was loaded securely.
@@ -172,20 +189,21 @@ class GameSaver:
         with self.lock:
             try:
                 if from_local:
-                    conn = sqlite3.connect(self.local_db_path)
-                    cursor = conn.cursor()
-                    cursor.execute("SELECT iv, data FROM game_state ORDER BY id DESC LIMIT 1")
-                    saved_data = cursor.fetchone()
-                    conn.close()
+                    saved_data = self.store.latest(slot)
                     if saved_data:
                         iv, data = saved_data
-                        iv = bytes.fromhex(iv)
-                        encrypted_data = bytes.fromhex(data)
+                        # Rows written before the binary format hold hex text
+                        iv = bytes.fromhex(iv) if isinstance(iv, str) else iv
+                        encrypted_data = bytes.fromhex(data) if isinstance(data, str) else data
                 else:
                     saved_data = self.db_ref.get()
                     if saved_data:
-                        iv = bytes.fromhex(saved_data['iv'])
-                        encrypted_data = bytes.fromhex(saved_data['data'])
+                        decode = base64.b64decode if 'format' in saved_data else bytes.fromhex
+                        iv = decode(saved_data['iv'])
+                        encrypted_data = decode(saved_data['data'])
+                if not saved_data:
+                    print("No saved game found.")
+                    return
 
                 decrypted_data = self.decrypt(encrypted_data, iv)
                 self.deserialize_game_state(decrypted_data)
@@ -193,27 +211,28 @@ class GameSaver:
             except Exception as e:
                 print(f"Failed to load game: {e}")
 
-    def delete_game(self):
+    def delete_game(self, slot=None):
         """
         Deletes the game state from both Firebase and the local database.
 
-        This function deletes the game state from the Firebase Realtime Database and the local SQLite database. It first deletes the game state from Firebase using the `delete()` method of the `db_ref` object. Then, it connects to the local SQLite database using the `connect()` method of the `sqlite3` module. It creates a cursor object and executes the SQL query to delete the game state from the `game_state` table using the `execute()` method of the cursor object. After that, it commits the changes to the database using the `commit()` method of the connection object. Finally, it closes the database connection using the `close()` method of the connection object.
+        This function deletes the game state from the Firebase Realtime Database and the local save store. When a slot is given, only that local slot is deleted and Firebase is left alone, since Firebase only keeps the latest save.
 
         If any exception occurs during the execution of this function, it prints an error message with the exception details.
 
         Parameters:
             self (GameSaver): The instance of the GameSaver class.
+            slot (str, optional): The local slot to delete, or None to delete every save. Defaults to None.
 
         Returns:
             None
         """
         try:
+            if slot is not None:
+                self.store.delete(slot)
+                print(f"Save slot '{slot}' deleted locally.")
+                return
             self.db_ref.delete()
-            conn = sqlite3.connect(self.local_db_path)
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM game_state")
-            conn.commit()
-            conn.close()
+            self.store.delete()
             print("Game state deleted from Firebase and locally.")
         except Exception as e:
             print(f"Error deleting game: {e}")
@@ -227,17 +246,57 @@ class GameSaver:
             iv (bytes): The initialization vector used for decryption.
 
         Returns:
-            str: The decrypted data as a UTF-8 encoded string.
+            bytes: The decrypted data.
 
-        This function creates a new AES cipher object with the provided key and CBC mode. It then decrypts the ciphertext using the cipher object and the provided initialization vector. The decrypted data is unpadded and decoded as a UTF-8 string.
+        This function creates a new AES cipher object with the provided key and CBC mode. It then decrypts the ciphertext using the cipher object and the provided initialization vector. The decrypted data is unpadded.
 
         Raises:
             ValueError: If the ciphertext is not a multiple of the block size.
         """
         cipher = AES.new(self.key, AES.MODE_CBC, iv)
-        return unpad(cipher.decrypt(ciphertext), AES.block_size).decode('utf-8')
+        return unpad(cipher.decrypt(ciphertext), AES.block_size)
+
+    def deserialize_game_state(self, data):
+        """
+        Restore the game from a decrypted save, reading the binary records directly.
+        Saves made before the binary format are handed to deserialize_json_state.
+
+        Parameters:
+            data (bytes): The decrypted save.
+
+        Returns:
+            None
+        """
+        if not is_save(data):
+            self.deserialize_json_state(data.decode('utf-8'))
+            return
+
+        save = SaveReader(data)
+        self.game.player.pos = [save.player.x, save.player.y]
+        self.game.health.current_health = save.player.health
+        if self.game.crowd is not None:
+            self.game.crowd.clear()
+        self.game.enemies.clear()
 
-    def deserialize_game_state(self, state_json):
+        for record in save.enemies():
+            pos, size = [record.x, record.y], [record.width, record.height]
+            if record.type in ('Enemy', 'CrowdEnemy'):
+                enemy = self.game.create_skeleton(pos=pos, size=size)
+            elif record.type in enemy_classes:
+                enemy = enemy_classes[record.type](self.game, pos=pos, size=size)
+            else:
+                continue
+            enemy.enemy_rect.topleft = pos
+            enemy.enemy_health.current_health = record.health
+            enemy.flip = bool(record.flags & FLIPPED)
+            enemy.dead = bool(record.flags & DEAD)
+            if record.state in enemy.state_machine.states:
+                enemy.state_machine.change_state(record.state)
+            self.game.enemies.append(enemy)
+
+        self.game.audioPlayer.set_audio_state([(sound.name, sound.priority) for sound in save.sounds()])
+
+    def deserialize_json_state(self, state_json):
         """
         Deserialize the game state from a JSON string and update the game object accordingly.
 
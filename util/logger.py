@@ -0,0 +1,154 @@
+import logging
+import sys
+import threading
+from collections import deque
+
+ROOT_LOGGER = 'knights_conquest'
+LOG_FORMAT = '%(relativeCreated)8.0f %(levelname)-7s %(name)s: %(message)s'
+
+
+def get_logger(name):
+    """
+    Returns the logger for a module. Pass the module's __name__ so levels can be set per module or package.
+
+    Messages should use %-style arguments (log.debug("x=%s", x)) rather than f-strings, so a disabled
+    message returns before anything is formatted.
+    """
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+class RingBufferHandler(logging.Handler):
+    def __init__(self, capacity=1000):
+        """
+        Initializes a handler that keeps the most recent log records in memory.
+        Records are only formatted when the buffer is dumped.
+
+        Args:
+            capacity (int, optional): The number of records kept. Defaults to 1000.
+
+        Returns:
+            None
+        """
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+        self.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def dump(self, stream=None):
+        """
+        Writes every buffered record to the stream (stderr by default), oldest first.
+        """
+        stream = stream or sys.stderr
+        stream.write(f"--- last {len(self.records)} log records ---\n")
+        for record in list(self.records):
+            stream.write(self.format(record) + '\n')
+        stream.flush()
+
+
+def parse_levels(spec):
+    """
+    Parses a level spec such as "WARNING,Enemies=DEBUG,Scripts.camera=INFO".
+
+    Returns:
+        tuple: The default level name (or None) and a dict of module name to level name.
+    """
+    default = None
+    module_levels = {}
+    for part in filter(None, (part.strip() for part in (spec or '').split(','))):
+        if '=' in part:
+            module, level = part.split('=', 1)
+            module_levels[module.strip()] = level.strip().upper()
+        else:
+            default = part.upper()
+    return default, module_levels
+
+
+class LevelSpecFilter(logging.Filter):
+    def __init__(self, default, module_levels):
+        """
+        Initializes a filter that applies a parsed level spec at a handler instead of at the loggers,
+        so the loggers can pass everything on to a handler that wants more, such as the ring buffer.
+
+        Args:
+            default (str): The level for modules the spec does not name, or None for WARNING.
+            module_levels (dict): Module name to level name, as returned by parse_levels.
+
+        Returns:
+            None
+        """
+        super().__init__()
+        self.default = logging.getLevelName(default) if default else logging.WARNING
+        self.levels = {f"{ROOT_LOGGER}.{module}": logging.getLevelName(level) for module, level in module_levels.items()}
+
+    def filter(self, record):
+        # The most specific module named in the spec decides
+        name = record.name
+        while name:
+            level = self.levels.get(name)
+            if level is not None:
+                return record.levelno >= level
+            name = name.rpartition('.')[0]
+        return record.levelno >= self.default
+
+
+def install_crash_dump(ring_buffer):
+    """
+    Dumps the ring buffer before the default handling of an uncaught exception, on any thread.
+    """
+    previous_hook = sys.excepthook
+    previous_thread_hook = threading.excepthook
+
+    def excepthook(exc_type, exc_value, exc_traceback):
+        ring_buffer.dump()
+        previous_hook(exc_type, exc_value, exc_traceback)
+
+    def thread_excepthook(args):
+        ring_buffer.dump()
+        previous_thread_hook(args)
+
+    sys.excepthook = excepthook
+    threading.excepthook = thread_excepthook
+
+
+def configure_logging(spec=None, ring_buffer_size=0, stream=None):
+    """
+    Configures the game's loggers.
+
+    Args:
+        spec (str, optional): A level spec for parse_levels. The default level is WARNING, so per-frame
+            debug messages cost a single level check.
+        ring_buffer_size (int, optional): If greater than zero, also keep this many recent records in
+            memory and dump them when the game crashes. The buffer records every level down to DEBUG,
+            whatever the console shows, so debug messages are no longer skipped by the level check alone.
+        stream (file, optional): Where console output goes. Defaults to stderr.
+
+    Returns:
+        RingBufferHandler: The ring buffer handler, or None if it was not requested.
+    """
+    default, module_levels = parse_levels(spec)
+    root = logging.getLogger(ROOT_LOGGER)
+    root.propagate = False
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+    console = logging.StreamHandler(stream)
+    console.setFormatter(logging.Formatter(LOG_FORMAT))
+    root.addHandler(console)
+
+    ring_buffer = None
+    if ring_buffer_size > 0:
+        # The loggers pass everything; the spec's levels only apply to the console
+        root.setLevel(logging.DEBUG)
+        for module in module_levels:
+            logging.getLogger(f"{ROOT_LOGGER}.{module}").setLevel(logging.NOTSET)
+        console.addFilter(LevelSpecFilter(default, module_levels))
+        ring_buffer = RingBufferHandler(ring_buffer_size)
+        root.addHandler(ring_buffer)
+        install_crash_dump(ring_buffer)
+    else:
+        root.setLevel(default or logging.WARNING)
+        for module, level in module_levels.items():
+            logging.getLogger(f"{ROOT_LOGGER}.{module}").setLevel(level)
+    return ring_buffer
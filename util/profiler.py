@@ -0,0 +1,108 @@
+import math
+import threading
+import time
+from functools import wraps
+
+
+def percentile(samples, fraction):
+    """
+    Returns the given percentile (0-1) of a list of samples using nearest-rank.
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    # Rounded first, so a rank like 0.07 * 100 == 7.000000000000001 is not pushed up by float error
+    index = min(len(ordered) - 1, max(0, math.ceil(round(fraction * len(ordered), 9)) - 1))
+    return ordered[index]
+
+
+def summarize(samples):
+    """
+    Returns the mean, p95 and p99 of a list of timings in seconds, converted to milliseconds.
+    """
+    if not samples:
+        return {'mean': 0.0, 'p95': 0.0, 'p99': 0.0}
+    return {
+        'mean': sum(samples) / len(samples) * 1000,
+        'p95': percentile(samples, 0.95) * 1000,
+        'p99': percentile(samples, 0.99) * 1000,
+    }
+
+
+class FrameProfiler:
+    def __init__(self, sections=()):
+        """
+        Initializes a profiler that accumulates exclusive time per named section, frame by frame.
+
+        Time spent in a section that calls into another section is only counted once, in the innermost one.
+        Sections may be entered from any thread; each thread keeps its own nesting stack.
+
+        Args:
+            sections (Iterable[str], optional): Section names to report even if they never record any time.
+
+        Returns:
+            None
+        """
+        self.sections = list(sections)
+        self.frame_times = []
+        self.section_times = {name: [] for name in self.sections}
+        self.current = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.frame_start = None
+
+    def begin_frame(self):
+        self.current = {}
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """
+        Closes the current frame and records its total time and per-section times.
+
+        Returns:
+            float: The frame time in seconds.
+        """
+        frame_time = time.perf_counter() - self.frame_start
+        self.frame_times.append(frame_time)
+        with self.lock:
+            current, self.current = self.current, {}
+        for name in set(self.section_times) | set(current):
+            self.section_times.setdefault(name, [0.0] * (len(self.frame_times) - 1)).append(current.get(name, 0.0))
+        return frame_time
+
+    def add(self, name, seconds):
+        with self.lock:
+            self.current[name] = self.current.get(name, 0.0) + seconds
+
+    def wrap(self, name, func):
+        """
+        Returns a wrapper around func that records its exclusive run time under the given section.
+        """
+        local = self.local
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            stack = getattr(local, 'stack', None)
+            if stack is None:
+                stack = local.stack = []
+            stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                children = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                self.add(name, elapsed - children)
+        return timed
+
+    def summary(self):
+        """
+        Returns mean, p95 and p99 in milliseconds for the whole frame and for every section.
+        """
+        return {
+            'frames': len(self.frame_times),
+            'frame_ms': summarize(self.frame_times),
+            'sections': {name: summarize(samples) for name, samples in self.section_times.items()},
+        }
@@ -0,0 +1,143 @@
+import struct
+import zlib
+from collections import namedtuple
+
+SAVE_MAGIC = b'KCSV'
+SAVE_VERSION = 1
+SAVE_HEADER = struct.Struct('<4sHH')  # Magic, save version, flags
+COMPRESSED = 1  # Header flag: the body is zlib-compressed
+
+# Fixed-layout records of the body, in order: counts, string table, player, enemies, sounds
+COUNTS = struct.Struct('<HIH')  # Strings, enemies, sounds
+STRING_LENGTH = struct.Struct('<H')
+PLAYER = struct.Struct('<fff')  # x, y, health
+ENEMY = struct.Struct('<HffHHfHB')  # Type name, x, y, width, height, health, state name, flags
+SOUND = struct.Struct('<HB')  # Sound name, priority
+NO_STRING = 0xFFFF
+
+# Enemy flags
+FLIPPED = 1
+DEAD = 2
+
+PlayerRecord = namedtuple('PlayerRecord', ['x', 'y', 'health'])
+EnemyRecord = namedtuple('EnemyRecord', ['type', 'x', 'y', 'width', 'height', 'health', 'state', 'flags'])
+SoundRecord = namedtuple('SoundRecord', ['name', 'priority'])
+
+
+class SaveWriter:
+    def __init__(self):
+        """
+        Initializes a writer for the binary save format.
+
+        Every player, enemy and sound is one fixed-size struct record, and type, state and sound
+        names are stored once in a string table and referenced by index, so hundreds of enemies
+        cost a few bytes each before compression.
+
+        Returns:
+            None
+        """
+        self.strings = []
+        self.string_ids = {}
+        self.player = PLAYER.pack(0, 0, 0)
+        self.enemies = bytearray()
+        self.enemy_count = 0
+        self.sounds = bytearray()
+        self.sound_count = 0
+
+    def string(self, text):
+        """
+        Returns the string table index of text, adding it the first time. None maps to NO_STRING.
+        """
+        if text is None:
+            return NO_STRING
+        string_id = self.string_ids.get(text)
+        if string_id is None:
+            if len(self.strings) == NO_STRING:
+                raise ValueError("too many distinct names for the save string table")
+            string_id = self.string_ids[text] = len(self.strings)
+            self.strings.append(text)
+        return string_id
+
+    def set_player(self, x, y, health):
+        self.player = PLAYER.pack(x, y, health)
+
+    def add_enemy(self, type_name, x, y, width, height, health, state=None, flags=0):
+        self.enemies += ENEMY.pack(self.string(type_name), x, y, width, height, health, self.string(state), flags)
+        self.enemy_count += 1
+
+    def add_sound(self, name, priority):
+        self.sounds += SOUND.pack(self.string(name), priority)
+        self.sound_count += 1
+
+    def to_bytes(self, compress=True):
+        """
+        Returns the finished save: a header and the body, compressed unless compress is False.
+        Encrypt after this step; compressed ciphertext does not shrink.
+        """
+        body = bytearray(COUNTS.pack(len(self.strings), self.enemy_count, self.sound_count))
+        for text in self.strings:
+            encoded = text.encode('utf-8')
+            body += STRING_LENGTH.pack(len(encoded)) + encoded
+        body += self.player + self.enemies + self.sounds
+        if compress:
+            return SAVE_HEADER.pack(SAVE_MAGIC, SAVE_VERSION, COMPRESSED) + zlib.compress(bytes(body))
+        return SAVE_HEADER.pack(SAVE_MAGIC, SAVE_VERSION, 0) + bytes(body)
+
+
+def is_save(data):
+    return data[:len(SAVE_MAGIC)] == SAVE_MAGIC
+
+
+class SaveReader:
+    def __init__(self, data):
+        """
+        Opens a save written by SaveWriter. Records are unpacked straight from the buffer as they are
+        read, without building a dict for every object first.
+
+        Args:
+            data (bytes): The decrypted save.
+
+        Returns:
+            None
+        """
+        if len(data) < SAVE_HEADER.size:
+            raise ValueError("data is too short to be a save")
+        magic, version, flags = SAVE_HEADER.unpack_from(data)
+        if magic != SAVE_MAGIC:
+            raise ValueError("not a save")
+        if version != SAVE_VERSION:
+            raise ValueError(f"unsupported save version {version}")
+        body = data[SAVE_HEADER.size:]
+        self.body = zlib.decompress(body) if flags & COMPRESSED else memoryview(body)
+
+        string_count, self.enemy_count, self.sound_count = COUNTS.unpack_from(self.body)
+        offset = COUNTS.size
+        self.strings = []
+        for _ in range(string_count):
+            (length,) = STRING_LENGTH.unpack_from(self.body, offset)
+            offset += STRING_LENGTH.size
+            self.strings.append(bytes(self.body[offset:offset + length]).decode('utf-8'))
+            offset += length
+
+        self.player = PlayerRecord._make(PLAYER.unpack_from(self.body, offset))
+        self.enemy_offset = offset + PLAYER.size
+        self.sound_offset = self.enemy_offset + ENEMY.size * self.enemy_count
+        if len(self.body) < self.sound_offset + SOUND.size * self.sound_count:
+            raise ValueError("save is truncated")
+
+    def name(self, string_id):
+        return None if string_id == NO_STRING else self.strings[string_id]
+
+    def enemies(self):
+        """
+        Yields an EnemyRecord per enemy, with the type and state names looked up.
+        """
+        name = self.name
+        end = self.sound_offset
+        for type_id, x, y, width, height, health, state_id, flags in ENEMY.iter_unpack(self.body[self.enemy_offset:end]):
+            yield EnemyRecord(name(type_id), x, y, width, height, health, name(state_id), flags)
+
+    def sounds(self):
+        end = self.sound_offset + SOUND.size * self.sound_count
+        for name_id, priority in SOUND.iter_unpack(self.body[self.sound_offset:end]):
+            yield SoundRecord(self.name(name_id), priority)
@@ -0,0 +1,138 @@
+import sqlite3
+import threading
+import time
+from util.logger import get_logger
+from util.settings import LOCAL_SAVE_DB, SAVE_SLOT, SAVE_KEEP_PER_SLOT, SAVE_MAX_AGE, SAVE_VACUUM_INTERVAL
+
+log = get_logger(__name__)
+
+SCHEMA_VERSION = 1  # Kept in PRAGMA user_version
+JOURNAL_SIZE_LIMIT = 1 << 20  # Bytes the write-ahead log is truncated back to after a checkpoint
+
+
+class SaveStore:
+    def __init__(self, path=LOCAL_SAVE_DB, keep=SAVE_KEEP_PER_SLOT, max_age=SAVE_MAX_AGE, vacuum_interval=SAVE_VACUUM_INTERVAL):
+        """
+        Initializes the local save database: one connection kept open for the life of the store, in WAL mode
+        so a save never blocks a load, with saves grouped into named slots.
+
+        After every save the slot is pruned to the retention policy, and every vacuum_interval saves the file
+        is vacuumed so pruned rows give their space back, which keeps the database bounded on long-running machines.
+
+        Args:
+            path (str, optional): The SQLite database file. Defaults to LOCAL_SAVE_DB.
+            keep (int, optional): The newest saves kept per slot, or None for no limit. Defaults to SAVE_KEEP_PER_SLOT.
+            max_age (float, optional): Seconds after which a save is pruned, or None. The newest save of a slot is
+                always kept. Defaults to SAVE_MAX_AGE.
+            vacuum_interval (int, optional): Saves between VACUUMs, or None to never vacuum. Defaults to SAVE_VACUUM_INTERVAL.
+
+        Returns:
+            None
+        """
+        self.path = path
+        self.keep = keep
+        self.max_age = max_age
+        self.vacuum_interval = vacuum_interval
+        self.saves_since_vacuum = 0
+        self.lock = threading.RLock()  # Saves and loads run on their own threads but share the connection
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")  # Durable enough in WAL mode; a crash can only lose the last save
+        self.conn.execute(f"PRAGMA journal_size_limit={JOURNAL_SIZE_LIMIT}")
+        self.migrate()
+
+    def migrate(self):
+        """
+        Brings the schema up to SCHEMA_VERSION. Databases from before slots hold a bare game_state(id, iv, data)
+        table; its rows are moved into the default slot, stamped with the time of the migration.
+        """
+        with self.lock, self.conn:
+            version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            if version >= SCHEMA_VERSION:
+                return
+            self.conn.execute("BEGIN")  # One transaction, so a failed migration leaves the old schema intact
+            self.conn.execute('''CREATE TABLE IF NOT EXISTS game_state
+                                 (id INTEGER PRIMARY KEY, iv BLOB, data BLOB)''')
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(game_state)")}
+            if 'slot' not in columns:
+                self.conn.execute(f"ALTER TABLE game_state ADD COLUMN slot TEXT NOT NULL DEFAULT '{SAVE_SLOT}'")
+            if 'saved_at' not in columns:
+                self.conn.execute("ALTER TABLE game_state ADD COLUMN saved_at REAL NOT NULL DEFAULT 0")
+                self.conn.execute("UPDATE game_state SET saved_at = ?", (time.time(),))
+            self.conn.execute("CREATE INDEX IF NOT EXISTS game_state_slot ON game_state (slot, id)")
+            self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            log.info("Migrated %s from schema version %d to %d", self.path, version, SCHEMA_VERSION)
+
+    def write(self, iv, data, slot=SAVE_SLOT):
+        """
+        Stores a save in a slot, then applies the retention policy to that slot.
+
+        Args:
+            iv (bytes): The initialization vector the save was encrypted with.
+            data (bytes): The encrypted save.
+            slot (str, optional): The slot to save to. Defaults to SAVE_SLOT.
+
+        Returns:
+            int: The id of the new row.
+        """
+        with self.lock:
+            with self.conn:
+                row_id = self.conn.execute("INSERT INTO game_state (slot, saved_at, iv, data) VALUES (?, ?, ?, ?)",
+                                           (slot, time.time(), iv, data)).lastrowid
+                self.prune(slot)
+            self.saves_since_vacuum += 1
+            if self.vacuum_interval and self.saves_since_vacuum >= self.vacuum_interval:
+                self.vacuum()
+            return row_id
+
+    def latest(self, slot=SAVE_SLOT):
+        """
+        Returns the (iv, data) of the newest save in a slot, or None if the slot is empty.
+        """
+        with self.lock:
+            return self.conn.execute("SELECT iv, data FROM game_state WHERE slot = ? ORDER BY id DESC LIMIT 1",
+                                     (slot,)).fetchone()
+
+    def slots(self):
+        """
+        Returns a (slot, number of saves, time of the newest save) tuple for every slot holding a save.
+        """
+        with self.lock:
+            return self.conn.execute("SELECT slot, COUNT(*), MAX(saved_at) FROM game_state GROUP BY slot ORDER BY slot").fetchall()
+
+    def delete(self, slot=None):
+        """
+        Deletes every save in a slot, or every save in every slot if slot is None.
+        """
+        with self.lock, self.conn:
+            if slot is None:
+                self.conn.execute("DELETE FROM game_state")
+            else:
+                self.conn.execute("DELETE FROM game_state WHERE slot = ?", (slot,))
+
+    def prune(self, slot):
+        """
+        Deletes the saves of a slot that fall outside the retention policy. Runs in the caller's transaction.
+        """
+        if self.keep is not None:
+            self.conn.execute('''DELETE FROM game_state WHERE slot = ? AND id <= (
+                                     SELECT id FROM game_state WHERE slot = ? ORDER BY id DESC LIMIT 1 OFFSET ?)''',
+                              (slot, slot, max(self.keep, 1)))
+        if self.max_age is not None:
+            self.conn.execute('''DELETE FROM game_state WHERE slot = ? AND saved_at < ? AND id < (
+                                     SELECT MAX(id) FROM game_state WHERE slot = ?)''',
+                              (slot, time.time() - self.max_age, slot))
+
+    def vacuum(self):
+        """
+        Rebuilds the database file without the space left by pruned saves and truncates the write-ahead log.
+        """
+        with self.lock:
+            self.conn.execute("VACUUM")
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.saves_since_vacuum = 0
+            log.debug("Vacuumed %s", self.path)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -5,10 +5,87 @@ SCREENW = 800
 WORLD_WIDTH = 1600  # Example width of the game world
 WORLD_HEIGHT = 1200  # Example height of the game world
 
-HEROSPRITEPATH = "Assets\Hero Knight\Sprites"
+SIMULATION_RATE = 60  # Fixed simulation ticks per second; rendering interpolates between ticks
+MAX_CATCH_UP_STEPS = 5  # Most ticks run in one frame after a stall, the rest of the backlog is dropped
+
+HEADLESS_DEFAULT_FRAMES = 3600  # One minute of game time at 60 FPS
+
+HEROSPRITEPATH = "Assets/Hero Knight/Sprites"
 SKELETONPATH = 'Assets/Skeleton'
 GOBLINPATH = 'Assets/Goblin'
 MUSHROOMPATH = 'Assets/Mushroom'
 EYEPATH = 'Assets/Flying eye'
 ABILPATH = 'Assets/Abilities'
 WORMPATH = 'Assets/Fire Worm/Sprites/Worm'
+
+ATLASPATH = 'Assets/Atlas'  # Output of the atlas build step (python -m Scripts.atlasBuilder)
+ATLASINDEX = ATLASPATH + '/atlas.json'
+TILEMAP = 'JSON/Tiles.json'  # Level layout loaded by AssetManager.load_tiles
+ASSETPACK = 'Assets/sprites.kcpack'  # Output of the asset pack build step (python -m Scripts.assetPack)
+
+LOCAL_SAVE_DB = 'local_game_state.db'
+SAVE_SLOT = 'default'  # Slot used when a save or load names none
+SAVE_KEEP_PER_SLOT = 5  # Newest saves kept in each slot; older ones are pruned after every save
+SAVE_MAX_AGE = None  # Seconds after which a save is pruned even within that count (the newest in a slot is always kept), or None
+SAVE_VACUUM_INTERVAL = 100  # Saves between VACUUMs of the local database
+
+# Every sprite sheet the game uses, grouped by the character that uses it: (name, path, frame size)
+SPRITE_SETS = {
+    'knight': [
+        ('knight_idle', HEROSPRITEPATH + '/Idle.png', (180, 180)),
+        ('knight_run', HEROSPRITEPATH + '/Run.png', (180, 180)),
+        ('knight_jump', HEROSPRITEPATH + '/Jump.png', (180, 180)),
+        ('knight_attack', HEROSPRITEPATH + '/Attack1.png', (180, 180)),
+        ('knight_attack2', HEROSPRITEPATH + '/Attack2.png', (180, 180)),
+        ('knight_death', HEROSPRITEPATH + '/Death.png', (180, 180)),
+    ],
+    'skeleton': [
+        ('skeleton_idle', SKELETONPATH + '/Idle.png', (150, 150)),
+        ('skeleton_walk', SKELETONPATH + '/Walk.png', (150, 150)),
+        ('skeleton_attack', SKELETONPATH + '/Attack.png', (150, 150)),
+        ('skeleton_death', SKELETONPATH + '/Death.png', (150, 150)),
+        ('skeleton_shield', SKELETONPATH + '/Shield.png', (150, 150)),
+        ('skeleton_hit', SKELETONPATH + '/Take Hit.png', (150, 150)),
+    ],
+    'goblin': [
+        ('goblin_idle', GOBLINPATH + '/Idle.png', (150, 150)),
+        ('goblin_walk', GOBLINPATH + '/Run.png', (150, 150)),
+        ('goblin_attack', GOBLINPATH + '/Attack.png', (150, 150)),
+        ('goblin_death', GOBLINPATH + '/Death.png', (150, 150)),
+        ('goblin_attack2', GOBLINPATH + '/Attack2.png', (150, 150)),
+        ('goblin_hit', GOBLINPATH + '/Take Hit.png', (150, 150)),
+    ],
+    'mushroom': [
+        ('mushroom_idle', MUSHROOMPATH + '/Idle.png', (150, 150)),
+        ('mushroom_walk', MUSHROOMPATH + '/Run.png', (150, 150)),
+        ('mushroom_attack', MUSHROOMPATH + '/Attack.png', (150, 150)),
+        ('mushroom_death', MUSHROOMPATH + '/Death.png', (150, 150)),
+        ('mushroom_attack2', MUSHROOMPATH + '/Attack2.png', (150, 150)),
+        ('mushroom_attack3', MUSHROOMPATH + '/Attack3.png', (150, 150)),
+        ('mushroom_hit', MUSHROOMPATH + '/Take Hit.png', (150, 150)),
+    ],
+    'flyingeye': [
+        ('eye_idle', EYEPATH + '/Flight.png', (150, 150)),
+        ('eye_walk', EYEPATH + '/Flight.png', (150, 150)),
+        ('eye_attack', EYEPATH + '/Attack.png', (150, 150)),
+        ('eye_death', EYEPATH + '/Death.png', (150, 150)),
+        ('eye_attack2', EYEPATH + '/Attack2.png', (150, 150)),
+        ('eye_attack3', EYEPATH + '/Attack3.png', (150, 150)),
+        ('eye_hit', EYEPATH + '/Take Hit.png', (150, 150)),
+    ],
+    'fireworm': [
+        ('worm_death', WORMPATH + '/Death.png', (90, 90)),
+        ('worm_idle', WORMPATH + '/Idle.png', (90, 90)),
+        ('worm_walk', WORMPATH + '/Walk.png', (90, 90)),
+        ('worm_attack', WORMPATH + '/Attack.png', (90, 90)),
+        ('worm_hit', WORMPATH + '/Get Hit.png', (90, 90)),
+    ],
+    'abilities': [
+        ('M_Projectile', ABILPATH + '/M_Projectile_sprite.png', (50, 50)),
+        ('FE_Projectile', ABILPATH + '/FE_projectile_sprite.png', (48, 48)),
+        ('Bomb', ABILPATH + '/Bomb_sprite.png', (100, 100)),
+        ('Sword', ABILPATH + '/Sword_sprite.png', (102, 102)),
+        ('Fireball', ABILPATH + '/Move.png', (46, 46)),
+    ],
+}
+SPRITE_SHEETS = [sheet for sheets in SPRITE_SETS.values() for sheet in sheets]